@@ -1,15 +1,13 @@
 import json
-import os
 from fastapi import FastAPI
-from google import genai
 import textract
 from dotenv import load_dotenv
-from src.db.model import JobModel, ResumeUpdate, ResumeModel
+from src.db.model import ResumeUpdate, ResumeModel
+from src.db.mongo import db_ops
+from src.utils.llm import generate_content, upload_file
 
 load_dotenv()
 
-client = genai.Client(api_key=os.getenv("GOOGLE_GEMINI_KEY"))
-
 app = FastAPI()
 
 def convert_to_plain_text(file_path):
@@ -30,7 +28,7 @@ def replace_nulls(data):
         return data
 
 
-def ats_extractor(resume_data, text, is_pdf=False):
+async def ats_extractor(resume_data, text, is_pdf=False):
     json_model = ResumeUpdate.model_json_schema()
     json_model_string = json.dumps(json_model, indent=4)
     prompt = f'''
@@ -51,15 +49,12 @@ def ats_extractor(resume_data, text, is_pdf=False):
     sent as a file or plain text
     '''
     if is_pdf:
-        my_files = client.files.upload(file=resume_data)
+        my_files = await upload_file(resume_data)
         contents = [prompt, my_files]
     else:
         contents = [prompt, text]
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=contents
-    )
-    data = response.text.strip()
+    response_text = await generate_content(contents)
+    data = response_text.strip()
     remove_texts = ["```json","```"]
     for text in remove_texts:
         if text in data:
@@ -73,7 +68,8 @@ async def get_ai_optimized_resume(resume_data: ResumeModel, is_main_resume: bool
     json_model_string = json.dumps(json_model, indent=4)
     headline = resume_data.personalInfo.headline
     if not is_main_resume:
-        job_data = await JobModel.find_one(JobModel.id == job_id)
+        # get_job restores descriptions kept in compressed content storage
+        job_data = await db_ops.get_job(job_id)
         mode = "job description"
         headline_prompt = f'''
         give resume according to this job description:
@@ -126,11 +122,8 @@ async def get_ai_optimized_resume(resume_data: ResumeModel, is_main_resume: bool
         resume_data_as_json.pop(field)
     prompt += json.dumps(resume_data_as_json, indent=4)
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=[prompt]
-    )
-    data = response.text.strip()
+    response_text = await generate_content([prompt])
+    data = response_text.strip()
     remove_texts = ["```json","```"]
     for text in remove_texts:
         if text in data:
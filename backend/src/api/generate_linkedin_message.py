@@ -4,13 +4,11 @@ from typing import Dict, List
 from src.db.model import Experience, Project, ResumeModel
 from src.logger import logger
 # from transformers import pipeline, set_seed, AutoModelForCausalLM, AutoTokenizer
-from google import genai
+from src.utils.llm import generate_content
 import dotenv
 
 dotenv.load_dotenv()
 
-client = genai.Client(api_key=os.getenv("GOOGLE_GEMINI_KEY"))
-
 class EnhancedLinkedInMessageGenerator:
     def __init__(self):
         """Initialize the message generator with improved templates and resume handling"""   
@@ -159,7 +157,7 @@ class EnhancedLinkedInMessageGenerator:
             return "less than a year"
         return f"{end_date - start_date} years"
         
-    def generate_message_using_gemini(self, params: ResumeModel, company: str, position: str, name: str) -> str:
+    async def generate_message_using_gemini(self, params: ResumeModel, company: str, position: str, name: str) -> str:
         try:
             # Prepare context variables
             current_experience = self.format_experience(params.experience)
@@ -182,13 +180,10 @@ class EnhancedLinkedInMessageGenerator:
             for key, value in message_context.items():
                 base_message = base_message.replace(key, value)
             
-            response = client.models.generate_content(
-                model="gemini-2.0-flash",
-                contents=base_message,
-            )
+            response_text = await generate_content(base_message)
             
             # Clean and format the final message
-            final_message = response.text.strip()
+            final_message = response_text.strip()
             if not any(ending in final_message.lower() for ending in ['thank', 'regards', 'best']):
                 final_message += f"\n\nBest regards,\n{name}"
             
@@ -230,7 +225,7 @@ class EnhancedLinkedInMessageGenerator:
         """Generate multiple message variants"""
         return [self.generate_message_response(**params) for _ in range(num_variants)]
     
-def generate_message_api_response(params: ResumeModel, company: str, position: str, name: str) -> Dict:
+async def generate_message_api_response(params: ResumeModel, company: str, position: str, name: str) -> Dict:
     """Generate a message response suitable for an API"""
     generator = EnhancedLinkedInMessageGenerator()
-    return generator.generate_message_using_gemini(params, company, position, name)
+    return await generator.generate_message_using_gemini(params, company, position, name)
@@ -3,6 +3,9 @@ from typing import Optional
 from jobspy import scrape_jobs, JobType
 import pandas as pd
 from src.logger import logger
+from src.utils.helpers import parse_date_posted
+from src.db.model import JobModel, JobQuery
+from src.utils.location import normalize_job_types, normalize_location, validate_indeed_country
 
 import random
 
@@ -49,21 +52,6 @@ user_agents = [
     # Add more user agents as needed
 ]
 
-indeed_countries = [
-    "argentina", "australia", "austria", "bahrain", "belgium", "brazil", "canada", "chile", "china", "colombia", "costa rica", "czech republic", "czechia", "denmark", "ecuador", "egypt", "finland", "france", "germany", "greece", "hong kong", "hungary", "india", "indonesia", "ireland", "israel", "italy", "japan", "kuwait", "luxembourg", "malaysia", "malta", "mexico", "morocco", "netherlands", "new zealand", "nigeria", "norway", "oman", "pakistan", "panama", "peru", "philippines", "poland", "portugal", "qatar", "romania", "saudi arabia", "singapore", "south africa", "south korea", "spain", "sweden", "switzerland", "taiwan", "thailand", "türkiye", "turkey", "ukraine", "united arab emirates", "uk", "united kingdom", "usa", "us", "united states", "uruguay", "venezuela", "vietnam", "usa/ca", "worldwide"
-]
-
-def validate_indeed_country(country: str):
-    if country.lower() not in indeed_countries:
-        for indeed_country in indeed_countries:
-            if country.lower() in indeed_country:
-                return indeed_country
-            if indeed_country in country.lower():
-                return indeed_country
-        return "worldwide"
-    return country
-    
-
 def get_jobs(city: str, country_code: str, country: str, job_title: str, recruiters: list = [], 
              results_wanted: int = 20, job_type: Optional[JobType] = None, 
              is_remote: Optional[bool] = None, distance: Optional[int] = None):
@@ -116,6 +104,37 @@ def get_jobs_api_response(city: str, country_code: str, country: str, job_title:
     jobs = jobs.fillna("")
     return jobs.to_dict(orient="records")
 
+def build_job_model(job: dict, query_params: JobQuery) -> JobModel:
+    """Build a JobModel from a serialized scraper row, normalizing location and job type for indexing."""
+    location_city, location_country_code = normalize_location(job.get("location") or "")
+    return JobModel(
+        company=job.get("company") if job.get("company") else "",
+        id=job.get("id") if job.get("id") else "",
+        title=job.get("title") if job.get("title") else "",
+        location=job.get("location") if job.get("location") else "",
+        location_city=location_city,
+        location_country_code=location_country_code,
+        job_types=normalize_job_types(job.get("job_type") or ""),
+        date_posted=parse_date_posted(job.get("date_posted")),
+        query=query_params,
+        description=job.get("description") if job.get("description") else "",
+        url=job.get("job_url_direct") if job.get("job_url_direct") else job.get("job_url", ""),
+        salary=job.get("salary") if job.get("salary") else "",
+        company_logo=job.get("company_logo") if job.get("company_logo") else "",
+        min_amount=str(job.get("min_amount")) if job.get("min_amount") else "",
+        max_amount=str(job.get("max_amount")) if job.get("max_amount") else "",
+        company_url=job.get("company_url") if job.get("company_url") else "",
+        company_description=job.get("company_description") if job.get("company_description") else "",
+        company_num_employees=job.get("company_num_employees") if job.get("company_num_employees") else "",
+        company_revenue=job.get("company_revenue") if job.get("company_revenue") else "",
+        company_industry=job.get("company_industry") if job.get("company_industry") else "",
+        company_addresses=job.get("company_addresses") if job.get("company_addresses") else "",
+        company_url_direct=job.get("company_url_direct") if job.get("company_url_direct") else "",
+        job_level=job.get("job_level") if job.get("job_level") else "",
+        job_function=job.get("job_function") if job.get("job_function") else "",
+        currency=job.get("currency") if job.get("currency") else "",
+    )
+
 def main():
     city = "Bengaluru"
     country_code = "IN"
@@ -0,0 +1,125 @@
+import os
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from src.db.instrumentation import DB_METRICS_ENABLED, command_shapes
+
+load_dotenv()
+
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# Comma-separated wire compressors; zstd and snappy need their optional packages installed
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zlib")
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Counts connection pool events so saturation shows up before requests time out."""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.closed = 0
+        self.checked_out = 0
+        self.checkout_failures = 0
+        self.checkout_waiting = 0
+        self.max_checkout_waiting = 0
+        self.cleared = 0
+
+    def connection_check_out_started(self, event) -> None:
+        self.checkout_waiting += 1
+        self.max_checkout_waiting = max(self.max_checkout_waiting, self.checkout_waiting)
+
+    def connection_check_out_failed(self, event) -> None:
+        self.checkout_waiting -= 1
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event) -> None:
+        self.checkout_waiting -= 1
+        self.checked_out += 1
+
+    def connection_checked_in(self, event) -> None:
+        self.checked_out -= 1
+
+    def connection_created(self, event) -> None:
+        self.created += 1
+
+    def connection_closed(self, event) -> None:
+        self.closed += 1
+
+    def pool_cleared(self, event) -> None:
+        self.cleared += 1
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def to_dict(self) -> dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "open_connections": self.created - self.closed,
+            "checked_out": self.checked_out,
+            "checkout_waiting": self.checkout_waiting,
+            "max_checkout_waiting": self.max_checkout_waiting,
+            "checkout_failures": self.checkout_failures,
+            "pool_cleared": self.cleared,
+        }
+
+class MongoConnection:
+    """The process-wide Motor client: created once at startup, closed at shutdown."""
+
+    def __init__(self) -> None:
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.database: Optional[AsyncIOMotorDatabase] = None
+        self.pool_stats = PoolStats()
+
+    def connect(self) -> AsyncIOMotorDatabase:
+        if self.database is not None:
+            return self.database
+        connection_string = os.getenv("MONGO_CONNECTION_STRING")
+        if not connection_string:
+            raise ValueError("MONGO_CONNECTION_STRING is not set in environment variables")
+        self.client = AsyncIOMotorClient(
+            connection_string,
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            compressors=MONGO_COMPRESSORS,
+            appname="ethereal-jobs-backend",
+            event_listeners=[self.pool_stats, command_shapes] if DB_METRICS_ENABLED else [self.pool_stats]
+        )
+        self.database = self.client[os.getenv("MONGO_DATABASE", "jobify-testing")]
+        return self.database
+
+    async def ping(self) -> float:
+        """Round-trip a ping to the server; returns the latency in milliseconds."""
+        if self.client is None:
+            raise RuntimeError("Mongo client is not connected")
+        start = time.perf_counter()
+        await self.client.admin.command("ping")
+        return (time.perf_counter() - start) * 1000
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.database = None
+
+mongo_connection = MongoConnection()
@@ -1,7 +1,11 @@
 from datetime import datetime
 from typing import Optional
 from beanie import Document
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from pymongo import IndexModel
+
+# How long sent outbox entries are kept for inspection before Mongo purges them
+EMAIL_OUTBOX_RETENTION_SECONDS = 30 * 24 * 3600
 
 class EmailTracking(Document):
     user_id: str
@@ -11,9 +15,15 @@ class EmailTracking(Document):
     reminder_count: int = 0
     unsubscribed: bool = False
     unsubscribe_token: str
+    # Jobs included in a job recommendations email, so they aren't recommended again
+    job_ids: list[str] = []
     
     class Settings:
         name = "email_tracking"
+        indexes = [
+            # Latest reminder of a type per user, see get_users_due_reminder
+            [("user_id", 1), ("email_type", 1), ("sent_at", -1)],
+        ]
         
 class EmailPreferences(Document):
     user_id: str
@@ -24,3 +34,33 @@ class EmailPreferences(Document):
     
     class Settings:
         name = "email_preferences"
+        indexes = [
+            # One preferences document per user; see get_or_create_email_preferences
+            IndexModel([("user_id", 1)], unique=True, name="user_id_unique"),
+            IndexModel([("unsubscribe_token", 1)], unique=True, name="unsubscribe_token_unique"),
+        ]
+
+class EmailOutbox(Document):
+    """An email waiting to be sent by the outbox workers."""
+    template_name: str
+    template_data: dict
+    recipient: str
+    # create_email_tracking arguments, recorded once the email is actually sent
+    tracking: Optional[dict] = None
+    status: str = "pending"  # 'pending', 'sending', 'sent', 'failed'
+    attempts: int = 0
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    claim_id: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    sent_at: Optional[datetime] = None
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "email_outbox"
+        indexes = [
+            [("status", 1), ("next_attempt_at", 1)],
+            [("status", 1), ("locked_until", 1)],
+            [("claim_id", 1)],
+            IndexModel([("sent_at", 1)], expireAfterSeconds=EMAIL_OUTBOX_RETENTION_SECONDS, name="sent_at_ttl"),
+        ]
@@ -0,0 +1,208 @@
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict
+
+from dotenv import load_dotenv
+from pymongo import monitoring
+from src.logger import logger
+
+load_dotenv()
+
+DB_METRICS_ENABLED = os.getenv("DB_METRICS_ENABLED", "true").lower() == "true"
+# Calls slower than this are logged and sampled; 0 disables both
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_SLOW_SAMPLES = int(os.getenv("DB_SLOW_SAMPLES", "20"))
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# Driver commands that carry a filter or pipeline; handshakes, pings and auth are skipped
+DATA_COMMANDS = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify", "insert", "getMore"}
+
+def describe_filter(value: Any, depth: int = 0) -> Any:
+    """
+    Describe a Mongo filter or pipeline by its keys and operators, with every value redacted.
+
+    Lists of documents (pipelines, $and/$or branches) are described per
+    document; lists of values collapse to a single placeholder.
+    """
+    if depth > 6:
+        return "..."
+    if isinstance(value, dict):
+        return {str(key): describe_filter(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(item, dict) for item in value):
+            return [describe_filter(item, depth + 1) for item in value]
+        return ["?"]
+    return "?"
+
+def describe_command(command_name: str, command: dict) -> dict:
+    """The redacted filter, sort and pipeline shape of a driver command."""
+    if command_name == "update":
+        command = (command.get("updates") or [{}])[0]
+        return {"filter": describe_filter(command.get("q", {})), "update": describe_filter(command.get("u", {}))}
+    if command_name == "delete":
+        return {"filter": describe_filter((command.get("deletes") or [{}])[0].get("q", {}))}
+    shape = {}
+    for field in ["filter", "query", "sort", "pipeline", "key"]:
+        if field in command:
+            shape[field] = command[field] if field == "key" else describe_filter(command[field])
+    return shape
+
+def count_documents(result: Any) -> int:
+    """Best-effort count of the documents a call returned."""
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return 0
+    if isinstance(result, (list, tuple, set, dict)):
+        return len(result)
+    return 1
+
+class MethodStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.documents = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.slow_samples = deque(maxlen=DB_SLOW_SAMPLES)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["gt_max"]
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "documents": self.documents,
+            "total_ms": round(self.total_ms, 2),
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "histogram": dict(zip(labels, self.buckets)),
+            "slow_samples": list(self.slow_samples),
+        }
+
+def _record(table: Dict[str, MethodStats], name: str, duration_ms: float, documents: int, error: bool) -> MethodStats:
+    stats = table.get(name)
+    if stats is None:
+        stats = table[name] = MethodStats()
+    stats.calls += 1
+    stats.errors += int(error)
+    stats.documents += documents
+    stats.total_ms += duration_ms
+    stats.max_ms = max(stats.max_ms, duration_ms)
+    stats.buckets[bisect_left(LATENCY_BUCKETS_MS, duration_ms)] += 1
+    return stats
+
+class DbMetrics:
+    """
+    Database latency stats, kept per process.
+
+    Methods are the DatabaseOperations calls as the app sees them; commands
+    are the driver commands they issue, per collection, with the redacted
+    filter shape of slow ones sampled.
+    """
+
+    def __init__(self) -> None:
+        self.methods: Dict[str, MethodStats] = {}
+        self.commands: Dict[str, MethodStats] = {}
+        # Command events arrive on Motor's executor threads
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float, result: Any, error: bool) -> None:
+        stats = _record(self.methods, name, duration_ms, count_documents(result), error)
+        if DB_SLOW_QUERY_MS and duration_ms >= DB_SLOW_QUERY_MS:
+            stats.slow_samples.append({"at": datetime.utcnow().isoformat(), "duration_ms": round(duration_ms, 2)})
+            logger.warning(f"Slow database call {name} took {duration_ms:.1f} ms")
+
+    def record_command(self, name: str, duration_ms: float, shape: dict, error: bool) -> None:
+        with self._lock:
+            stats = _record(self.commands, name, duration_ms, 0, error)
+            if DB_SLOW_QUERY_MS and duration_ms >= DB_SLOW_QUERY_MS:
+                stats.slow_samples.append({
+                    "at": datetime.utcnow().isoformat(),
+                    "duration_ms": round(duration_ms, 2),
+                    "shape": shape,
+                })
+                logger.warning(f"Slow Mongo command {name} took {duration_ms:.1f} ms, shape: {shape}")
+
+    def snapshot(self) -> Dict[str, Dict[str, dict]]:
+        """Stats for every method and command seen so far, slowest total time first."""
+        def ordered(table: Dict[str, MethodStats]) -> Dict[str, dict]:
+            items = sorted(table.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {name: stats.to_dict() for name, stats in items}
+        with self._lock:
+            return {"methods": ordered(self.methods), "commands": ordered(self.commands)}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.methods.clear()
+            self.commands.clear()
+
+db_metrics = DbMetrics()
+
+class CommandShapes(monitoring.CommandListener):
+    """Times driver commands and records the shape of their filters, as sent to the server."""
+
+    def __init__(self) -> None:
+        self._started: Dict[tuple, tuple] = {}
+
+    def started(self, event) -> None:
+        if event.command_name not in DATA_COMMANDS:
+            return
+        command = event.command
+        collection = command.get("collection") if event.command_name == "getMore" else command.get(event.command_name)
+        name = f"{collection}.{event.command_name}"
+        self._started[(event.connection_id, event.request_id)] = (name, describe_command(event.command_name, command))
+
+    def _finish(self, event, error: bool) -> None:
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+        name, shape = started
+        db_metrics.record_command(name, event.duration_micros / 1000, shape, error)
+
+    def succeeded(self, event) -> None:
+        self._finish(event, False)
+
+    def failed(self, event) -> None:
+        self._finish(event, True)
+
+command_shapes = CommandShapes()
+
+def instrumented(name: str, func):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        result = None
+        error = False
+        try:
+            result = await func(*args, **kwargs)
+            return result
+        except Exception:
+            error = True
+            raise
+        finally:
+            db_metrics.record(name, (time.perf_counter() - start) * 1000, result, error)
+    return wrapper
+
+def uninstrumented(func):
+    """Leave a method out of instrument_class, e.g. a cache wrapper whose hits would skew the stats."""
+    func.__uninstrumented__ = True
+    return func
+
+def instrument_class(cls):
+    """Class decorator wrapping every public coroutine method with latency instrumentation."""
+    if not DB_METRICS_ENABLED:
+        return cls
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attr):
+            continue
+        if getattr(attr, "__uninstrumented__", False):
+            continue
+        setattr(cls, name, instrumented(name, attr))
+    return cls
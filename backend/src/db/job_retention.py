@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+import os
+from typing import List
+
+from dotenv import load_dotenv
+from src.db.mongo import db_ops
+from src.logger import logger
+
+load_dotenv()
+
+# Search only reads the last few days, so anything older can leave the hot collection
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "30"))
+# "archive" moves stale jobs to the compressed jobs_archive collection, "drop" deletes them
+JOB_RETENTION_MODE = os.getenv("JOB_RETENTION_MODE", "archive")
+JOB_RETENTION_BATCH_SIZE = int(os.getenv("JOB_RETENTION_BATCH_SIZE", "500"))
+# Description content unused for this long is deleted once no job points to it;
+# the grace period covers scrapes that write content just before their jobs
+JOB_CONTENT_GRACE_HOURS = int(os.getenv("JOB_CONTENT_GRACE_HOURS", "24"))
+
+
+async def _retire_batch(batch: List[dict]) -> int:
+    job_ids = [job["_id"] for job in batch]
+    referenced = await db_ops.get_referenced_job_ids(job_ids)
+    stale = [job for job in batch if job["_id"] not in referenced]
+    if not stale:
+        return 0
+    if JOB_RETENTION_MODE == "drop":
+        return await db_ops.delete_jobs([job["_id"] for job in stale])
+    await db_ops.archive_jobs(stale)
+    return len(stale)
+
+async def collect_job_content() -> int:
+    """Delete JobContent rows no hot or archived job references any more."""
+    cutoff = datetime.utcnow() - timedelta(hours=JOB_CONTENT_GRACE_HOURS)
+    deleted = 0
+    batch = []
+    async for content_hash in db_ops.stream_unused_content_hashes(cutoff, JOB_RETENTION_BATCH_SIZE):
+        batch.append(content_hash)
+        if len(batch) >= JOB_RETENTION_BATCH_SIZE:
+            deleted += await db_ops.delete_unreferenced_content(batch, cutoff)
+            batch = []
+    if batch:
+        deleted += await db_ops.delete_unreferenced_content(batch, cutoff)
+    return deleted
+
+async def run_job_retention():
+    """
+    Move jobs no scrape has returned within the retention window out of the hot `jobs` collection.
+
+    Jobs a user has saved or applied to (a non-pending JobUser record) stay
+    in place so users' application history keeps resolving from the hot tier.
+    Description content left without any job is collected afterwards.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=JOB_RETENTION_DAYS)
+    retired = 0
+    batch = []
+    try:
+        async for job in db_ops.stream_stale_jobs(cutoff, JOB_RETENTION_BATCH_SIZE):
+            batch.append(job)
+            if len(batch) >= JOB_RETENTION_BATCH_SIZE:
+                retired += await _retire_batch(batch)
+                batch = []
+        if batch:
+            retired += await _retire_batch(batch)
+    except Exception as e:
+        logger.error(f"Job retention failed after retiring {retired} jobs: {e}")
+        return retired
+    logger.info(f"Job retention ({JOB_RETENTION_MODE}) retired {retired} jobs last seen before {cutoff}")
+    try:
+        collected = await collect_job_content()
+    except Exception as e:
+        logger.error(f"Job content collection failed: {e}")
+        return retired
+    logger.info(f"Job retention collected {collected} unreferenced description contents")
+    return retired
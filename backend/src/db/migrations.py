@@ -0,0 +1,250 @@
+"""
+One-off data migrations.
+
+Run with `python -m src.db.migrations` before deploying a release that
+adds new unique indexes or changes stored field types. Every migration is
+idempotent, so running the script again is safe.
+"""
+import asyncio
+from datetime import datetime
+import hashlib
+import os
+
+import bson
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorClient
+from pymongo import UpdateOne
+from src.db.model import JobQuery
+from src.utils.compression import compress_text, decompress_bytes
+from src.utils.location import normalize_job_types, normalize_location
+
+async def dedupe_job_user(db: AsyncIOMotorDatabase) -> int:
+    """
+    Remove duplicate job_user rows so the unique (email, jobId) index can be built.
+
+    The most recently updated row of each pair is kept.
+    """
+    pipeline = [
+        {"$sort": {"updatedAt": -1}},
+        {"$group": {"_id": {"email": "$email", "jobId": "$jobId"}, "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    removed = 0
+    async for group in db["job_user"].aggregate(pipeline, allowDiskUse=True):
+        result = await db["job_user"].delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    return removed
+
+async def drop_score_only_job_user(db: AsyncIOMotorDatabase) -> int:
+    """
+    Delete job_user rows that only held match scores.
+
+    Scores now live in job_scores; a Pending row carries no application state,
+    and a missing row already reads as Pending.
+    """
+    result = await db["job_user"].delete_many({"application_status": "Pending"})
+    return result.deleted_count
+
+async def dedupe_email_preferences(db: AsyncIOMotorDatabase) -> int:
+    """
+    Merge duplicate email_preferences rows so the unique user_id index can be built.
+
+    The oldest row of each user is kept and takes every email type any of
+    the duplicates unsubscribed from, so no unsubscribe is lost.
+    """
+    pipeline = [
+        {"$sort": {"_id": 1}},
+        {"$group": {
+            "_id": "$user_id",
+            "ids": {"$push": "$_id"},
+            "unsubscribed_from": {"$push": "$unsubscribed_from"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    removed = 0
+    async for group in db["email_preferences"].aggregate(pipeline, allowDiskUse=True):
+        unsubscribed_from = sorted({email_type for types in group["unsubscribed_from"] for email_type in types or []})
+        await db["email_preferences"].update_one(
+            {"_id": group["ids"][0]},
+            {"$set": {"unsubscribed_from": unsubscribed_from, "updated_at": datetime.utcnow()}}
+        )
+        result = await db["email_preferences"].delete_many({"_id": {"$in": group["ids"][1:]}})
+        removed += result.deleted_count
+    return removed
+
+async def convert_token_expiry_to_datetime(db: AsyncIOMotorDatabase) -> int:
+    """
+    Convert string `expire` values on token collections to real dates.
+
+    TTL indexes ignore non-date values, so string-dated tokens would never be purged.
+    """
+    converted = 0
+    for collection in ["refresh_tokens", "verification_tokens", "reset_password_tokens"]:
+        result = await db[collection].update_many(
+            {"expire": {"$type": "string"}},
+            [{"$set": {"expire": {"$dateFromString": {
+                "dateString": "$expire",
+                "format": "%Y-%m-%d %H:%M:%S",
+                "onError": "$$NOW"
+            }}}}]
+        )
+        converted += result.modified_count
+    return converted
+
+async def backfill_job_query_membership(db: AsyncIOMotorDatabase) -> int:
+    """Create membership rows for jobs cached before JobQueryMembership existed."""
+    backfilled = 0
+    operations = []
+    async for job in db["jobs"].find({"query": {"$exists": True}}, {"query": 1, "createdAt": 1, "updatedAt": 1}):
+        query = JobQuery(**job["query"])
+        seen_at = job.get("updatedAt") or job.get("createdAt") or datetime.utcnow()
+        operations.append(UpdateOne(
+            {"query_key": query.canonical_key(), "jobId": job["_id"]},
+            {
+                "$min": {"distance": query.distance, "firstSeenAt": seen_at},
+                "$max": {"lastSeenAt": seen_at}
+            },
+            upsert=True
+        ))
+        if len(operations) >= 1000:
+            await db["job_query_membership"].bulk_write(operations, ordered=False)
+            backfilled += len(operations)
+            operations = []
+    if operations:
+        await db["job_query_membership"].bulk_write(operations, ordered=False)
+        backfilled += len(operations)
+    return backfilled
+
+async def backfill_normalized_job_fields(db: AsyncIOMotorDatabase) -> int:
+    """
+    Fill location_city / location_country_code / job_types on jobs stored before they were normalized at ingest.
+
+    Stored jobs don't keep the scraper's job type, so job_types comes from the
+    search that found the job. Jobs an earlier run left with empty job_types
+    are filled in as well.
+    """
+    backfilled = 0
+    operations = []
+    async for job in db["jobs"].find(
+        {"$or": [{"location_city": {"$exists": False}}, {"job_types": {"$in": [[], None]}}]},
+        {"location": 1, "query": 1}
+    ):
+        location_city, location_country_code = normalize_location(job.get("location") or "")
+        operations.append(UpdateOne(
+            {"_id": job["_id"]},
+            {"$set": {
+                "location_city": location_city,
+                "location_country_code": location_country_code,
+                "job_types": normalize_job_types((job.get("query") or {}).get("job_type"))
+            }}
+        ))
+        if len(operations) >= 1000:
+            await db["jobs"].bulk_write(operations, ordered=False)
+            backfilled += len(operations)
+            operations = []
+    if operations:
+        await db["jobs"].bulk_write(operations, ordered=False)
+        backfilled += len(operations)
+    return backfilled
+
+async def convert_date_posted_to_datetime(db: AsyncIOMotorDatabase) -> int:
+    """Convert string date_posted values to dates; empty or unparseable values become null."""
+    result = await db["jobs"].update_many(
+        {"date_posted": {"$type": "string"}},
+        [{"$set": {"date_posted": {"$cond": [
+            {"$eq": ["$date_posted", ""]},
+            None,
+            {"$dateFromString": {"dateString": "$date_posted", "onError": None, "onNull": None}}
+        ]}}}]
+    )
+    return result.modified_count
+
+async def move_job_descriptions_to_content(db: AsyncIOMotorDatabase) -> int:
+    """Move inline descriptions into job_content; only runs when JOB_DESCRIPTION_STORAGE=content."""
+    if os.getenv("JOB_DESCRIPTION_STORAGE", "inline") != "content":
+        return 0
+    moved = 0
+    job_operations = []
+    content_operations = []
+    fields = ["description", "company_description"]
+    async for job in db["jobs"].find(
+        {"$or": [{field: {"$nin": ["", None]}} for field in fields]},
+        {field: 1 for field in fields}
+    ):
+        update = {}
+        for field in fields:
+            text = job.get(field)
+            if not text:
+                continue
+            content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            content_operations.append(UpdateOne(
+                {"_id": content_hash},
+                {
+                    "$set": {"lastUsedAt": datetime.utcnow()},
+                    "$setOnInsert": {"data": compress_text(text), "size": len(text), "createdAt": datetime.utcnow()}
+                },
+                upsert=True
+            ))
+            update[field] = ""
+            update[f"{field}_hash"] = content_hash
+        job_operations.append(UpdateOne({"_id": job["_id"]}, {"$set": update}))
+        if len(job_operations) >= 1000:
+            # Content must exist before jobs stop carrying their own copy
+            await db["job_content"].bulk_write(content_operations, ordered=False)
+            await db["jobs"].bulk_write(job_operations, ordered=False)
+            moved += len(job_operations)
+            job_operations = []
+            content_operations = []
+    if job_operations:
+        await db["job_content"].bulk_write(content_operations, ordered=False)
+        await db["jobs"].bulk_write(job_operations, ordered=False)
+        moved += len(job_operations)
+    return moved
+
+async def backfill_archive_content_hashes(db: AsyncIOMotorDatabase) -> int:
+    """Record which job_content rows each archived job points to, so content collection keeps them."""
+    operations = []
+    updated = 0
+    async for archived in db["jobs_archive"].find({"content_hashes": {"$exists": False}}, {"payload": 1}):
+        job = bson.decode(decompress_bytes(archived["payload"]))
+        content_hashes = [job[field] for field in ["description_hash", "company_description_hash"] if job.get(field)]
+        operations.append(UpdateOne({"_id": archived["_id"]}, {"$set": {"content_hashes": content_hashes}}))
+        if len(operations) >= 1000:
+            await db["jobs_archive"].bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+    if operations:
+        await db["jobs_archive"].bulk_write(operations, ordered=False)
+        updated += len(operations)
+    return updated
+
+MIGRATIONS = [
+    dedupe_job_user,
+    dedupe_email_preferences,
+    drop_score_only_job_user,
+    convert_token_expiry_to_datetime,
+    backfill_job_query_membership,
+    backfill_normalized_job_fields,
+    convert_date_posted_to_datetime,
+    move_job_descriptions_to_content,
+    backfill_archive_content_hashes,
+]
+
+async def run_migrations():
+    load_dotenv()
+    connection_string = os.getenv("MONGO_CONNECTION_STRING")
+    if not connection_string:
+        raise ValueError("MONGO_CONNECTION_STRING is not set in environment variables")
+    client = AsyncIOMotorClient(connection_string)
+    db = client[os.getenv("MONGO_DATABASE", "jobify-testing")]
+    try:
+        for migration in MIGRATIONS:
+            result = await migration(db)
+            print(f"{migration.__name__}: {result}")
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(run_migrations())
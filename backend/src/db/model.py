@@ -3,6 +3,7 @@ import enum
 from typing import List, Optional
 from beanie import Document, Indexed, before_event, Insert
 from pydantic import BaseModel, Field
+from pymongo import IndexModel
 
 class JobQuery(BaseModel):
     city: str
@@ -14,19 +15,38 @@ class JobQuery(BaseModel):
     is_remote: bool
     distance: int
 
+    def canonical_key(self) -> str:
+        """Key identifying a search regardless of distance and result count."""
+        parts = [
+            self.city,
+            self.country_code,
+            self.country,
+            self.job_title,
+            self.job_type or "",
+            str(self.is_remote),
+        ]
+        return "|".join(part.strip().lower() for part in parts)
+
 class JobModel(Document):
     id: str = Field(alias="_id")
     title: str
     company: Indexed(str) # type: ignore
     location: str
+    # Lowercased location parts and job types, normalized at ingest for indexed lookups
+    location_city: Optional[str] = None
+    location_country_code: Optional[str] = None
+    job_types: List[str] = []
     description: str
     url: str
     salary: Optional[str] = None
-    date_posted: str
+    date_posted: Optional[datetime] = None
     query: JobQuery
     company_logo: Optional[str] = None
     company_url: Optional[str] = None
     company_description: Optional[str] = None
+    # Set when descriptions live compressed in JobContent instead of inline
+    description_hash: Optional[str] = None
+    company_description_hash: Optional[str] = None
     company_num_employees: Optional[str] = None
     company_revenue: Optional[str] = None
     company_industry: Optional[str] = None
@@ -51,6 +71,58 @@ class JobModel(Document):
             [("location", 1)],
             [("job_title", 1)],
             [("date_posted", -1)],
+            [("updatedAt", 1)],
+            [("location_city", 1), ("date_posted", -1)],
+            [("location_country_code", 1), ("date_posted", -1)],
+            [("job_types", 1), ("date_posted", -1)],
+            # Content garbage collection looks up which hashes are still referenced
+            IndexModel([("description_hash", 1)], sparse=True),
+            IndexModel([("company_description_hash", 1)], sparse=True),
+        ]
+
+class JobContent(Document):
+    """Compressed job description text, addressed by the SHA-256 of its content."""
+    id: str = Field(alias="_id")
+    data: bytes
+    size: int
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    # Last time a scraped job was stored with this content; unset on rows older than the field
+    lastUsedAt: Optional[datetime] = None
+
+    class Settings:
+        name = "job_content"
+
+class JobQueryMembership(Document):
+    """Links a job to every cached search that returned it."""
+    jobId: str
+    query_key: str
+    # Smallest search radius the job was found with; wider searches can reuse it
+    distance: int
+    firstSeenAt: datetime = Field(default_factory=datetime.utcnow)
+    lastSeenAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "job_query_membership"
+        indexes = [
+            IndexModel([("query_key", 1), ("jobId", 1)], unique=True, name="query_key_jobId_unique"),
+            [("query_key", 1), ("lastSeenAt", -1)],
+            [("jobId", 1)],
+        ]
+
+class JobArchiveModel(Document):
+    """A job moved out of the hot `jobs` collection, stored as compressed BSON."""
+    id: str = Field(alias="_id")
+    title: str
+    company: str
+    payload: bytes
+    # JobContent hashes the archived payload still points to
+    content_hashes: List[str] = []
+    archivedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "jobs_archive"
+        indexes = [
+            [("content_hashes", 1)],
         ]
 
 class LinkedInProfile(BaseModel):
@@ -100,6 +172,8 @@ class User(Document):
     is_verified: bool = False
     is_onboarded: bool = False
     role: str
+    # Bumped to revoke every access token issued before it
+    token_version: int = 0
     
     # Timestamp fields
     createdAt: datetime = Field(default_factory=datetime.utcnow)
@@ -122,6 +196,8 @@ class User(Document):
         ]
         
 
+EXPIRED_TOKEN_GRACE_SECONDS = 7 * 24 * 60 * 60
+
 class RefreshToken(Document):
     user_email: Indexed(str) # type: ignore
     refresh_token: Indexed(str, unique=True) # type: ignore
@@ -137,7 +213,8 @@ class RefreshToken(Document):
         indexes = [
             [("user_email", 1)],
             [("refresh_token", 1)],
-            [("expire", -1)],
+            # Mongo purges refresh tokens as soon as they expire
+            IndexModel([("expire", 1)], expireAfterSeconds=0, name="expire_ttl"),
         ]
 
 class ResetPasswordToken(Document):
@@ -155,7 +232,8 @@ class ResetPasswordToken(Document):
         indexes = [
             [("email", 1)],
             [("token", 1)],
-            [("expire", -1)],
+            # Kept for a grace period after expiry so users still get "Token expired"
+            IndexModel([("expire", 1)], expireAfterSeconds=EXPIRED_TOKEN_GRACE_SECONDS, name="expire_ttl"),
         ]
 
 class VerificationToken(Document):
@@ -173,7 +251,8 @@ class VerificationToken(Document):
         indexes = [
             [("email", 1)],
             [("token", 1)],
-            [("expire", -1)],
+            # Kept for a grace period after expiry so users still get "Token expired"
+            IndexModel([("expire", 1)], expireAfterSeconds=EXPIRED_TOKEN_GRACE_SECONDS, name="expire_ttl"),
         ]
 
 class LinkedMessages(Document):
@@ -227,6 +306,9 @@ class TokenData(BaseModel):
     email: Optional[str] = None
     is_valid: bool = False
     is_expired: bool = False
+    # Claims embedded in access tokens; absent on tokens issued before they were added
+    user_id: Optional[str] = None
+    token_version: int = 0
 
 class CheckToken(BaseModel):
     is_expired: bool
@@ -370,6 +452,17 @@ class JobUser(Document):
     email: Indexed(str) # type: ignore
     jobId: Indexed(str) # type: ignore
     application_status: str = ApplicationStatus.Pending.value
+
+    # Match results; no longer written here, new scores go to JobScore
+    match_score: Optional[float] = None
+    missing_skills: List[str] = []
+    matched_skills: List[str] = []
+    job_required_years: Optional[int] = None
+    salary_with_currency: Optional[str] = None
+    tfidf_similarity: Optional[float] = None
+    semantic_similarity: Optional[float] = None
+    skill_match_score: Optional[float] = None
+    experience_match_score: Optional[float] = None
     
     # Timestamp fields
     createdAt: datetime = Field(default_factory=datetime.utcnow)
@@ -383,10 +476,44 @@ class JobUser(Document):
     class Settings:
         name = "job_user"
         indexes = [
-            [("email", 1)],
+            IndexModel([("email", 1), ("jobId", 1)], unique=True, name="email_jobId_unique"),
             [("jobId", 1)],
         ]
 
+# How long a user's match scores are kept after the job was last scored for them
+JOB_SCORE_RETENTION_SECONDS = 30 * 24 * 3600
+
+class JobScore(Document):
+    """
+    A user's match scores for a job.
+
+    Kept apart from JobUser so scoring every job a user sees doesn't create
+    application records that pin the job in the hot collection; scores
+    expire on their own.
+    """
+    email: str
+    jobId: str
+    match_score: Optional[float] = None
+    missing_skills: List[str] = []
+    matched_skills: List[str] = []
+    job_required_years: Optional[int] = None
+    salary_with_currency: Optional[str] = None
+    tfidf_similarity: Optional[float] = None
+    semantic_similarity: Optional[float] = None
+    skill_match_score: Optional[float] = None
+    experience_match_score: Optional[float] = None
+
+    # Timestamp fields
+    createdAt: datetime = Field(default_factory=datetime.utcnow)
+    updatedAt: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "job_scores"
+        indexes = [
+            IndexModel([("email", 1), ("jobId", 1)], unique=True, name="email_jobId_unique"),
+            IndexModel([("updatedAt", 1)], expireAfterSeconds=JOB_SCORE_RETENTION_SECONDS, name="updatedAt_ttl"),
+        ]
+
 class ApplicationStatusUpdate(BaseModel):
     status: ApplicationStatus
     job_id: str
@@ -436,3 +563,31 @@ class Feedback(Document):
 
     class Settings:
         name = "feedback"
+
+class RateLimitSlot(Document):
+    """Next free start slot of a rate limit shared by every process."""
+    id: str = Field(alias="_id")  # Rate limit key
+    next_slot: datetime
+    # Slot handed out by the last reservation, and the server time it was made at
+    slot: Optional[datetime] = None
+    now: Optional[datetime] = None
+
+    class Settings:
+        name = "rate_limits"
+
+class SchedulerLease(Document):
+    """Cluster-wide lock on a scheduled job, so each run happens in one process."""
+    id: str = Field(alias="_id")  # Scheduler job id
+    owner: str
+    # Scheduled run the lease was taken for; a run key is only ever taken once
+    run_key: str
+    locked_until: datetime
+    finished_at: Optional[datetime] = None
+    # Kept past the lease so late workers still see the run was taken
+    expires_at: datetime
+
+    class Settings:
+        name = "scheduler_leases"
+        indexes = [
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0, name="expires_at_ttl"),
+        ]
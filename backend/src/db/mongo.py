@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from src.db.model import (
     JobQuery, 
     JobModel, 
+    JobArchiveModel,
+    JobQueryMembership,
+    JobContent,
     LinkedInProfile,
     ResumeUpdate, 
     User, 
@@ -17,18 +20,43 @@ from src.db.model import (
     AiOptimzedResumeModel,
     UserLinkedInProfiles,
     JobUser,
+    JobScore,
     ApplicationStatus,
     UsageStats,
     Features,
-    Feedback
+    Feedback,
+    SchedulerLease,
+    RateLimitSlot
 )
-from src.db.email_model import EmailTracking, EmailPreferences
+from src.db.email_model import EmailOutbox, EmailTracking, EmailPreferences
+from src.db.connection import mongo_connection
+from src.db.instrumentation import instrument_class, uninstrumented
+from src.db.user_cache import user_cache
+from src.utils.cache import cache
+from src.utils.compression import compress_bytes, compress_text, decompress_bytes, decompress_text
+from src.utils.location import normalize_job_types, normalize_location
+from src.utils.job_search_index import search_index
 
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
+from beanie.odm.utils.dump import get_dict
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+import bson
 from dotenv import load_dotenv
+import hashlib
+import uuid
 import os
 
+load_dotenv()
+
+# "inline" keeps descriptions in the jobs collection, "content" stores them compressed in job_content
+JOB_DESCRIPTION_STORAGE = os.getenv("JOB_DESCRIPTION_STORAGE", "inline")
+# With a shared cache (Redis) revocation deletes the entry everywhere, so it can live long
+TOKEN_VERSION_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "300"))
+# With the per-process cache this is how long other workers keep accepting a revoked token
+TOKEN_VERSION_LOCAL_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_VERSION_LOCAL_CACHE_TTL_SECONDS", "5"))
+
+@instrument_class
 class DatabaseOperations:
     """Handle all async database operations using Beanie."""
 
@@ -38,26 +66,18 @@ class DatabaseOperations:
         
         This function should be called once at the start of your application.
         """
-        # Load environment variables if not already loaded
-        load_dotenv()
-
-        # Get the connection string from environment variables
-        CONNECTION_STRING = os.getenv("MONGO_CONNECTION_STRING")
-        if not CONNECTION_STRING:
-            raise ValueError("MONGO_CONNECTION_STRING is not set in environment variables")
-
-        # Create an async motor client
-        client = AsyncIOMotorClient(CONNECTION_STRING)
-
-        # Specify the database name
-        database_name = os.getenv("MONGO_DATABASE", "jobify-testing")
-        print(f"Connecting to database: {database_name}")
+        # One client per process, configured from the MONGO_* pool settings
+        database = mongo_connection.connect()
+        print(f"Connecting to database: {database.name}")
 
         # Initialize Beanie with all your document models
         await init_beanie(
-            database=client[database_name], 
+            database=database, 
             document_models=[
                 JobModel, 
+                JobArchiveModel,
+                JobQueryMembership,
+                JobContent,
                 CompanyLinkedInProfiles, 
                 User, 
                 RefreshToken, 
@@ -65,50 +85,178 @@ class DatabaseOperations:
                 VerificationToken,
                 EmailTracking,
                 EmailPreferences,
+                EmailOutbox,
                 LinkedMessages,
                 ResumeModel,
                 AiOptimzedResumeModel,
                 UserLinkedInProfiles,
                 JobUser,
+                JobScore,
                 UsageStats,
-                Feedback
+                Feedback,
+                SchedulerLease,
+                RateLimitSlot
             ]
         )
 
-    async def get_jobs_from_db(self, query_params: JobQuery, date_posted: str) -> List[JobModel]:
+    def _query_jobs_pipeline(self, query_params: JobQuery, min_date: datetime) -> List[dict]:
+        """
+        Build the aggregation that joins a search's memberships to its jobs.
+
+        Memberships are bounded by lastSeenAt before the join, since a job
+        posted after min_date can only have been seen after it, and the
+        posting date is filtered inside the lookup so stale jobs never leave
+        the server.
+
+        Args:
+            query_params (JobQuery): Query parameters for job search
+            min_date (datetime): Minimum date for job posting
+
+        Returns:
+            List[dict]: Pipeline stages yielding job documents, newest first
+        """
+        return [
+            {"$match": {
+                "query_key": query_params.canonical_key(),
+                "distance": {"$lte": query_params.distance},
+                "lastSeenAt": {"$gte": min_date}
+            }},
+            {"$lookup": {
+                "from": JobModel.get_motor_collection().name,
+                "localField": "jobId",
+                "foreignField": "_id",
+                "pipeline": [{"$match": {"date_posted": {"$gte": min_date}}}],
+                "as": "job"
+            }},
+            {"$unwind": "$job"},
+            {"$replaceRoot": {"newRoot": "$job"}},
+            {"$sort": {"date_posted": -1}}
+        ]
+
+    async def get_jobs_from_db(self, query_params: JobQuery, date_posted: datetime) -> List[JobModel]:
         """
         Retrieve jobs from database based on query parameters.
         
         Args:
             query_params (JobQuery): Query parameters for job search
-            date_posted (str): Minimum date for job posting
+            date_posted (datetime): Minimum date for job posting
         
         Returns:
             List[JobModel]: List of jobs matching the criteria
         """
-        return await JobModel.find(
-            JobModel.query.city == query_params.city,
-            JobModel.query.country_code == query_params.country_code,
-            JobModel.query.country == query_params.country,
-            JobModel.query.job_title == query_params.job_title,
-            JobModel.query.job_type == query_params.job_type,
-            JobModel.query.is_remote == query_params.is_remote,
-            JobModel.query.distance <= query_params.distance,
-            JobModel.date_posted >= date_posted,
-            sort=[("date_posted", -1)]
-        ).to_list()
+        pipeline = self._query_jobs_pipeline(query_params, date_posted)
+        cursor = JobQueryMembership.get_motor_collection().aggregate(pipeline)
+        return [JobModel.model_validate(doc) async for doc in cursor]
 
     async def update_jobs(self, jobs: List[JobModel], query_params: JobQuery):
         """
-        Update jobs in database with query parameters.
+        Upsert scraped jobs and record that the search returned them.
+
+        A job keeps the query it was first found with; every search that
+        returns it is tracked in JobQueryMembership instead.
         
         Args:
             jobs (List[JobModel]): List of jobs to update
             query_params (JobQuery): Query parameters to associate with jobs
         """
+        if not jobs:
+            return
+        now = datetime.utcnow()
+        query_key = query_params.canonical_key()
+        job_operations = []
+        membership_operations = []
+        contents = {}
         for job in jobs:
-            job.query = query_params
-            await job.save()
+            job_doc = get_dict(job, to_db=True)
+            job_id = job_doc.pop("_id")
+            job_doc.pop("query", None)
+            job_doc.pop("createdAt", None)
+            job_doc["updatedAt"] = now
+            if JOB_DESCRIPTION_STORAGE == "content":
+                for field in ["description", "company_description"]:
+                    text = job_doc.get(field)
+                    if not text:
+                        continue
+                    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                    contents[content_hash] = text
+                    job_doc[f"{field}_hash"] = content_hash
+                    job_doc[field] = ""
+            job_operations.append(UpdateOne(
+                {"_id": job_id},
+                {
+                    "$set": job_doc,
+                    "$setOnInsert": {"query": query_params.model_dump(), "createdAt": now}
+                },
+                upsert=True
+            ))
+            membership_operations.append(UpdateOne(
+                {"query_key": query_key, "jobId": job_id},
+                {
+                    "$set": {"lastSeenAt": now},
+                    "$min": {"distance": query_params.distance},
+                    "$setOnInsert": {"firstSeenAt": now}
+                },
+                upsert=True
+            ))
+        if contents:
+            # Content is immutable per hash, so only new descriptions are written;
+            # lastUsedAt keeps content that is still being scraped out of garbage collection
+            await JobContent.get_motor_collection().bulk_write([
+                UpdateOne(
+                    {"_id": content_hash},
+                    {
+                        "$set": {"lastUsedAt": now},
+                        "$setOnInsert": {"data": compress_text(text), "size": len(text), "createdAt": now}
+                    },
+                    upsert=True
+                )
+                for content_hash, text in contents.items()
+            ], ordered=False)
+        await JobModel.get_motor_collection().bulk_write(job_operations, ordered=False)
+        await JobQueryMembership.get_motor_collection().bulk_write(membership_operations, ordered=False)
+        for job in jobs:
+            search_index.add(job.id, job.title, job.company, job.description)
+
+    async def get_content_texts(self, content_hashes: List[str]) -> Dict[str, str]:
+        """
+        Fetch and decompress stored description bodies.
+
+        Args:
+            content_hashes (List[str]): Content hashes to load
+
+        Returns:
+            Dict[str, str]: Decompressed text keyed by hash
+        """
+        if not content_hashes:
+            return {}
+        cursor = JobContent.get_motor_collection().find({"_id": {"$in": list(set(content_hashes))}})
+        return {content["_id"]: decompress_text(content["data"]) async for content in cursor}
+
+    async def load_job_descriptions(self, jobs: List[dict]) -> List[dict]:
+        """
+        Fill in descriptions stored in JobContent, in one query for the whole list.
+
+        Jobs stored inline are left untouched.
+
+        Args:
+            jobs (List[dict]): Job dicts, as dumped from JobModel or read raw
+
+        Returns:
+            List[dict]: The same dicts with descriptions restored
+        """
+        fields = ["description", "company_description"]
+        content_hashes = [
+            job[f"{field}_hash"]
+            for job in jobs for field in fields
+            if job.get(f"{field}_hash") and not job.get(field)
+        ]
+        texts = await self.get_content_texts(content_hashes)
+        for job in jobs:
+            for field in fields:
+                content_hash = job.get(f"{field}_hash")
+                if content_hash and not job.get(field):
+                    job[field] = texts.get(content_hash, "")
+        return jobs
 
     async def get_linkedin_profiles(self, job: JobModel, userEmail: str) -> Optional[List[LinkedInProfile]]:
         """
@@ -197,15 +345,89 @@ class DatabaseOperations:
             Optional[User]: User document or None
         """
         return await User.find_one({"email": email})
+
+    @uninstrumented
+    async def get_cached_user(self, email: str) -> Optional[User]:
+        """
+        Get a user for request authentication, served from the user cache when possible.
+
+        Args:
+            email (str): User email
+
+        Returns:
+            Optional[User]: Copy of the user without its password, or None
+        """
+        user = await user_cache.get(email)
+        if user:
+            return user
+        user = await self.get_user(email)
+        if not user:
+            return None
+        await user_cache.set(user)
+        user.password = None
+        return user
+
+    @uninstrumented
+    async def invalidate_user(self, email: str) -> None:
+        """Drop a user from the auth cache; call after any write to the user document (name, password, role, ...)."""
+        await user_cache.invalidate(email)
     
-    async def add_verification_token(self, email: str, token: str, expire: str):
+    @uninstrumented
+    async def get_token_version(self, email: str) -> Optional[int]:
+        """
+        Get the user's current access token version.
+
+        Both auth paths check tokens against this, so a revocation is seen
+        the same way everywhere. With a shared cache (Redis) revoke_user_tokens'
+        delete reaches every worker and takes effect at once. With the
+        per-process cache, other workers keep the old version for up to
+        TOKEN_VERSION_LOCAL_CACHE_TTL_SECONDS, which bounds the revocation
+        delay while sparing most requests a users lookup.
+
+        Args:
+            email (str): User email
+
+        Returns:
+            Optional[int]: Token version, or None if the user does not exist
+        """
+        key = f"token_version:{email}"
+        version = await cache.get(key)
+        if version is not None:
+            return version
+        user = await User.get_motor_collection().find_one({"email": email}, {"token_version": 1})
+        if not user:
+            return None
+        version = user.get("token_version", 0)
+        ttl_seconds = TOKEN_VERSION_CACHE_TTL_SECONDS if cache.shared else TOKEN_VERSION_LOCAL_CACHE_TTL_SECONDS
+        await cache.set(key, version, ttl_seconds)
+        return version
+
+    async def revoke_user_tokens(self, email: str) -> None:
+        """
+        Invalidate every access and refresh token issued to a user.
+
+        Access tokens carry the token version they were issued with, so bumping
+        it makes them fail the version check on their next use.
+
+        Args:
+            email (str): User email
+        """
+        await User.get_motor_collection().update_one({"email": email}, {"$inc": {"token_version": 1}})
+        await RefreshToken.get_motor_collection().update_many(
+            {"user_email": email, "revoked": False},
+            {"$set": {"revoked": True}}
+        )
+        await cache.delete(f"token_version:{email}")
+        await self.invalidate_user(email)
+
+    async def add_verification_token(self, email: str, token: str, expire: datetime):
         """
         Add a verification token to the database.
         
         Args:
             email (str): User email
             token (str): Verification token
-            expire (str): Token expiration time
+            expire (datetime): Token expiration time (UTC)
         
         Returns:
             str: Inserted token ID
@@ -213,7 +435,7 @@ class DatabaseOperations:
         verification_token = VerificationToken(
             email=email,
             token=token,
-            expire=datetime.strptime(expire, "%Y-%m-%d %H:%M:%S"),
+            expire=expire,
             revoked=False
         )
         await verification_token.save()
@@ -280,17 +502,18 @@ class DatabaseOperations:
         user = await self.get_user(user_email)
         user.is_verified = True
         await user.save()
+        await self.invalidate_user(user_email)
         await self.revoke_verification_token(token)
         return True, False, ""
     
-    async def add_refresh_token(self, user_email: str, refresh_token: str, expire: str):
+    async def add_refresh_token(self, user_email: str, refresh_token: str, expire: datetime):
         """
         Add a refresh token to the database.
         
         Args:
             user_email (str): User email
             refresh_token (str): Refresh token
-            expire (str): Token expiration time
+            expire (datetime): Token expiration time (UTC)
         
         Returns:
             str: Inserted refresh token ID
@@ -299,7 +522,7 @@ class DatabaseOperations:
             user_email=user_email,
             refresh_token=refresh_token,
             revoked=False,
-            expire=datetime.strptime(expire, "%Y-%m-%d %H:%M:%S")
+            expire=expire
         )
         await new_refresh_token.save()
         return str(new_refresh_token.id)
@@ -337,14 +560,14 @@ class DatabaseOperations:
             await token.save()
         return token
     
-    async def add_reset_password_token(self, email: str, token: str, expire: str):
+    async def add_reset_password_token(self, email: str, token: str, expire: datetime):
         """
         Add a reset password token to the database.
         
         Args:
             email (str): User email
             token (str): Reset password token
-            expire (str): Token expiration time
+            expire (datetime): Token expiration time (UTC)
         
         Returns:
             str: Inserted reset password token ID
@@ -352,7 +575,7 @@ class DatabaseOperations:
         reset_token = ResetPasswordToken(
             email=email,
             token=token,
-            expire=datetime.strptime(expire, "%Y-%m-%d %H:%M:%S"),
+            expire=expire,
             revoked=False
         )
         await reset_token.save()
@@ -434,6 +657,8 @@ class DatabaseOperations:
         if user:
             user.password = password
             await user.save()
+            # Sessions opened with the old password must not outlive it
+            await self.revoke_user_tokens(email)
         
         # Revoke the reset password token
         await self.revoke_reset_password_token(token)
@@ -450,7 +675,176 @@ class DatabaseOperations:
         Returns:
             Optional[JobModel]: Job document or None
         """
-        return await JobModel.find_one({"_id": job_id})
+        job = await JobModel.find_one({"_id": job_id})
+        if not job:
+            job = await self.get_archived_job(job_id)
+        if job and (job.description_hash or job.company_description_hash):
+            texts = await self.get_content_texts([h for h in [job.description_hash, job.company_description_hash] if h])
+            job.description = job.description or texts.get(job.description_hash, "")
+            job.company_description = job.company_description or texts.get(job.company_description_hash, "")
+        return job
+
+    async def get_archived_job(self, job_id: str) -> Optional[JobModel]:
+        """
+        Get a job from the cold archive collection.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Optional[JobModel]: Decompressed job document or None
+        """
+        archived = await JobArchiveModel.find_one({"_id": job_id})
+        if not archived:
+            return None
+        return JobModel.model_validate(bson.decode(decompress_bytes(archived.payload)))
+
+    def stream_stale_jobs(self, cutoff: datetime, batch_size: int = 500):
+        """
+        Stream raw job documents last scraped before the cutoff.
+
+        Args:
+            cutoff (datetime): Jobs not seen by a scrape since this time are stale
+            batch_size (int): Number of documents fetched per round trip
+
+        Returns:
+            AsyncIOMotorCursor: Cursor over stale job documents
+        """
+        return JobModel.get_motor_collection().find({"updatedAt": {"$lt": cutoff}}, batch_size=batch_size)
+
+    async def get_referenced_job_ids(self, job_ids: List[str]) -> set:
+        """Get the subset of job IDs some user has applied to or is tracking an application for."""
+        return set(await JobUser.get_motor_collection().distinct(
+            "jobId",
+            {"jobId": {"$in": job_ids}, "application_status": {"$ne": ApplicationStatus.Pending.value}}
+        ))
+
+    async def archive_jobs(self, jobs: List[dict]):
+        """
+        Move raw job documents into the compressed archive collection.
+
+        Args:
+            jobs (List[dict]): Raw job documents from the hot collection
+        """
+        if not jobs:
+            return
+        now = datetime.utcnow()
+        operations = [
+            ReplaceOne(
+                {"_id": job["_id"]},
+                {
+                    "title": job.get("title", ""),
+                    "company": job.get("company", ""),
+                    "payload": compress_bytes(bson.encode(job)),
+                    "content_hashes": [job[field] for field in ["description_hash", "company_description_hash"] if job.get(field)],
+                    "archivedAt": now
+                },
+                upsert=True
+            )
+            for job in jobs
+        ]
+        await JobArchiveModel.get_motor_collection().bulk_write(operations, ordered=False)
+        await self.delete_jobs([job["_id"] for job in jobs])
+
+    async def delete_jobs(self, job_ids: List[str]) -> int:
+        """Delete jobs, and the searches they belong to, from the hot collection."""
+        result = await JobModel.get_motor_collection().delete_many({"_id": {"$in": job_ids}})
+        await JobQueryMembership.get_motor_collection().delete_many({"jobId": {"$in": job_ids}})
+        for job_id in job_ids:
+            search_index.remove(job_id)
+        return result.deleted_count
+
+    def _unused_content_filter(self, cutoff: datetime) -> dict:
+        return {"$or": [
+            {"lastUsedAt": {"$lt": cutoff}},
+            {"lastUsedAt": None, "createdAt": {"$lt": cutoff}}
+        ]}
+
+    async def stream_unused_content_hashes(self, cutoff: datetime, batch_size: int = 500):
+        """
+        Stream the hashes of JobContent rows no scrape has stored since cutoff.
+
+        Args:
+            cutoff (datetime): Content last used before this time is a candidate
+            batch_size (int): Cursor batch size
+        """
+        cursor = JobContent.get_motor_collection().find(
+            self._unused_content_filter(cutoff), {"_id": 1}, batch_size=batch_size
+        )
+        async for content in cursor:
+            yield content["_id"]
+
+    async def delete_unreferenced_content(self, content_hashes: List[str], cutoff: datetime) -> int:
+        """
+        Delete JobContent rows that neither a hot nor an archived job points to.
+
+        Args:
+            content_hashes (List[str]): Candidate hashes from stream_unused_content_hashes
+            cutoff (datetime): Rows used again since this time are kept
+
+        Returns:
+            int: Number of rows deleted
+        """
+        if not content_hashes:
+            return 0
+        referenced = set()
+        async for job in JobModel.get_motor_collection().find(
+            {"$or": [
+                {"description_hash": {"$in": content_hashes}},
+                {"company_description_hash": {"$in": content_hashes}}
+            ]},
+            {"description_hash": 1, "company_description_hash": 1}
+        ):
+            referenced.update([job.get("description_hash"), job.get("company_description_hash")])
+        async for archived in JobArchiveModel.get_motor_collection().find(
+            {"content_hashes": {"$in": content_hashes}}, {"content_hashes": 1}
+        ):
+            referenced.update(archived["content_hashes"])
+        unreferenced = [content_hash for content_hash in content_hashes if content_hash not in referenced]
+        if not unreferenced:
+            return 0
+        # Re-check the cutoff so content a scrape reused since the lookup survives
+        result = await JobContent.get_motor_collection().delete_many(
+            {"_id": {"$in": unreferenced}, **self._unused_content_filter(cutoff)}
+        )
+        return result.deleted_count
+
+    async def stream_jobs_for_index(self, since: Optional[datetime] = None, batch_size: int = 500):
+        """
+        Stream the fields the full-text search index is built from, with descriptions restored.
+
+        Args:
+            since (Optional[datetime]): Only jobs updated at or after this time
+            batch_size (int): Jobs per description lookup
+        """
+        cursor = JobModel.get_motor_collection().find(
+            {"updatedAt": {"$gte": since}} if since else {},
+            {"title": 1, "company": 1, "description": 1, "description_hash": 1},
+            batch_size=batch_size
+        )
+        batch = []
+        async for job in cursor:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                for loaded in await self.load_job_descriptions(batch):
+                    yield loaded
+                batch = []
+        for loaded in await self.load_job_descriptions(batch):
+            yield loaded
+
+    async def get_jobs_by_ids(self, job_ids: List[str]) -> List[JobModel]:
+        """
+        Get jobs by ID, preserving the order of the given IDs.
+
+        Args:
+            job_ids (List[str]): Job IDs, e.g. in search rank order
+
+        Returns:
+            List[JobModel]: Jobs that still exist in the hot collection
+        """
+        jobs = await JobModel.find({"_id": {"$in": job_ids}}).to_list()
+        jobs_by_id = {job.id: job for job in jobs}
+        return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
     
     async def check_if_user_has_linked_profiles_for_a_job(self, job: JobModel, email: str):
         """
@@ -543,6 +937,7 @@ class DatabaseOperations:
             if not user.is_onboarded:
                 user.is_onboarded = is_onboarded
             await user.save()
+            await self.invalidate_user(email)
         return user
     
     async def get_user_resume(self, email: str):
@@ -598,38 +993,25 @@ class DatabaseOperations:
         )
         return ai_optimized_resume
     
-    async def get_jobs_count(self, query_params: JobQuery, min_date: str) -> int:
+    async def get_jobs_count(self, query_params: JobQuery, min_date: datetime) -> int:
         """
         Get the number of jobs in the database.
         """
-        return await JobModel.find(
-            JobModel.query.city == query_params.city,
-            JobModel.query.country_code == query_params.country_code,
-            JobModel.query.country == query_params.country,
-            JobModel.query.job_title == query_params.job_title,
-            JobModel.query.job_type == query_params.job_type,
-            JobModel.query.is_remote == query_params.is_remote,
-            JobModel.query.distance <= query_params.distance,
-            JobModel.date_posted >= min_date
-        ).count()
-    
-    async def get_jobs_from_db_paginated(self, query_params: JobQuery, min_date: str, skip: int, limit: int) -> List[JobModel]:
-        return await JobModel.find(
-            JobModel.query.city == query_params.city,
-            JobModel.query.country_code == query_params.country_code,
-            JobModel.query.country == query_params.country,
-            JobModel.query.job_title == query_params.job_title,
-            JobModel.query.job_type == query_params.job_type,
-            JobModel.query.is_remote == query_params.is_remote,
-            JobModel.query.distance <= query_params.distance,
-            JobModel.date_posted >= min_date
-        ).skip(skip).limit(limit).to_list()
+        pipeline = self._query_jobs_pipeline(query_params, min_date)[:-1] + [{"$count": "count"}]
+        result = await JobQueryMembership.get_motor_collection().aggregate(pipeline).to_list(1)
+        return result[0]["count"] if result else 0
+    
+    async def get_jobs_from_db_paginated(self, query_params: JobQuery, min_date: datetime, skip: int, limit: int) -> List[JobModel]:
+        pipeline = self._query_jobs_pipeline(query_params, min_date) + [{"$skip": skip}, {"$limit": limit}]
+        cursor = JobQueryMembership.get_motor_collection().aggregate(pipeline)
+        return [JobModel.model_validate(doc) async for doc in cursor]
     
     async def update_user_name(self, email: str, name: str):
         user = await User.find_one({"email": email})
         if user:
             user.name = name
             user = await user.save()
+            await self.invalidate_user(email)
             return user, True
         return None, False
     
@@ -640,55 +1022,122 @@ class DatabaseOperations:
         })
         return job_user
     
+    async def get_user_jobs(self, email: str, job_ids: List[str]) -> Dict[str, JobUser]:
+        """
+        Get the user's job records for a set of jobs in one query.
+
+        Args:
+            email (str): User email
+            job_ids (List[str]): Job IDs to look up
+
+        Returns:
+            Dict[str, JobUser]: Job records keyed by job ID
+        """
+        job_users = await JobUser.find(
+            JobUser.email == email,
+            {"jobId": {"$in": job_ids}}
+        ).to_list()
+        return {job_user.jobId: job_user for job_user in job_users}
+
+    async def get_job_users_for_emails(self, emails: List[str], job_ids: List[str]) -> Dict[str, Dict[str, JobUser]]:
+        """
+        Get many users' job records for a set of jobs in one query.
+
+        Returns:
+            Dict[str, Dict[str, JobUser]]: Job records keyed by email, then job ID
+        """
+        if not emails or not job_ids:
+            return {}
+        job_users = await JobUser.find(
+            {"email": {"$in": emails}, "jobId": {"$in": job_ids}}
+        ).to_list()
+        records: Dict[str, Dict[str, JobUser]] = {}
+        for job_user in job_users:
+            records.setdefault(job_user.email, {})[job_user.jobId] = job_user
+        return records
+
     async def add_user_to_job(self, email: str, job_id: str, match_score: int, missing_skills: List[str], matched_skills: List[str], job_required_years: int, salary_with_currency: str, tfidf_similarity: int, semantic_similarity: int, skill_match_score: int, experience_match_score: int):
-        job_user = await JobUser.find_one({
-            "email": email,
-            "jobId": job_id
-        })
-        if not job_user:
-            job_user = JobUser(
-                email=email,
-                jobId=job_id,
-                match_score=match_score,
-                missing_skills=missing_skills,
-                matched_skills=matched_skills,
-                job_required_years=job_required_years,
-                salary_with_currency=salary_with_currency,
-                tfidf_similarity=tfidf_similarity,
-                semantic_similarity=semantic_similarity,
-                skill_match_score=skill_match_score,
-                experience_match_score=experience_match_score
+        """
+        Persist match scores for a user and job with a single upsert.
+
+        Returns:
+            bool: Whether a record was inserted or updated
+        """
+        now = datetime.utcnow()
+        result = await JobScore.get_motor_collection().update_one(
+            {"email": email, "jobId": job_id},
+            {
+                "$set": {
+                    "match_score": match_score,
+                    "missing_skills": missing_skills,
+                    "matched_skills": matched_skills,
+                    "job_required_years": job_required_years,
+                    "salary_with_currency": salary_with_currency,
+                    "tfidf_similarity": tfidf_similarity,
+                    "semantic_similarity": semantic_similarity,
+                    "skill_match_score": skill_match_score,
+                    "experience_match_score": experience_match_score,
+                    "updatedAt": now
+                },
+                "$setOnInsert": {"createdAt": now}
+            },
+            upsert=True
+        )
+        return result.upserted_id is not None or result.matched_count > 0
+
+    async def save_job_scores(self, email: str, matches: List[Tuple[str, dict]]):
+        """
+        Persist match scores for a whole page of jobs in one bulk write.
+
+        Args:
+            email (str): User email
+            matches (List[Tuple[str, dict]]): (job ID, matcher result) pairs
+        """
+        if not matches:
+            return None
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"email": email, "jobId": job_id},
+                {
+                    "$set": {
+                        "match_score": match["overall_score"],
+                        "missing_skills": match["missing_skills"],
+                        "matched_skills": match["matched_skills"],
+                        "job_required_years": match["job_required_years"],
+                        "salary_with_currency": match["salary_with_currency"],
+                        "tfidf_similarity": match["tfidf_similarity"],
+                        "semantic_similarity": match["semantic_similarity"],
+                        "skill_match_score": match["skill_match_score"],
+                        "experience_match_score": match["experience_match_score"],
+                        "updatedAt": now
+                    },
+                    "$setOnInsert": {"createdAt": now}
+                },
+                upsert=True
             )
-            return await job_user.save()
-        job_user.match_score = match_score
-        job_user.missing_skills = missing_skills
-        job_user.matched_skills = matched_skills
-        job_user.job_required_years = job_required_years
-        job_user.salary_with_currency = salary_with_currency
-        job_user.tfidf_similarity = tfidf_similarity
-        job_user.semantic_similarity = semantic_similarity
-        job_user.skill_match_score = skill_match_score
-        job_user.experience_match_score = experience_match_score
-        return await job_user.save()
-    
+            for job_id, match in matches
+        ]
+        # Scores live in their own expiring collection; job_user only holds application state
+        return await JobScore.get_motor_collection().bulk_write(operations, ordered=False)
+
     async def update_application_status(self, email: str, job_id: str, status: ApplicationStatus):
-        job_user = await JobUser.find_one({
-            "email": email,
-            "jobId": job_id
-        })
-        if job_user:
-            job_user.application_status = status
-            await job_user.save()
-            return job_user
-        else:
-            return await JobUser.insert(
-                JobUser(
-                    email=email,
-                    jobId=job_id,
-                    application_status=status.value
-                )
-            )
-        return None
+        """
+        Set the application status for a user and job with a single upsert.
+
+        Returns:
+            bool: Whether a record was inserted or updated
+        """
+        now = datetime.utcnow()
+        result = await JobUser.get_motor_collection().update_one(
+            {"email": email, "jobId": job_id},
+            {
+                "$set": {"application_status": ApplicationStatus(status).value, "updatedAt": now},
+                "$setOnInsert": {"createdAt": now}
+            },
+            upsert=True
+        )
+        return result.upserted_id is not None or result.matched_count > 0
     
     async def get_applied_jobs(self, email: str):
         return await JobUser.find(
@@ -729,16 +1178,47 @@ class DatabaseOperations:
     async def get_users(self):
         return await User.find().to_list()
 
+    async def get_users_by_emails(self, emails: List[str]) -> Dict[str, User]:
+        """Get users for many emails in one query, keyed by email."""
+        if not emails:
+            return {}
+        users = await User.find({"email": {"$in": list(set(emails))}}).to_list()
+        return {user.email: user for user in users}
+
     async def get_user_count(self):
         """Get the total count of registered users efficiently"""
         return await User.count()
 
+    async def get_estimated_user_count(self) -> int:
+        """Get the approximate user count from collection metadata, without a scan."""
+        return await User.get_motor_collection().estimated_document_count()
+
     async def get_usage_stats(self):
         return await UsageStats.find().to_list()
 
     async def get_feedback(self):
         return await Feedback.find().to_list()
-        
+
+    def stream_users(self, batch_size: int = 500):
+        """
+        Stream raw user documents without materializing the collection.
+
+        Args:
+            batch_size (int): Number of documents fetched per round trip
+
+        Returns:
+            AsyncIOMotorCursor: Cursor over user documents, passwords excluded
+        """
+        return User.get_motor_collection().find({}, {"password": 0}, batch_size=batch_size)
+
+    def stream_usage_stats(self, batch_size: int = 500):
+        """Stream raw usage stats documents in batches."""
+        return UsageStats.get_motor_collection().find({}, batch_size=batch_size)
+
+    def stream_feedback(self, batch_size: int = 500):
+        """Stream raw feedback documents in batches."""
+        return Feedback.get_motor_collection().find({}, batch_size=batch_size)
+
     async def create_email_tracking(self, user_id: str, email: str, email_type: str, reminder_count: int, unsubscribe_token: str) -> EmailTracking:
         """Create a new email tracking record."""
         tracking = EmailTracking(
@@ -752,24 +1232,245 @@ class DatabaseOperations:
         await tracking.save()
         return tracking
 
-    async def get_last_reminder(self, user_id: str) -> Optional[EmailTracking]:
-        """Get the last reminder sent to a user."""
-        return await EmailTracking.find_one(
+    async def enqueue_emails(self, emails: List[EmailOutbox]) -> None:
+        """Add emails to the outbox; the outbox workers send them."""
+        if emails:
+            await EmailOutbox.insert_many(emails)
+
+    async def claim_outbox_emails(self, limit: int, lease_seconds: int) -> List[EmailOutbox]:
+        """
+        Claim due outbox emails for one worker.
+
+        Emails whose lease ran out (a worker died mid-send) are claimable
+        again. The claim is a single conditional update, so concurrent
+        workers never get the same email.
+
+        Args:
+            limit (int): Maximum number of emails to claim
+            lease_seconds (int): How long the claim holds before others may retry it
+
+        Returns:
+            List[EmailOutbox]: The claimed emails
+        """
+        now = datetime.utcnow()
+        due = {"$or": [
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"status": "sending", "locked_until": {"$lt": now}},
+        ]}
+        collection = EmailOutbox.get_motor_collection()
+        candidates = await collection.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(limit).to_list(limit)
+        if not candidates:
+            return []
+        claim_id = uuid.uuid4().hex
+        await collection.update_many(
+            {"$and": [{"_id": {"$in": [candidate["_id"] for candidate in candidates]}}, due]},
+            {
+                "$set": {"status": "sending", "claim_id": claim_id, "locked_until": now + timedelta(seconds=lease_seconds)},
+                "$inc": {"attempts": 1}
+            }
+        )
+        return await EmailOutbox.find({"claim_id": claim_id}).to_list()
+
+    async def finish_outbox_emails(self, results: List[Tuple[EmailOutbox, bool]], max_attempts: int, backoff_seconds: int) -> None:
+        """
+        Record send results: mark sent emails and their tracking, reschedule or fail the rest.
+
+        Args:
+            results (List[Tuple[EmailOutbox, bool]]): Claimed emails with whether each was sent
+            max_attempts (int): Attempts after which an email is marked failed
+            backoff_seconds (int): Base retry delay, doubled on every attempt
+        """
+        now = datetime.utcnow()
+        operations = []
+        trackings = []
+        for email, sent in results:
+            # Only the current claim may finish an email
+            claim_filter = {"_id": email.id, "claim_id": email.claim_id}
+            if sent:
+                operations.append(UpdateOne(claim_filter, {"$set": {"status": "sent", "sent_at": now, "locked_until": None}}))
+                if email.tracking:
+                    trackings.append(EmailTracking(sent_at=now, **email.tracking))
+            elif email.attempts >= max_attempts:
+                operations.append(UpdateOne(claim_filter, {"$set": {"status": "failed", "locked_until": None, "last_error": "Provider did not accept the email"}}))
+            else:
+                retry_at = now + timedelta(seconds=backoff_seconds * 2 ** (email.attempts - 1))
+                operations.append(UpdateOne(claim_filter, {"$set": {"status": "pending", "next_attempt_at": retry_at, "locked_until": None, "last_error": "Provider did not accept the email"}}))
+        if operations:
+            await EmailOutbox.get_motor_collection().bulk_write(operations, ordered=False)
+        if trackings:
+            await EmailTracking.insert_many(trackings)
+
+    async def reserve_rate_limit_slot(self, key: str, interval_seconds: float) -> float:
+        """
+        Reserve the next start slot of a cluster-wide rate limit.
+
+        Slots are spaced on the Mongo server's clock, so every process using
+        the same key draws from one schedule.
+
+        Args:
+            key (str): Identifies the rate limit
+            interval_seconds (float): Spacing between consecutive slots
+
+        Returns:
+            float: Seconds to wait until the reserved slot
+        """
+        reservation = await RateLimitSlot.get_motor_collection().find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {"slot": {"$max": ["$$NOW", "$next_slot"]}, "now": "$$NOW"}},
+                {"$set": {"next_slot": {"$add": ["$slot", interval_seconds * 1000]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return max((reservation["slot"] - reservation["now"]).total_seconds(), 0.0)
+
+    async def acquire_scheduler_lease(self, job_id: str, run_key: str, owner: str, lease_seconds: int, retention_seconds: int) -> bool:
+        """
+        Take the lease on a scheduled job's run, if no other process holds it or already took this run.
+
+        Args:
+            job_id (str): Scheduler job id
+            run_key (str): Identifies the scheduled run, the same in every process
+            owner (str): Identifies the calling process
+            lease_seconds (int): How long the lease holds without renewal
+            retention_seconds (int): How long the lease document outlives the lease
+
+        Returns:
+            bool: Whether this process should run the job
+        """
+        now = datetime.utcnow()
+        locked_until = now + timedelta(seconds=lease_seconds)
+        try:
+            lease = await SchedulerLease.get_motor_collection().find_one_and_update(
+                {"_id": job_id, "run_key": {"$ne": run_key}, "locked_until": {"$lt": now}},
+                {"$set": {
+                    "owner": owner,
+                    "run_key": run_key,
+                    "locked_until": locked_until,
+                    "finished_at": None,
+                    "expires_at": locked_until + timedelta(seconds=retention_seconds),
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # The lease exists and is held or this run was already taken, so the upsert collided
+            return False
+        return lease is not None and lease["owner"] == owner
+
+    async def renew_scheduler_lease(self, job_id: str, owner: str, lease_seconds: int, retention_seconds: int) -> bool:
+        """Extend a held lease; returns False if it was lost to another process."""
+        locked_until = datetime.utcnow() + timedelta(seconds=lease_seconds)
+        result = await SchedulerLease.get_motor_collection().update_one(
+            {"_id": job_id, "owner": owner, "finished_at": None},
+            {"$set": {"locked_until": locked_until, "expires_at": locked_until + timedelta(seconds=retention_seconds)}}
+        )
+        return result.matched_count == 1
+
+    async def release_scheduler_lease(self, job_id: str, owner: str) -> None:
+        """Release a lease after its run; the run key stays so the run isn't repeated."""
+        now = datetime.utcnow()
+        await SchedulerLease.get_motor_collection().update_one(
+            {"_id": job_id, "owner": owner},
+            {"$set": {"locked_until": now, "finished_at": now}}
+        )
+
+    async def get_recommended_job_ids(self, user_ids: List[str]) -> Dict[str, set]:
+        """Get the jobs already sent to each user in job recommendation emails, keyed by user ID."""
+        if not user_ids:
+            return {}
+        recommended: Dict[str, set] = {}
+        cursor = EmailTracking.get_motor_collection().find(
+            {"user_id": {"$in": user_ids}, "email_type": "job_recommendations"},
+            {"_id": 0, "user_id": 1, "job_ids": 1}
+        )
+        async for tracking in cursor:
+            recommended.setdefault(tracking["user_id"], set()).update(tracking.get("job_ids", []))
+        return recommended
+
+    async def get_outbox_counts(self) -> Dict[str, int]:
+        """Number of outbox emails in each status."""
+        pipeline = [{"$group": {"_id": "$status", "count": {"$sum": 1}}}]
+        return {row["_id"]: row["count"] async for row in EmailOutbox.get_motor_collection().aggregate(pipeline)}
+
+    async def get_users_due_reminder(self, user_filter: dict, email_type: str, schedule_days: List[int]) -> List[Tuple[User, int]]:
+        """
+        Get the users matching a filter who are due their next reminder, in one aggregation.
+
+        Each user is joined with their latest tracking record of the given type
+        (served by the (user_id, email_type, sent_at) index); users past the end
+        of the schedule, or whose last reminder is more recent than the next
+        step's day threshold, are dropped server-side.
+
+        Args:
+            user_filter (dict): Users to consider
+            email_type (str): Tracking type of the reminder, e.g. 'reminder'
+            schedule_days (List[int]): Days to wait before each reminder, in order
+
+        Returns:
+            List[Tuple[User, int]]: Due users with the index of the reminder to send
+        """
+        if not schedule_days:
+            return []
+        now = datetime.utcnow()
+        # A reminder is due once the previous one is at least `days` old
+        sent_before = [now - timedelta(days=days) for days in schedule_days]
+        pipeline = [
+            {"$match": user_filter},
+            {"$addFields": {"_user_id": {"$toString": "$_id"}}},
+            {"$lookup": {
+                "from": EmailTracking.Settings.name,
+                "localField": "_user_id",
+                "foreignField": "user_id",
+                "pipeline": [
+                    {"$match": {"email_type": email_type}},
+                    {"$sort": {"sent_at": -1}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "reminder_count": 1, "sent_at": 1}},
+                ],
+                "as": "_last_reminder",
+            }},
+            {"$addFields": {"_last_reminder": {"$first": "$_last_reminder"}}},
+            {"$addFields": {"_reminder_count": {
+                "$cond": [{"$ifNull": ["$_last_reminder", False]}, {"$add": ["$_last_reminder.reminder_count", 1]}, 0]
+            }}},
+            {"$match": {"$expr": {"$and": [
+                {"$lt": ["$_reminder_count", len(schedule_days)]},
+                {"$or": [
+                    {"$not": [{"$ifNull": ["$_last_reminder", False]}]},
+                    {"$lte": ["$_last_reminder.sent_at", {"$arrayElemAt": [sent_before, "$_reminder_count"]}]},
+                ]},
+            ]}}},
+            {"$project": {"_user_id": 0, "_last_reminder": 0}},
+        ]
+        due_users = []
+        async for doc in User.get_motor_collection().aggregate(pipeline):
+            reminder_count = doc.pop("_reminder_count")
+            due_users.append((User.model_validate(doc), reminder_count))
+        return due_users
+
+    async def get_users_due_verification_reminder(self, schedule_days: List[int]) -> List[Tuple[User, int]]:
+        """Get unverified users due their next verification reminder."""
+        return await self.get_users_due_reminder(
             {
-                "user_id": user_id,
-                "email_type": "reminder"
+                "is_verified": False,
+                "createdAt": {"$lt": datetime.utcnow() - timedelta(days=2)}
             },
-            sort=[("sent_at", -1)]
+            "reminder",
+            schedule_days
         )
-    
-    async def get_last_onboarding_reminder(self, user_id: str) -> Optional[EmailTracking]:
-        """Get the last onboarding reminder sent to a user."""
-        return await EmailTracking.find_one(
+
+    async def get_users_due_onboarding_reminder(self, schedule_days: List[int]) -> List[Tuple[User, int]]:
+        """Get verified, not onboarded users due their next onboarding reminder."""
+        return await self.get_users_due_reminder(
             {
-                "user_id": user_id,
-                "email_type": "onboarding"
+                "is_verified": True,
+                "is_onboarded": False,
+                "createdAt": {"$lt": datetime.utcnow() - timedelta(days=2)}
             },
-            sort=[("sent_at", -1)]
+            "onboarding",
+            schedule_days
         )
 
     async def get_email_preferences(self, user_id: str) -> Optional[EmailPreferences]:
@@ -791,6 +1492,66 @@ class DatabaseOperations:
         await prefs.save()
         return prefs
 
+    async def get_or_create_email_preferences(self, user_id: str, email: str) -> EmailPreferences:
+        """
+        Get a user's email preferences, creating them with a fresh unsubscribe token if missing.
+
+        A single upsert against the unique user_id index, so concurrent callers
+        always end up with the same document and token.
+        """
+        now = datetime.utcnow()
+        try:
+            prefs = await EmailPreferences.get_motor_collection().find_one_and_update(
+                {"user_id": user_id},
+                {"$setOnInsert": {
+                    "email": email,
+                    "unsubscribed_from": [],
+                    "unsubscribe_token": str(uuid.uuid4()),
+                    "updated_at": now
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Another caller inserted it between our match and insert
+            return await self.get_email_preferences(user_id)
+        return EmailPreferences.model_validate(prefs)
+
+    async def get_or_create_email_preferences_for_users(self, users: List[Tuple[str, str]]) -> Dict[str, EmailPreferences]:
+        """
+        Prefetch email preferences for a whole recipient list, creating missing ones.
+
+        Args:
+            users (List[Tuple[str, str]]): (user ID, email) pairs
+
+        Returns:
+            Dict[str, EmailPreferences]: Preferences keyed by user ID
+        """
+        if not users:
+            return {}
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"user_id": user_id},
+                {"$setOnInsert": {
+                    "email": email,
+                    "unsubscribed_from": [],
+                    "unsubscribe_token": str(uuid.uuid4()),
+                    "updated_at": now
+                }},
+                upsert=True
+            )
+            for user_id, email in dict(users).items()
+        ]
+        try:
+            await EmailPreferences.get_motor_collection().bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Upserts that raced another writer for the same user; that writer's document stands
+            if any(error["code"] != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+        prefs = await EmailPreferences.find({"user_id": {"$in": [user_id for user_id, _ in users]}}).to_list()
+        return {pref.user_id: pref for pref in prefs}
+
     async def update_email_preferences(self, prefs: EmailPreferences, email_type: str) -> EmailPreferences:
         """Update user's email preferences."""
         if email_type not in prefs.unsubscribed_from:
@@ -829,23 +1590,33 @@ class DatabaseOperations:
         ).to_list()
     
     async def get_matching_jobs(self, job_type: str, location: str, limit: int = 5) -> List[JobModel]:
-        """Get jobs matching the given type and location."""
-        # Create a regex pattern for case-insensitive location matching
-        location_pattern = {"$regex": location, "$options": "i"}
-        job_type_pattern = {"$regex": job_type, "$options": "i"}
-        
+        """
+        Get the newest jobs matching the given type or location.
+
+        Matches run on the normalized location and job type fields, so every
+        branch of the $or is served by an index.
+        """
+        city, country_code = normalize_location(location)
+        job_types = normalize_job_types(job_type)
+
+        filters = []
+        if city:
+            filters.append({"location_city": city})
+        elif country_code:
+            filters.append({"location_country_code": country_code})
+        if job_types:
+            filters.append({"job_types": {"$in": job_types}})
+        if not filters:
+            return []
+
         # Find jobs matching either location or job type, ordered by most recent
-        matching_jobs = await JobModel.find(
-            {
-                "$or": [
-                    {"location": location_pattern},
-                    {"job_type": job_type_pattern}
-                ]
-            }
+        return await JobModel.find(
+            {"$or": filters}
         ).sort([("date_posted", -1)]).limit(limit).to_list()
-        
-        return matching_jobs
     
     async def get_user_by_id(self, user_id: str) -> Optional[User]:
         """Get a user by their ID."""
         return await User.find_one({"_id": user_id})
+
+# Shared instance; import this rather than creating DatabaseOperations per module
+db_ops = DatabaseOperations()
@@ -0,0 +1,46 @@
+import os
+from typing import Optional
+
+from dotenv import load_dotenv
+from src.db.model import User
+from src.utils.cache import CacheBackend, cache
+
+load_dotenv()
+
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+
+class UserCache:
+    """
+    Short-lived cache of authenticated users keyed by email.
+
+    Cached users never carry a password and are rebuilt from their stored
+    form on every read, so a route mutating `request.state.user` can't leak
+    into later requests. Writes invalidate the entry in the shared backend;
+    with the in-memory backend the TTL bounds how long other workers can
+    serve a stale user.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"user:{email}"
+
+    async def get(self, email: str) -> Optional[User]:
+        data = await self.backend.get(self._key(email))
+        if not data:
+            return None
+        user = User.model_validate({**data, "password": ""})
+        user.password = None
+        return user
+
+    async def set(self, user: User) -> None:
+        data = user.model_dump(mode="json", exclude={"password"})
+        await self.backend.set(self._key(user.email), data, self.ttl_seconds)
+
+    async def invalidate(self, email: str) -> None:
+        await self.backend.delete(self._key(email))
+
+user_cache = UserCache(cache, USER_CACHE_TTL_SECONDS)
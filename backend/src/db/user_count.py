@@ -0,0 +1,78 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from src.db.mongo import db_ops
+from src.logger import logger
+from src.utils.cache import CacheBackend, cache
+
+load_dotenv()
+
+USER_COUNT_CACHE_TTL_SECONDS = int(os.getenv("USER_COUNT_CACHE_TTL_SECONDS", "600"))
+USER_COUNT_REFRESH_SECONDS = int(os.getenv("USER_COUNT_REFRESH_SECONDS", "300"))
+
+
+class UserCountCache:
+    """
+    Keep an approximate user count in memory.
+
+    The count is loaded from `estimated_document_count` by a background
+    loop, so readers only ever see the cached value. A stale read schedules
+    at most one extra refresh instead of querying Mongo inline. The count is
+    also published to the shared cache, so with several workers only one of
+    them queries Mongo per refresh interval.
+    """
+
+    cache_key = "user_count"
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: int, refresh_seconds: int) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = refresh_seconds
+        self._count: Optional[int] = None
+        self._fetched_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def is_stale(self) -> bool:
+        return self._count is None or time.monotonic() - self._fetched_at > self.ttl_seconds
+
+    async def refresh(self) -> Optional[int]:
+        try:
+            count = await self.backend.get(self.cache_key)
+            if count is None:
+                count = await db_ops.get_estimated_user_count()
+                await self.backend.set(self.cache_key, count, self.refresh_seconds)
+            self._count = count
+            self._fetched_at = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Could not refresh user count: {e}")
+        return self._count
+
+    def get(self) -> Optional[int]:
+        """Return the cached count, scheduling a refresh if it has gone stale."""
+        if self.is_stale() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self._count
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_seconds)
+
+    def start(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+user_count_cache = UserCountCache(cache, USER_COUNT_CACHE_TTL_SECONDS, USER_COUNT_REFRESH_SECONDS)
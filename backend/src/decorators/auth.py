@@ -1,59 +1,98 @@
 from fastapi import Request, HTTPException
+from beanie import PydanticObjectId
 from src.utils.jwttoken import verify_token
-from src.db.mongo import DatabaseOperations
-from src.db.model import Roles
+from src.db.mongo import db_ops
+from src.db.model import Roles, TokenData, User
 from functools import wraps
 
-db_ops = DatabaseOperations()
 
-def is_user_logged_in(func):
-    """Decorator to check if user is logged in."""
-    @wraps(func)
-    async def wrapper(request: Request, *args, **kwargs):
-        if "access_token" not in request.cookies:
-            raise HTTPException(status_code=200, detail="User not logged in")
-        
-        access_token = request.cookies["access_token"]
-        token_data = verify_token(access_token)
-        
-        if token_data.is_expired:
-            raise HTTPException(status_code=200, detail="Token expired")
-        
-        if not token_data.is_valid:
-            raise HTTPException(status_code=200, detail="Invalid token")
-        
-        user = await db_ops.get_user(token_data.email)
-        if not user:
-            raise HTTPException(status_code=200, detail="User does not exist")
-        user.password = None
-        request.state.user = user
-        return await func(request, *args, **kwargs)
-    
-    return wrapper
+def verify_request_token(request: Request) -> TokenData:
+    """Decode the access token cookie, raising if it is missing, expired or invalid."""
+    if "access_token" not in request.cookies:
+        raise HTTPException(status_code=200, detail="User not logged in")
+
+    access_token = request.cookies["access_token"]
+    token_data = verify_token(access_token)
+
+    if token_data.is_expired:
+        raise HTTPException(status_code=200, detail="Token expired")
+
+    if not token_data.is_valid:
+        raise HTTPException(status_code=200, detail="Invalid token")
+    return token_data
+
+async def check_token_version(token_data: TokenData) -> None:
+    """
+    Reject a token whose version is no longer the user's current one.
+
+    The version comes from db_ops.get_token_version in every auth path,
+    never from a cached user copy, so revocation takes effect as
+    documented there.
+    """
+    token_version = await db_ops.get_token_version(token_data.email)
+    if token_version is None:
+        raise HTTPException(status_code=200, detail="User does not exist")
+    if token_version != token_data.token_version:
+        # Revoked; the client refreshes and gets a token with the current version
+        raise HTTPException(status_code=200, detail="Token expired")
+
+async def load_user(token_data: TokenData) -> User:
+    await check_token_version(token_data)
+    user = await db_ops.get_cached_user(token_data.email)
+    if not user:
+        raise HTTPException(status_code=200, detail="User does not exist")
+    return user
+
+async def user_from_claims(token_data: TokenData) -> User:
+    """
+    Build an identity-only user from token claims, only checking the token version.
+
+    Only id, email and token version are set; profile fields such as name
+    aren't carried in tokens, so routes that need them must load the user.
+    """
+    if token_data.user_id is None:
+        # Issued before claims were embedded
+        return await load_user(token_data)
+    await check_token_version(token_data)
+    return User.model_construct(
+        id=PydanticObjectId(token_data.user_id),
+        email=token_data.email,
+        token_version=token_data.token_version,
+        password=None
+    )
+
+def is_user_logged_in(func=None, *, claims_only: bool = False):
+    """
+    Decorator to check if user is logged in.
+
+    With `claims_only=True` the user is built from the access token claims
+    instead of the database; use it for endpoints that only need the user's
+    id and email.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(request: Request, *args, **kwargs):
+            token_data = verify_request_token(request)
+            if claims_only:
+                request.state.user = await user_from_claims(token_data)
+            else:
+                request.state.user = await load_user(token_data)
+            return await func(request, *args, **kwargs)
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
 
 def is_user_admin(func):
     """Decorator to check if user is admin."""
     @wraps(func)
     async def wrapper(request: Request, *args, **kwargs):
-        if "access_token" not in request.cookies:
-            raise HTTPException(status_code=200, detail="User not logged in")
-        
-        access_token = request.cookies["access_token"]
-        token_data = verify_token(access_token)
-        
-        if token_data.is_expired:
-            raise HTTPException(status_code=200, detail="Token expired")
-        
-        if not token_data.is_valid:
-            raise HTTPException(status_code=200, detail="Invalid token")
-        
-        user = await db_ops.get_user(token_data.email)
-        if not user:
-            raise HTTPException(status_code=200, detail="User does not exist")
+        token_data = verify_request_token(request)
+        user = await load_user(token_data)
         if user.role != Roles.Admin.value:
             raise HTTPException(status_code=200, detail="User is not admin")
-        user.password = None
         request.state.user = user
         return await func(request, *args, **kwargs)
-    
+
     return wrapper
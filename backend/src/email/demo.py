@@ -1,14 +1,12 @@
 from datetime import datetime, timedelta
-import uuid
 from src.utils.hashing import Hash
-from src.db.mongo import DatabaseOperations
+from src.db.mongo import db_ops
 from src.db.model import User
 from src.email.email_sender import (
     send_reminder_email as remainder_email_sender,
     send_onboarding_reminder_email
 )
 
-db_ops = DatabaseOperations()
 
 VERIFICATION_REMINDER_SCHEDULE = [
     {"days": 3, "subject": "Verify Your Email on Ethereal Jobs"},
@@ -22,37 +20,26 @@ ONBOARDING_REMINDER_SCHEDULE = [
     {"days": 10, "subject": "Final Reminder: Complete Your Profile Setup"}
 ]
 
-async def generate_unsubscribe_token(user_id: str, email: str) -> str:
-    # Check if user already has preferences
-    prefs = await db_ops.get_email_preferences(user_id)
-    if not prefs:
-        token = str(uuid.uuid4())
-        await db_ops.create_email_preferences(user_id, email, token)
-        return token
-    return prefs.unsubscribe_token
-
 async def send_reminder_email(user: User, reminder_count: int):
     try:
-        # Check if user is unsubscribed
-        prefs = await db_ops.get_email_preferences(str(user.id))
-        if prefs and "reminder" in prefs.unsubscribed_from:
+        # Check if user is unsubscribed, creating preferences and their unsubscribe token if missing
+        prefs = await db_ops.get_or_create_email_preferences(str(user.id), user.email)
+        if "reminder" in prefs.unsubscribed_from:
             return False
-
-        # Generate or get unsubscribe token
-        unsubscribe_token = await generate_unsubscribe_token(str(user.id), user.email)
+        unsubscribe_token = prefs.unsubscribe_token
         
         reminder = VERIFICATION_REMINDER_SCHEDULE[reminder_count]
         
         token = Hash.generate_random_unique_string()
         # Send email using email_sender service
-        success = remainder_email_sender(
+        success = await remainder_email_sender(
             email=user.email,
             name=user.name,
             verification_token=token,
             unsubscribe_token=unsubscribe_token,
             subject=reminder["subject"]
         )
-        await db_ops.add_verification_token(user.email, token, (datetime.now() + timedelta(hours=7*24)).strftime("%Y-%m-%d %H:%M:%S"))
+        await db_ops.add_verification_token(user.email, token, datetime.utcnow() + timedelta(hours=7*24))
         
         if success:
             # Track email sent
@@ -127,12 +114,13 @@ async def check_onboarding_reminders():
         if days_since_last < ONBOARDING_REMINDER_SCHEDULE[reminder_count]["days"]:
             continue
 
-        # Generate unsubscribe token
-        unsubscribe_token = await generate_unsubscribe_token(str(user.id), user.email)
+        # Get or create unsubscribe token
+        prefs = await db_ops.get_or_create_email_preferences(str(user.id), user.email)
+        unsubscribe_token = prefs.unsubscribe_token
         
         # Send reminder email
         reminder = ONBOARDING_REMINDER_SCHEDULE[reminder_count]
-        send_onboarding_reminder_email(
+        await send_onboarding_reminder_email(
             email=user.email,
             name=user.name,
             unsubscribe_token=unsubscribe_token
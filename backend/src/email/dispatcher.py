@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+from typing import List, Set
+
+import resend
+from dotenv import load_dotenv
+
+from src.db.mongo import db_ops
+from src.logger import logger
+
+load_dotenv()
+
+# Provider requests in flight at once, per process
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "4"))
+# Resend allows 2 requests per second per team by default; a batch counts as one request.
+# The limit is shared by every process through Mongo.
+EMAIL_REQUESTS_PER_SECOND = float(os.getenv("EMAIL_REQUESTS_PER_SECOND", "2"))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", "3"))
+RESEND_BATCH_SIZE = 100
+
+class RateLimiter:
+    """Spaces provider requests so at most `rate` start per second, across all tasks in this process."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Spaces provider requests so at most `rate` start per second, across all processes.
+
+    Slots are reserved from a schedule kept in Mongo. If Mongo can't be
+    reached, requests fall back to this process's own schedule and any
+    overshoot is absorbed by the 429 retries.
+    """
+
+    def __init__(self, key: str, rate: float) -> None:
+        super().__init__(rate)
+        self.key = key
+
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+        try:
+            wait = await db_ops.reserve_rate_limit_slot(self.key, self.interval)
+        except Exception as e:
+            logger.warning(f"Couldn't reserve shared rate limit slot {self.key}, using the local limit: {e}")
+            return await super().acquire()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+def is_rate_limited(error: Exception) -> bool:
+    message = str(error).lower()
+    return getattr(error, "code", None) == 429 or "429" in message or "rate limit" in message
+
+class EmailDispatcher:
+    """
+    Async, rate-limited email sending through Resend.
+
+    The Resend SDK is blocking, so requests run in threads, bounded by a
+    semaphore and spaced by a rate limiter shared across processes.
+    Rate-limited requests are retried with exponential backoff.
+    """
+
+    def __init__(self, sender, concurrency: int = EMAIL_SEND_CONCURRENCY, requests_per_second: float = EMAIL_REQUESTS_PER_SECOND) -> None:
+        # EmailSender; only used to render templates into Resend params
+        self.sender = sender
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._rate_limiter = SharedRateLimiter("resend", requests_per_second)
+        self._background: Set[asyncio.Task] = set()
+        self.sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+
+    async def _request(self, func, params):
+        for attempt in range(EMAIL_MAX_RETRIES + 1):
+            await self._rate_limiter.acquire()
+            try:
+                async with self._semaphore:
+                    resend.api_key = os.getenv("RESEND_API_KEY")
+                    return await asyncio.to_thread(func, params)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == EMAIL_MAX_RETRIES:
+                    raise
+                self.rate_limited += 1
+                await asyncio.sleep(2 ** attempt)
+
+    async def send(self, email_service) -> bool:
+        """Send one email; returns whether the provider accepted it."""
+        try:
+            await self._request(resend.Emails.send, self.sender.build_resend_params(email_service))
+            self.sent += 1
+            return True
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Couldn't send email to {email_service.recipient}. Error: {e}")
+            return False
+
+    async def send_many(self, email_services: List) -> List[bool]:
+        """
+        Send many emails through the batch API, 100 per request.
+
+        Returns:
+            List[bool]: Whether each email was accepted, in input order
+        """
+        results = [False] * len(email_services)
+
+        async def send_chunk(start: int) -> None:
+            chunk = email_services[start:start + RESEND_BATCH_SIZE]
+            try:
+                params = [self.sender.build_resend_params(email_service) for email_service in chunk]
+                await self._request(resend.Batch.send, params)
+            except Exception as e:
+                self.failed += len(chunk)
+                logger.error(f"Couldn't send batch of {len(chunk)} emails. Error: {e}")
+                return
+            self.sent += len(chunk)
+            results[start:start + len(chunk)] = [True] * len(chunk)
+
+        await asyncio.gather(*[send_chunk(start) for start in range(0, len(email_services), RESEND_BATCH_SIZE)])
+        return results
+
+    def send_in_background(self, email_service) -> None:
+        """Send without waiting, for request handlers that shouldn't block on the provider."""
+        task = asyncio.create_task(self.send(email_service))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def drain(self) -> None:
+        """Wait for background sends, e.g. before shutdown."""
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "rate_limited_retries": self.rate_limited,
+            "in_background": len(self._background),
+        }
@@ -1,7 +1,6 @@
 import enum
 import os
 import smtplib
-import string
 import uuid
 import idna
 from email.mime.multipart import MIMEMultipart
@@ -10,7 +9,11 @@ from email.utils import formatdate
 from dotenv import load_dotenv
 from pydantic import BaseModel
 import resend
-from typing import Union
+from typing import List, Optional, Tuple, Union
+from src.db.email_model import EmailOutbox
+from src.db.mongo import db_ops
+from src.email.dispatcher import EmailDispatcher
+from src.email.templating import email_templates
 
 load_dotenv()
 
@@ -49,6 +52,14 @@ class JobRecommendationsEmail(BaseModel):
     unsubscribe_link: str
     subject: str
 
+TEMPLATE_DATA_MODELS = {
+    EmailTemplates.PASSWORD_RESET: ResetPasswordEmail,
+    EmailTemplates.EMAIL_VERIFICATION: EmailVerificationEmail,
+    EmailTemplates.REMINDER: ReminderEmail,
+    EmailTemplates.ONBOARDING_REMINDER: OnboardingReminderEmail,
+    EmailTemplates.JOB_RECOMMENDATIONS: JobRecommendationsEmail,
+}
+
 class EmailService(BaseModel):
     template_name: EmailTemplates
     template_data: Union[ResetPasswordEmail, EmailVerificationEmail, ReminderEmail, OnboardingReminderEmail, JobRecommendationsEmail]
@@ -77,18 +88,6 @@ class EmailSender:
     ) -> None:
         self.config = EmailConfig()
 
-    def get_templates(
-        self,
-        template_name: str,
-    ) -> string.Template:
-        template_path: str = os.path.join(
-            os.path.dirname(__file__),
-            "templates",
-            template_name,
-        )
-        with open(template_path, "r", encoding="utf-8") as file:
-            return string.Template(file.read())
-
     def send_email(
         self,
         email_service: EmailService,
@@ -105,8 +104,9 @@ class EmailSender:
         msg["Subject"] = email_service.template_data.subject
         msg["Date"] = formatdate(localtime=True)
 
-        html_body = self.get_templates(email_service.template_name.value).substitute(
-            **email_service.template_data.__dict__
+        html_body = email_templates.render(
+            email_service.template_name.value,
+            **email_service.template_data.model_dump()
         )
 
         msg.attach(MIMEText(html_body, "html", "utf-8"))
@@ -135,42 +135,36 @@ class EmailSender:
             )
             return False
         
-    def send_email_resend(
+    def build_resend_params(
         self,
         email_service: EmailService,
-    ) -> bool:
+    ) -> dict:
         local_part, domain_part = os.getenv('RESEND_EMAIL').split("@")
         encoded_domain = idna.encode(domain_part).decode("utf-8")
         encoded_sender_email = f"{local_part}@{encoded_domain}"
-        html_body = self.get_templates(email_service.template_name.value).substitute(
-            **email_service.template_data.__dict__
+        html_body, text = email_templates.render_email(
+            email_service.template_name.value,
+            **email_service.template_data.model_dump()
         )
 
-        text = ""
-        template_path: str = os.path.join(
-            os.path.dirname(__file__),
-            "templates",
-            email_service.template_name.value.split(".")[0]+".txt",
-        )
-        with open(template_path, "r") as file:
-            text = file.read()
-        
-        text = string.Template(text).substitute(
-            **email_service.template_data.__dict__
-        )
+        return {
+            "from": f"{self.config.display_name} <{encoded_sender_email}>",
+            "to": email_service.recipient,
+            "subject": email_service.template_data.subject,
+            "html": html_body,
+            "text": text,
+            "headers": {
+                'X-Entity-Ref-ID': uuid.uuid4().hex,
+            }
+        }
 
+    def send_email_resend(
+        self,
+        email_service: EmailService,
+    ) -> bool:
         try:
             resend.api_key = os.getenv("RESEND_API_KEY")
-            resend.Emails.send({
-                "from": f"{self.config.display_name} <{encoded_sender_email}>",
-                "to": email_service.recipient,
-                "subject": email_service.template_data.subject,
-                "html": html_body,
-                "text": text,
-                "headers": {
-                    'X-Entity-Ref-ID': uuid.uuid4().hex,
-                }
-            })
+            resend.Emails.send(self.build_resend_params(email_service))
             return True
         except Exception as e:
             print(
@@ -180,7 +174,38 @@ class EmailSender:
             )
             return False
     
-def send_verification_email(email:str, token: str, name: str):
+email_dispatcher = EmailDispatcher(EmailSender())
+
+def outbox_to_email_service(email: EmailOutbox) -> EmailService:
+    template_name = EmailTemplates(email.template_name)
+    return EmailService(
+        template_name=template_name,
+        template_data=TEMPLATE_DATA_MODELS[template_name].model_validate(email.template_data),
+        recipient=email.recipient
+    )
+
+async def enqueue_emails(emails: List[Tuple[EmailService, Optional[dict]]]) -> None:
+    """
+    Queue emails in the outbox and return without waiting for the provider.
+
+    Args:
+        emails: (email, tracking) pairs; tracking holds create_email_tracking
+            arguments, recorded once the email is sent
+    """
+    await db_ops.enqueue_emails([
+        EmailOutbox(
+            template_name=email_service.template_name.value,
+            template_data=email_service.template_data.model_dump(),
+            recipient=email_service.recipient,
+            tracking=tracking
+        )
+        for email_service, tracking in emails
+    ])
+
+async def enqueue_email(email_service: EmailService, tracking: Optional[dict] = None) -> None:
+    await enqueue_emails([(email_service, tracking)])
+
+async def send_verification_email(email:str, token: str, name: str):
     frontend_url = os.getenv("FRONTEND_URL")
     verification_link = f"{frontend_url}/verify-email?token={token}"
     email_service = EmailService(
@@ -188,10 +213,10 @@ def send_verification_email(email:str, token: str, name: str):
         template_name=EmailTemplates.EMAIL_VERIFICATION,
         template_data=EmailVerificationEmail(verification_link=verification_link, name=name)
     )
-    email_sender = EmailSender()
-    email_sender.send_email_resend(email_service)
+    # Don't hold the request on the email provider
+    await enqueue_email(email_service)
 
-def send_password_reset_email(email:str, token: str, name: str):
+async def send_password_reset_email(email:str, token: str, name: str):
     frontend_url = os.getenv("FRONTEND_URL")
     reset_link = f"{frontend_url}/reset-password?token={token}"
     email_service = EmailService(
@@ -199,10 +224,9 @@ def send_password_reset_email(email:str, token: str, name: str):
         template_name=EmailTemplates.PASSWORD_RESET,
         template_data=ResetPasswordEmail(reset_link=reset_link, name=name)
     )
-    email_sender = EmailSender()
-    email_sender.send_email_resend(email_service)
+    await enqueue_email(email_service)
 
-def send_reminder_email(email: str, name: str, verification_token: str, unsubscribe_token: str, subject: str) -> bool:
+async def send_reminder_email(email: str, name: str, verification_token: str, unsubscribe_token: str, subject: str, tracking: Optional[dict] = None) -> bool:
     frontend_url = os.getenv("FRONTEND_URL")
     verification_link = f"{frontend_url}/verify-email?token={verification_token}"
     unsubscribe_link = f"{frontend_url}/unsubscribe?token={unsubscribe_token}&type=reminder"
@@ -216,11 +240,11 @@ def send_reminder_email(email: str, name: str, verification_token: str, unsubscr
             subject=subject
         )
     )
-    email_sender = EmailSender()
-    return email_sender.send_email_resend(email_service)
+    await enqueue_email(email_service, tracking)
+    return True
 
 
-def send_onboarding_reminder_email(email: str, name: str, unsubscribe_token: str, subject: str) -> bool:
+async def send_onboarding_reminder_email(email: str, name: str, unsubscribe_token: str, subject: str, tracking: Optional[dict] = None) -> bool:
     frontend_url = os.getenv("FRONTEND_URL")
     complete_profile_link = f"{frontend_url}/onboarding"
     unsubscribe_link = f"{frontend_url}/unsubscribe?token={unsubscribe_token}&type=onboarding"
@@ -235,6 +259,6 @@ def send_onboarding_reminder_email(email: str, name: str, unsubscribe_token: str
             subject=subject
         )
     )
-    email_sender = EmailSender()
-    return email_sender.send_email_resend(email_service)
+    await enqueue_email(email_service, tracking)
+    return True
     
\ No newline at end of file
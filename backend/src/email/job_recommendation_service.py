@@ -1,263 +1,250 @@
 from src.utils.helpers import serialize_dates
-from src.db.mongo import DatabaseOperations
-from src.email.email_sender import EmailService, EmailTemplates, EmailSender, JobRecommendationsEmail
-from typing import List, Tuple, Dict
-from models.job import Job
-from src.db.model import JobModel, JobQuery
-from src.api.jobs import get_jobs_api_response, validate_indeed_country
+from src.db.mongo import db_ops
+from src.email.email_sender import EmailService, EmailTemplates, JobRecommendationsEmail, enqueue_emails
+from src.email.templating import email_templates
+from typing import List, Tuple, Dict, Optional
+from datetime import datetime, timedelta
+from src.db.model import ApplicationStatus, JobQuery, ResumeModel, User
+from src.api.jobs import get_jobs_api_response, build_job_model
+from src.utils.location import get_country_info, normalize_job_types
+from src.utils.resume_job_matcher import build_user_profile, score_jobs
+from src.logger import logger
 from jobspy import JobType
-import json
-import uuid
+import asyncio
+import time
 import os
 
-# Country data mapping
-COUNTRY_DATA = [
-    {"code": "AD", "name": "Andorra"}, {"code": "AE", "name": "United Arab Emirates"},
-    {"code": "AF", "name": "Afghanistan"}, {"code": "AG", "name": "Antigua and Barbuda"},
-    {"code": "AI", "name": "Anguilla"}, {"code": "AL", "name": "Albania"},
-    {"code": "AM", "name": "Armenia"}, {"code": "AO", "name": "Angola"},
-    {"code": "AR", "name": "Argentina"}, {"code": "AT", "name": "Austria"},
-    {"code": "AU", "name": "Australia"}, {"code": "BE", "name": "Belgium"},
-    {"code": "BR", "name": "Brazil"}, {"code": "CA", "name": "Canada"},
-    {"code": "CH", "name": "Switzerland"}, {"code": "CL", "name": "Chile"},
-    {"code": "CN", "name": "China"}, {"code": "CO", "name": "Colombia"},
-    {"code": "CR", "name": "Costa Rica"}, {"code": "CZ", "name": "Czechia"},
-    {"code": "DE", "name": "Germany"}, {"code": "DK", "name": "Denmark"},
-    {"code": "EC", "name": "Ecuador"}, {"code": "EG", "name": "Egypt"},
-    {"code": "ES", "name": "Spain"}, {"code": "FI", "name": "Finland"},
-    {"code": "FR", "name": "France"}, {"code": "GB", "name": "United Kingdom"},
-    {"code": "GR", "name": "Greece"}, {"code": "HK", "name": "Hong Kong"},
-    {"code": "HU", "name": "Hungary"}, {"code": "ID", "name": "Indonesia"},
-    {"code": "IE", "name": "Ireland"}, {"code": "IL", "name": "Israel"},
-    {"code": "IN", "name": "India"}, {"code": "IT", "name": "Italy"},
-    {"code": "JP", "name": "Japan"}, {"code": "KR", "name": "Korea, Republic of"},
-    {"code": "KW", "name": "Kuwait"}, {"code": "LU", "name": "Luxembourg"},
-    {"code": "MY", "name": "Malaysia"}, {"code": "MT", "name": "Malta"},
-    {"code": "MX", "name": "Mexico"}, {"code": "NG", "name": "Nigeria"},
-    {"code": "NL", "name": "Netherlands"}, {"code": "NO", "name": "Norway"},
-    {"code": "NZ", "name": "New Zealand"}, {"code": "OM", "name": "Oman"},
-    {"code": "PA", "name": "Panama"}, {"code": "PE", "name": "Peru"},
-    {"code": "PH", "name": "Philippines"}, {"code": "PK", "name": "Pakistan"},
-    {"code": "PL", "name": "Poland"}, {"code": "PT", "name": "Portugal"},
-    {"code": "QA", "name": "Qatar"}, {"code": "RO", "name": "Romania"},
-    {"code": "SA", "name": "Saudi Arabia"}, {"code": "SG", "name": "Singapore"},
-    {"code": "SE", "name": "Sweden"}, {"code": "TH", "name": "Thailand"},
-    {"code": "TR", "name": "Türkiye"}, {"code": "TW", "name": "Taiwan"},
-    {"code": "UA", "name": "Ukraine"}, {"code": "US", "name": "United States"},
-    {"code": "VN", "name": "Viet Nam"}, {"code": "ZA", "name": "South Africa"}
-]
-
-# Create lookup dictionaries for faster access
-COUNTRY_TO_CODE = {country["name"].lower(): country["code"] for country in COUNTRY_DATA}
-CODE_TO_COUNTRY = {country["code"]: country["name"] for country in COUNTRY_DATA}
-
-# Common variations mapping
-COUNTRY_VARIATIONS = {
-    "united states of america": "US",
-    "usa": "US",
-    "united kingdom of great britain and northern ireland": "GB",
-    "uk": "GB",
-    "united arab emirates": "AE",
-    "uae": "AE",
-    "russia": "RU",
-    "russian federation": "RU",
-    "south korea": "KR",
-    "republic of korea": "KR",
-    "vietnam": "VN"
+# Refresh each group's jobs from the job boards before ranking; "false" ranks stored jobs only
+RECOMMENDATION_SCRAPE = os.getenv("RECOMMENDATION_SCRAPE", "true").lower() == "true"
+# Groups scraped at the same time; job boards throttle aggressive clients
+RECOMMENDATION_SCRAPE_CONCURRENCY = int(os.getenv("RECOMMENDATION_SCRAPE_CONCURRENCY", "3"))
+# Stored jobs each group's members are ranked against
+RECOMMENDATION_CANDIDATES = int(os.getenv("RECOMMENDATION_CANDIDATES", "50"))
+# Only jobs posted within this many days are recommended
+RECOMMENDATION_MAX_AGE_DAYS = int(os.getenv("RECOMMENDATION_MAX_AGE_DAYS", "7"))
+# Users ranked at the same time; matching is CPU-bound, so keep this small
+RECOMMENDATION_RANK_CHUNK_SIZE = int(os.getenv("RECOMMENDATION_RANK_CHUNK_SIZE", "8"))
+RECOMMENDATION_JOBS_PER_EMAIL = 5
+# Put indeed first as it's most reliable
+RECOMMENDATION_RECRUITERS = ["indeed", "google", "glassdoor"]
+
+JOB_TYPE_MAPPING = {
+    "Full-time": JobType.FULL_TIME,
+    "Part-time": JobType.PART_TIME,
+    "Internship": JobType.INTERNSHIP,
+    "Contract": JobType.CONTRACT
 }
 
-db_ops = DatabaseOperations()
-
-def get_country_info(location_part: str) -> Tuple[str, str]:
-    state_to_country = {
-        # Indian States
-        "karnataka": ("India", "IN"),
-        "maharashtra": ("India", "IN"),
-        "tamil nadu": ("India", "IN"),
-        "delhi": ("India", "IN"),
-        "telangana": ("India", "IN"),
-        "kerala": ("India", "IN"),
-        "uttar pradesh": ("India", "IN"),
-        # US States
-        "california": ("United States", "US"),
-        "new york": ("United States", "US"),
-        "texas": ("United States", "US"),
-        # UK Regions
-        "london": ("United Kingdom", "GB"),
-        "england": ("United Kingdom", "GB"),
-        "scotland": ("United Kingdom", "GB"),
-        "wales": ("United Kingdom", "GB"),
-    }
-    
-    location_lower = location_part.lower().strip()
-    
-    # Check for direct state/region match
-    for state, country_info in state_to_country.items():
-        if state in location_lower:
-            return country_info
-            
-    # Check for common variations
-    if location_lower in COUNTRY_VARIATIONS:
-        code = COUNTRY_VARIATIONS[location_lower]
-        return CODE_TO_COUNTRY[code], code
-        
-    # Try direct country name lookup
-    if location_lower in COUNTRY_TO_CODE:
-        code = COUNTRY_TO_CODE[location_lower]
-        return CODE_TO_COUNTRY[code], code
-        
-    # Try partial matches
-    for country_name, code in COUNTRY_TO_CODE.items():
-        if country_name in location_lower or location_lower in country_name:
-            return CODE_TO_COUNTRY[code], code
-            
-    # If no match found, validate using Indeed's country list and default mappings
-    country_name = validate_indeed_country(location_part)
-    country_lower = country_name.lower()
-    
-    if country_lower in COUNTRY_TO_CODE:
-        code = COUNTRY_TO_CODE[country_lower]
-        return CODE_TO_COUNTRY[code], code
-    
-    # Default to US if no match found
-    return "United States", "US"
-
-async def generate_unsubscribe_token(user_id: str, email: str) -> str:
-    prefs = await db_ops.get_email_preferences(user_id)
-    if not prefs:
-        token = str(uuid.uuid4())
-        await db_ops.create_email_preferences(user_id, email, token)
-        return token
-    return prefs.unsubscribe_token
-
-async def send_job_recommendations():
+class StageStats:
+    """Throughput and failure counts for one stage of the recommendation run."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.elapsed = 0.0
+        self._started = time.perf_counter()
+
+    def finish(self) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        rate = self.processed / self.elapsed if self.elapsed else 0.0
+        logger.info(
+            f"Job recommendations {self.name}: {self.processed} processed, {self.skipped} skipped, "
+            f"{self.failed} failed in {self.elapsed:.1f}s ({rate:.2f}/s)"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 2),
+        }
+
+class RecommendationGroup:
+    """Users sharing one canonical search; its candidate jobs are loaded once and ranked for every member."""
+
+    def __init__(self, query_params: JobQuery, job_type: str, job_location: str) -> None:
+        self.query_params = query_params
+        self.job_type = job_type
+        self.job_location = job_location
+        self.members: List[User] = []
+        self.resumes: Dict[str, ResumeModel] = {}
+        self.unsubscribe_tokens: Dict[str, str] = {}
+        self.candidates: List[dict] = []
+        # Ranked jobs to send, keyed by member email
+        self.recommendations: Dict[str, List[dict]] = {}
+
+def build_recommendation_query(resume: ResumeModel) -> Optional[Tuple[JobQuery, str, str]]:
+    """Build the canonical search for a resume's first preferred job type and location."""
+    job_preferences = resume.jobPreferences
+    job_type = job_preferences.jobTypes[0] if hasattr(job_preferences, 'jobTypes') and job_preferences.jobTypes else None
+    job_location = job_preferences.locations[0] if hasattr(job_preferences, 'locations') and job_preferences.locations else None
+    if not job_type or not job_location:
+        return None
+
+    parts = [part.strip() for part in job_location.split(",")]
+    if len(parts) >= 2:
+        city = parts[0]
+        location_part = parts[-1]
+    else:
+        location_part = parts[0]
+        city = ""
+    country, country_code = get_country_info(location_part)
+
+    job_type_enum = JOB_TYPE_MAPPING.get(job_type)
+    headline = resume.personalInfo.headline if hasattr(resume.personalInfo, 'headline') else ""
+    query_params = JobQuery(
+        city=city.lower(),
+        country_code=country_code.lower(),
+        country=country.lower(),
+        # Collapse case and spacing so equivalent headlines share a group
+        job_title=" ".join((headline or "").lower().split()),
+        results_wanted=15,  # Request more to account for potential failures
+        job_type=job_type_enum.value[0] if job_type_enum else "".join(normalize_job_types(job_type)),
+        is_remote=False,
+        distance=25
+    )
+    return query_params, job_type, job_location
+
+async def collect_groups(stats: StageStats) -> List[RecommendationGroup]:
+    """Stage 1: group subscribed users by canonical (title, location, job type)."""
+    resumes = await db_ops.get_resumes_with_preferences()
+    users = await db_ops.get_users_by_emails([resume.email for resume in resumes])
+    # Preferences for every recipient at once; creating missing ones hands out their unsubscribe tokens
+    preferences = await db_ops.get_or_create_email_preferences_for_users(
+        [(str(user.id), user.email) for user in users.values()]
+    )
+    groups: Dict[str, RecommendationGroup] = {}
+    for resume in resumes:
+        user = users.get(resume.email)
+        prefs = preferences.get(str(user.id)) if user else None
+        if not user or not prefs:
+            stats.skipped += 1
+            continue
+
+        if "job_recommendations" in prefs.unsubscribed_from:
+            stats.skipped += 1
+            continue
+
+        try:
+            recommendation_query = build_recommendation_query(resume)
+        except Exception as e:
+            logger.error(f"Error processing job preferences for {user.email}: {str(e)}")
+            stats.failed += 1
+            continue
+        if not recommendation_query:
+            stats.skipped += 1
+            continue
+
+        query_params, job_type, job_location = recommendation_query
+        key = query_params.canonical_key()
+        if key not in groups:
+            groups[key] = RecommendationGroup(query_params, job_type, job_location)
+        groups[key].members.append(user)
+        groups[key].resumes[user.email] = resume
+        groups[key].unsubscribe_tokens[user.email] = prefs.unsubscribe_token
+        stats.processed += 1
+    return list(groups.values())
+
+async def scrape_group(group: RecommendationGroup, semaphore: asyncio.Semaphore, stats: StageStats) -> None:
+    """Stage 2: refresh a group's search from the job boards once, so new postings become candidates."""
+    query_params = group.query_params
+    async with semaphore:
+        try:
+            # The scraper is blocking, so it runs in a thread
+            scraped_jobs = await asyncio.to_thread(
+                get_jobs_api_response,
+                city=query_params.city,
+                country_code=query_params.country_code,
+                country=query_params.country,
+                job_title=query_params.job_title,
+                recruiters=RECOMMENDATION_RECRUITERS,
+                results_wanted=query_params.results_wanted,
+                job_type=query_params.job_type,
+                is_remote=query_params.is_remote,
+                distance=query_params.distance
+            )
+            logger.info(f"Scraped {len(scraped_jobs)} jobs for {len(group.members)} users in {group.job_location} ({group.job_type})")
+            job_models = [build_job_model(job, query_params) for job in serialize_dates(scraped_jobs)]
+            await db_ops.update_jobs(job_models, query_params)
+            stats.processed += 1
+        except Exception as e:
+            logger.error(f"Error fetching jobs from job boards: {str(e)}")
+            stats.failed += 1
+
+async def load_candidates(group: RecommendationGroup) -> None:
+    """
+    Stage 3a: load the newest jobs found by the group's search, with descriptions.
+
+    Candidates come from the search's stored results, so they match its
+    job title, location, radius and job type.
+    """
     try:
-        resumes = await db_ops.get_resumes_with_preferences()
-        
-        for resume in resumes:
-            user = await db_ops.get_user(resume.email)
-            if not user:
-                continue
-                
-            prefs = await db_ops.get_email_preferences(str(user.id))
-            if prefs and "job_recommendations" in prefs.unsubscribed_from:
-                continue
-                
-            job_preferences = resume.jobPreferences
-            job_type = job_preferences.jobTypes[0] if hasattr(job_preferences, 'jobTypes') and job_preferences.jobTypes else None
-            job_location = job_preferences.locations[0] if hasattr(job_preferences, 'locations') and job_preferences.locations else None
-            
-            if not job_type or not job_location:
-                continue
-                
-            try:
-                parts = [part.strip() for part in job_location.split(",")]
-                if len(parts) >= 2:
-                    city = parts[0]
-                    location_part = parts[-1]
-                else:
-                    location_part = parts[0]
-                    city = ""
-                    
-                country, country_code = get_country_info(location_part)
-                
-                # Convert job type to JobType enum
-                job_type_mapping = {
-                    "Full-time": JobType.FULL_TIME,
-                    "Part-time": JobType.PART_TIME,
-                    "Internship": JobType.INTERNSHIP,
-                    "Contract": JobType.CONTRACT
-                }
-                
-                job_type_enum = job_type_mapping.get(job_type)
-                
-                # Use default supported recruiters in order of reliability
-                recruiters = ["indeed", "google", "glassdoor"]  # Put indeed first as it's most reliable
-                matching_jobs = []
-                
-                try:
-                    # Try to get jobs from job boards
-                    scraped_jobs = get_jobs_api_response(
-                        city=city,
-                        country_code=country_code,
-                        country=country,
-                        job_title=resume.personalInfo.headline if hasattr(resume.personalInfo, 'headline') else "",
-                        recruiters=recruiters,
-                        results_wanted=15,  # Request more to account for potential failures
-                        job_type=job_type_enum.value[0] if job_type_enum else None,
-                        is_remote=False,
-                        distance=25
-                    )
-                    print(f"Scraped {len(scraped_jobs)} jobs for {user.name} in {job_location} ({job_type})")
-                    query_params = JobQuery(
-                        city=city.lower(),
-                        country_code=country_code.lower(),
-                        country=country.lower(),
-                        job_title=resume.personalInfo.headline if hasattr(resume.personalInfo, 'headline') else "",
-                        results_wanted=15,
-                        job_type=job_type,
-                        is_remote=False,
-                        distance=25
-                    )
-                    serialized_jobs = serialize_dates(scraped_jobs)
-                    job_models = [JobModel(
-                        company=job.get("company") if job.get("company") else "",
-                        id=job.get("id") if job.get("id") else "",
-                        title=job.get("title") if job.get("title") else "",
-                        location=job.get("location") if job.get("location") else "",
-                        date_posted=job.get("date_posted") if job.get("date_posted") else "",
-                        query=query_params,
-                        description=job.get("description") if job.get("description") else "",
-                        url=job.get("job_url_direct") if job.get("job_url_direct") else job.get("job_url", ""),
-                        salary=job.get("salary") if job.get("salary") else "",
-                        company_logo=job.get("company_logo") if job.get("company_logo") else "",
-                        min_amount=str(job.get("min_amount")) if job.get("min_amount") else "",
-                        max_amount=str(job.get("max_amount")) if job.get("max_amount") else "",
-                        company_url=job.get("company_url") if job.get("company_url") else "",
-                        company_description=job.get("company_description") if job.get("company_description") else "",
-                        company_num_employees=job.get("company_num_employees") if job.get("company_num_employees") else "",
-                        company_revenue=job.get("company_revenue") if job.get("company_revenue") else "",
-                        company_industry=job.get("company_industry") if job.get("company_industry") else "",
-                        company_addresses=job.get("company_addresses") if job.get("company_addresses") else "",
-                        company_url_direct=job.get("company_url_direct") if job.get("company_url_direct") else "",
-                        job_level=job.get("job_level") if job.get("job_level") else "",
-                        job_function=job.get("job_function") if job.get("job_function") else "",
-                        currency=job.get("currency") if job.get("currency") else "",
-                    ) for job in serialized_jobs]
-                    await db_ops.update_jobs(job_models, query_params)
-                                    
-                    if job_type and scraped_jobs:
-                        scraped_jobs = [job for job in scraped_jobs if job.get('job_type', '').lower() == job_type.lower()]
-                    
-                    if scraped_jobs:
-                        scraped_jobs.sort(key=lambda x: x.get('date_posted'), reverse=True)
-                        matching_jobs = scraped_jobs[:5]
-                except Exception as e:
-                    print(f"Error fetching jobs from job boards: {str(e)}")
-                
-                # If no jobs from job boards or if they failed, try database
-                if not matching_jobs:
-                    try:
-                        matching_jobs = await db_ops.get_matching_jobs(
-                            job_type=job_type,
-                            location=job_location,
-                            limit=5
-                        )
-                    except Exception as e:
-                        print(f"Error fetching jobs from database: {str(e)}")
-                        continue  # Skip this user if both methods fail
-                
-                if not matching_jobs:
-                    print(f"No jobs found for location {job_location} and job type {job_type}")
-                    continue
-                    
-            except Exception as e:
-                print(f"Error processing location {job_location}: {str(e)}")
-                continue
-                
-            unsubscribe_token = await generate_unsubscribe_token(str(user.id), user.email)
-            frontend_url = os.getenv("FRONTEND_URL")
-            jobs_html, jobs_text = format_jobs_for_email(matching_jobs, frontend_url)
+        min_date = datetime.utcnow() - timedelta(days=RECOMMENDATION_MAX_AGE_DAYS)
+        jobs = await db_ops.get_jobs_from_db_paginated(group.query_params, min_date, 0, RECOMMENDATION_CANDIDATES)
+        group.candidates = await db_ops.load_job_descriptions([job.model_dump() for job in jobs])
+    except Exception as e:
+        logger.error(f"Error fetching jobs from database: {str(e)}")
+
+async def rank_for_user(group: RecommendationGroup, user: User, excluded: set, stats: StageStats) -> None:
+    """
+    Pick a member's best jobs from the group's candidates.
+
+    Scores come from the match cache, keyed by this profile and description,
+    so only jobs new to the profile go through the matcher. Scores are not
+    saved; they're only for ranking the email.
+    """
+    try:
+        candidates = [job for job in group.candidates if job["id"] not in excluded]
+        profile = build_user_profile(group.resumes[user.email], group.query_params.job_title)
+        scores = {
+            job_id: match["overall_score"]
+            for job_id, match in await score_jobs(user.email, profile, candidates, persist=False)
+        }
+
+        candidates.sort(key=lambda job: (scores.get(job["id"], 0), job.get("date_posted") or datetime.min), reverse=True)
+        group.recommendations[user.email] = candidates[:RECOMMENDATION_JOBS_PER_EMAIL]
+        stats.processed += 1
+    except Exception as e:
+        logger.error(f"Error ranking jobs for {user.email}: {e}")
+        stats.failed += 1
+
+async def rank_group(group: RecommendationGroup, stats: StageStats) -> None:
+    """Stage 3b: rank the group's candidates for every member, a chunk of members at a time."""
+    if not group.candidates:
+        stats.skipped += len(group.members)
+        return
+
+    candidate_ids = [job["id"] for job in group.candidates]
+    # One query each for what was already sent and what each member has applied to
+    recommended = await db_ops.get_recommended_job_ids([str(user.id) for user in group.members])
+    job_users = await db_ops.get_job_users_for_emails([user.email for user in group.members], candidate_ids)
+
+    for start in range(0, len(group.members), RECOMMENDATION_RANK_CHUNK_SIZE):
+        chunk = group.members[start:start + RECOMMENDATION_RANK_CHUNK_SIZE]
+        tasks = []
+        for user in chunk:
+            applied = {
+                job_id for job_id, job_user in job_users.get(user.email, {}).items()
+                if job_user.application_status != ApplicationStatus.Pending.value
+            }
+            excluded = recommended.get(str(user.id), set()) | applied
+            tasks.append(rank_for_user(group, user, excluded, stats))
+        await asyncio.gather(*tasks)
+
+async def build_group_emails(group: RecommendationGroup, frontend_url: str, stats: StageStats) -> List[Tuple[EmailService, dict]]:
+    """Stage 4a: address an email with their ranked jobs to each member, tracking the jobs sent."""
+    email_services = []
+    for user in group.members:
+        jobs = group.recommendations.get(user.email)
+        if not jobs:
+            stats.skipped += 1
+            continue
+        try:
+            jobs_html, jobs_text = format_jobs_for_email(jobs, frontend_url)
+            unsubscribe_token = group.unsubscribe_tokens[user.email]
             email_service = EmailService(
                 template_name=EmailTemplates.JOB_RECOMMENDATIONS,
                 template_data=JobRecommendationsEmail(
@@ -269,35 +256,59 @@ async def send_job_recommendations():
                 ),
                 recipient=user.email
             )
-            email_sender = EmailSender()
-            return email_sender.send_email_resend(email_service)
-            
+            email_services.append((email_service, {
+                "user_id": str(user.id),
+                "email": user.email,
+                "email_type": "job_recommendations",
+                "unsubscribe_token": unsubscribe_token,
+                "job_ids": [job["id"] for job in jobs]
+            }))
+        except Exception as e:
+            logger.error(f"Error preparing job recommendations for {user.email}: {str(e)}")
+            stats.failed += 1
+    return email_services
+
+async def send_job_recommendations() -> Optional[Dict[str, dict]]:
+    """
+    Daily recommendation run: group users by search, refresh each group's jobs,
+    rank the stored candidates for every member and queue their emails.
+
+    Returns the per-stage stats, or None if the run failed before finishing.
+    """
+    try:
+        group_stats = StageStats("grouping")
+        groups = await collect_groups(group_stats)
+        group_stats.finish()
+        logger.info(f"Job recommendations: {group_stats.processed} users in {len(groups)} search groups")
+
+        scrape_stats = StageStats("scraping")
+        if RECOMMENDATION_SCRAPE:
+            semaphore = asyncio.Semaphore(RECOMMENDATION_SCRAPE_CONCURRENCY)
+            await asyncio.gather(*[scrape_group(group, semaphore, scrape_stats) for group in groups])
+        scrape_stats.finish()
+
+        rank_stats = StageStats("ranking")
+        for group in groups:
+            await load_candidates(group)
+            await rank_group(group, rank_stats)
+        rank_stats.finish()
+
+        send_stats = StageStats("queueing")
+        frontend_url = os.getenv("FRONTEND_URL")
+        emails = []
+        for group in groups:
+            emails += await build_group_emails(group, frontend_url, send_stats)
+        # Stage 4b: the outbox workers send them through the batch API and record the tracking
+        await enqueue_emails(emails)
+        send_stats.processed += len(emails)
+        send_stats.finish()
+
+        return {stats.name: stats.to_dict() for stats in [group_stats, scrape_stats, rank_stats, send_stats]}
     except Exception as e:
-        print(f"Error sending job recommendations: {str(e)}")
-        
-def format_jobs_for_text(jobs: List[JobModel], frontend_url: str) -> str:
-    text = ""
-    for job in jobs:
-        url = f"{frontend_url}/jobs/{job.id}"
-        text += f"""
-• {job.title}
-  {job.company} • {job.location}
-  View Job: {url}
-
-"""
-    return text
-
-def format_jobs_for_email(jobs: List[JobModel], frontend_url: str) -> Tuple[str, str]:
-    html = ""
-    text = format_jobs_for_text(jobs, frontend_url)
-    
-    for job in jobs:
-        url = f"{frontend_url}/job/{job.id}"
-        html += f"""
-        <div style="margin-bottom: 20px; padding: 15px; border: 1px solid #e0e0e0; border-radius: 5px;">
-            <h3 style="margin: 0; color: #2557a7;"><a href="{url}" style="text-decoration: none; color: inherit;">{job.title}</a></h3>
-            <p style="margin: 5px 0; color: #666;">{job.company} • {job.location}</p>
-            <a href="{url}" style="display: inline-block; padding: 8px 15px; background-color: #2557a7; color: white; text-decoration: none; border-radius: 3px;">View Job</a>
-        </div>
-        """
+        logger.error(f"Error sending job recommendations: {str(e)}")
+
+def format_jobs_for_email(jobs: List[dict], frontend_url: str) -> Tuple[str, str]:
+    """Render a member's job list as HTML and text."""
+    html = email_templates.render("job_list.html", jobs=jobs, frontend_url=frontend_url)
+    text = email_templates.render("job_list.txt", jobs=jobs, frontend_url=frontend_url)
     return html, text
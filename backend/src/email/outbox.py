@@ -0,0 +1,83 @@
+import asyncio
+import os
+from typing import List
+
+from dotenv import load_dotenv
+from src.db.mongo import db_ops
+from src.email.email_sender import email_dispatcher, outbox_to_email_service
+from src.logger import logger
+
+load_dotenv()
+
+EMAIL_OUTBOX_WORKERS = int(os.getenv("EMAIL_OUTBOX_WORKERS", "2"))
+# A claim of more than one email is sent through the batch API, so 100 fills one request
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "100"))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "2"))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "5"))
+EMAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv("EMAIL_OUTBOX_BACKOFF_SECONDS", "60"))
+
+class EmailOutboxWorker:
+    """
+    Background tasks that drain the email outbox.
+
+    Each worker claims a batch of due emails, sends it and records the
+    result; failed sends are retried with exponential backoff until
+    EMAIL_OUTBOX_MAX_ATTEMPTS. Claims are leased, so several processes can
+    run workers against the same outbox.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._tasks: List[asyncio.Task] = []
+
+    async def process_batch(self) -> int:
+        """Claim, send and finish one batch; returns how many emails were claimed."""
+        emails = await db_ops.claim_outbox_emails(EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_LEASE_SECONDS)
+        if not emails:
+            return 0
+
+        email_services = []
+        sendable = []
+        results = []
+        for email in emails:
+            try:
+                email_services.append(outbox_to_email_service(email))
+                sendable.append(email)
+            except Exception as e:
+                # A payload that no longer validates will never send; spend its attempts now
+                logger.warning(f"Invalid outbox email {email.id}: {e}")
+                email.attempts = EMAIL_OUTBOX_MAX_ATTEMPTS
+                results.append((email, False))
+
+        if len(email_services) == 1:
+            sent = [await email_dispatcher.send(email_services[0])]
+        else:
+            sent = await email_dispatcher.send_many(email_services)
+        results += list(zip(sendable, sent))
+
+        await db_ops.finish_outbox_emails(results, EMAIL_OUTBOX_MAX_ATTEMPTS, EMAIL_OUTBOX_BACKOFF_SECONDS)
+        return len(emails)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.process_batch()
+            except Exception as e:
+                logger.warning(f"Email outbox worker error: {e}")
+                claimed = 0
+            # Keep draining while there is a backlog, otherwise poll
+            if not claimed:
+                await asyncio.sleep(EMAIL_OUTBOX_POLL_SECONDS)
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+email_outbox = EmailOutboxWorker(EMAIL_OUTBOX_WORKERS)
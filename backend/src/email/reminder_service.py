@@ -1,11 +1,11 @@
 from datetime import datetime, timedelta
-import uuid
+from typing import Optional
 from src.utils.hashing import Hash
-from src.db.mongo import DatabaseOperations
+from src.db.mongo import db_ops
 from src.db.model import User
+from src.db.email_model import EmailPreferences
 from src.email.email_sender import send_reminder_email as remainder_email_sender, send_onboarding_reminder_email
 
-db_ops = DatabaseOperations()
 
 VERIFICATION_REMINDER_SCHEDULE = [
     {"days": 3, "subject": "Verify Your Email on Ethereal Jobs"},
@@ -19,123 +19,82 @@ ONBOARDING_REMINDER_SCHEDULE = [
     {"days": 10, "subject": "Final Reminder: Complete Your Profile Setup"}
 ]
 
-async def generate_unsubscribe_token(user_id: str, email: str) -> str:
-    # Check if user already has preferences
-    prefs = await db_ops.get_email_preferences(user_id)
-    if not prefs:
-        token = str(uuid.uuid4())
-        await db_ops.create_email_preferences(user_id, email, token)
-        return token
-    return prefs.unsubscribe_token
-
-async def send_reminder_email(user: User, reminder_count: int):
+async def send_reminder_email(user: User, reminder_count: int, prefs: Optional[EmailPreferences] = None):
     try:
+        if prefs is None:
+            prefs = await db_ops.get_or_create_email_preferences(str(user.id), user.email)
         # Check if user is unsubscribed
-        prefs = await db_ops.get_email_preferences(str(user.id))
-        if prefs and "reminder" in prefs.unsubscribed_from:
+        if "reminder" in prefs.unsubscribed_from:
             return False
-
-        # Generate or get unsubscribe token
-        unsubscribe_token = await generate_unsubscribe_token(str(user.id), user.email)
+        unsubscribe_token = prefs.unsubscribe_token
         
         reminder = VERIFICATION_REMINDER_SCHEDULE[reminder_count]
         
         token = Hash.generate_random_unique_string()
         # Send email using email_sender service
-        success = remainder_email_sender(
+        await db_ops.add_verification_token(user.email, token, datetime.utcnow() + timedelta(hours=7*24))
+        # Queued in the outbox; the tracking record is written once it is actually sent
+        return await remainder_email_sender(
             email=user.email,
             name=user.name,
             verification_token=token,
             unsubscribe_token=unsubscribe_token,
-            subject=reminder["subject"]
+            subject=reminder["subject"],
+            tracking={
+                "user_id": str(user.id),
+                "email": user.email,
+                "email_type": "reminder",
+                "reminder_count": reminder_count,
+                "unsubscribe_token": unsubscribe_token
+            }
         )
-        await db_ops.add_verification_token(user.email, token, (datetime.now() + timedelta(hours=7*24)).strftime("%Y-%m-%d %H:%M:%S"))
-        
-        if success:
-            # Track email sent
-            await db_ops.create_email_tracking(
-                user_id=str(user.id),
-                email=user.email,
-                email_type="reminder",
-                reminder_count=reminder_count,
-                unsubscribe_token=unsubscribe_token
-            )
-        
-        return success
     except Exception as e:
         print(f"Error sending reminder email: {e}")
         return False
     
-async def send_onboard_remainder_email(user: User, reminder_count: int):
+async def send_onboard_remainder_email(user: User, reminder_count: int, prefs: Optional[EmailPreferences] = None):
     try:
-        prefs = await db_ops.get_email_preferences(str(user.id))
-        if prefs and "onboarding" in prefs.unsubscribed_from:
+        if prefs is None:
+            prefs = await db_ops.get_or_create_email_preferences(str(user.id), user.email)
+        if "onboarding" in prefs.unsubscribed_from:
             return False
-
-        # Generate or get unsubscribe token
-        unsubscribe_token = await generate_unsubscribe_token(str(user.id), user.email)
+        unsubscribe_token = prefs.unsubscribe_token
         
         reminder = ONBOARDING_REMINDER_SCHEDULE[reminder_count]
         # Send email using email_sender service
-        success = send_onboarding_reminder_email(
+        return await send_onboarding_reminder_email(
             email=user.email,
             name=user.name,
             unsubscribe_token=unsubscribe_token,
-            subject=reminder["subject"]
+            subject=reminder["subject"],
+            tracking={
+                "user_id": str(user.id),
+                "email": user.email,
+                "email_type": "onboarding",
+                "reminder_count": reminder_count,
+                "unsubscribe_token": unsubscribe_token
+            }
         )
-        
-        if success:
-            # Track email sent
-            await db_ops.create_email_tracking(
-                user_id=str(user.id),
-                email=user.email,
-                email_type="onboarding",
-                reminder_count=reminder_count,
-                unsubscribe_token=unsubscribe_token
-            )
-        
-        return success
     except Exception as e:
         print(f"Error sending onboarding reminder email: {e}")
         return False
 
 
 async def check_and_send_reminders():
-    now = datetime.utcnow()
-    # Find users who haven't completed onboarding
-    incomplete_users = await db_ops.get_incomplete_users()
-
-    for user in incomplete_users:
-        # Get last reminder sent
-        last_reminder = await db_ops.get_last_reminder(str(user.id))
-        
-        reminder_count = 0 if not last_reminder else last_reminder.reminder_count + 1
-        
-        # Check if we should send next reminder
-        if reminder_count >= len(VERIFICATION_REMINDER_SCHEDULE):
-            continue
-            
-        if last_reminder:
-            days_since_last = (now - last_reminder.sent_at).days
-            if days_since_last < VERIFICATION_REMINDER_SCHEDULE[reminder_count]["days"]:
-                continue
+    # Users who haven't verified their email and are due their next reminder
+    due_users = await db_ops.get_users_due_verification_reminder(
+        [reminder["days"] for reminder in VERIFICATION_REMINDER_SCHEDULE]
+    )
+    # Preferences for every recipient in one round trip instead of one lookup per email
+    prefs = await db_ops.get_or_create_email_preferences_for_users([(str(user.id), user.email) for user, _ in due_users])
+    for user, reminder_count in due_users:
         print(f"Sending reminder {reminder_count} to {user.email}")
-        await send_reminder_email(user, reminder_count)
-
-    users = await db_ops.get_verified_not_onboarded_users()
-    
-    for user in users:
-        last_reminder = await db_ops.get_last_onboarding_reminder(str(user.id))
+        await send_reminder_email(user, reminder_count, prefs.get(str(user.id)))
 
-        reminder_count = 0 if not last_reminder else last_reminder.reminder_count + 1
-
-        if reminder_count >= len(ONBOARDING_REMINDER_SCHEDULE):
-            continue
-
-        if last_reminder:
-            days_since_last = (now - last_reminder.sent_at).days
-            if days_since_last < ONBOARDING_REMINDER_SCHEDULE[reminder_count]["days"]:
-                continue
+    due_users = await db_ops.get_users_due_onboarding_reminder(
+        [reminder["days"] for reminder in ONBOARDING_REMINDER_SCHEDULE]
+    )
+    prefs = await db_ops.get_or_create_email_preferences_for_users([(str(user.id), user.email) for user, _ in due_users])
+    for user, reminder_count in due_users:
         print(f"Sending onboarding reminder {reminder_count} to {user.email}")
-        await send_onboard_remainder_email(user, reminder_count)
-
+        await send_onboard_remainder_email(user, reminder_count, prefs.get(str(user.id)))
@@ -1,34 +1,105 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime
+from functools import wraps
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from dotenv import load_dotenv
+from src.db.mongo import db_ops
 from src.email.reminder_service import check_and_send_reminders
 from src.email.job_recommendation_service import send_job_recommendations
+from src.db.job_retention import run_job_retention
+from src.logger import logger
 from fastapi import FastAPI
 
+load_dotenv()
+
+# A lease that isn't renewed within this long is considered abandoned by a crashed process
+SCHEDULER_LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "120"))
+SCHEDULER_LEASE_RETENTION_SECONDS = int(os.getenv("SCHEDULER_LEASE_RETENTION_SECONDS", str(24 * 3600)))
+
+# Identifies this process in lease documents
+SCHEDULER_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
 scheduler = AsyncIOScheduler()
 
+async def _renew_lease(job_id: str) -> None:
+    while True:
+        await asyncio.sleep(SCHEDULER_LEASE_SECONDS / 3)
+        try:
+            renewed = await db_ops.renew_scheduler_lease(job_id, SCHEDULER_OWNER, SCHEDULER_LEASE_SECONDS, SCHEDULER_LEASE_RETENTION_SECONDS)
+        except Exception as e:
+            logger.warning(f"Couldn't renew lease on scheduled job {job_id}: {e}")
+            continue
+        if not renewed:
+            logger.warning(f"Lost lease on scheduled job {job_id}")
+            return
+
+def run_once_per_cluster(job_id: str, func):
+    """
+    Wrap a scheduled job so only one process in the cluster runs each firing.
+
+    Every worker's scheduler fires at the same minute; they race for the
+    job's lease in Mongo and the winner runs the job, renewing the lease
+    while it works. The firing minute is the run key, so a worker whose
+    clock or event loop lags still sees the run as taken.
+    """
+    @wraps(func)
+    async def wrapper():
+        run_key = datetime.utcnow().strftime("%Y-%m-%dT%H:%M")
+        try:
+            acquired = await db_ops.acquire_scheduler_lease(
+                job_id, run_key, SCHEDULER_OWNER, SCHEDULER_LEASE_SECONDS, SCHEDULER_LEASE_RETENTION_SECONDS
+            )
+        except Exception as e:
+            logger.error(f"Couldn't take lease on scheduled job {job_id}: {e}")
+            return
+        if not acquired:
+            logger.info(f"Scheduled job {job_id} ({run_key}) is run by another process")
+            return
+
+        renewal = asyncio.create_task(_renew_lease(job_id))
+        try:
+            return await func()
+        finally:
+            renewal.cancel()
+            await db_ops.release_scheduler_lease(job_id, SCHEDULER_OWNER)
+    return wrapper
+
 def setup_scheduler(app: FastAPI):
     # Run at 9 AM every day
     scheduler.add_job(
-        check_and_send_reminders,
+        run_once_per_cluster("reminder_emails", check_and_send_reminders),
         CronTrigger(hour=9, minute=0, timezone='Asia/Kolkata'),
         id="reminder_emails",
         name="Send reminder emails",
         replace_existing=True
     )
-    
+
     # Run job recommendations at 10 AM every day
     scheduler.add_job(
-        send_job_recommendations,
+        run_once_per_cluster("job_recommendations", send_job_recommendations),
         CronTrigger(hour=9, minute=0, timezone='Asia/Kolkata'),
         id="job_recommendations",
         name="Send job recommendations",
         replace_existing=True
     )
-    
+
+    # Move stale jobs out of the hot collection at 3 AM, away from the email runs
+    scheduler.add_job(
+        run_once_per_cluster("job_retention", run_job_retention),
+        CronTrigger(hour=3, minute=0, timezone='Asia/Kolkata'),
+        id="job_retention",
+        name="Archive stale jobs",
+        replace_existing=True
+    )
+
     @app.on_event("startup")
     async def start_scheduler():
         scheduler.start()
-    
+
     @app.on_event("shutdown")
     async def shutdown_scheduler():
         scheduler.shutdown()
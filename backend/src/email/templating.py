@@ -0,0 +1,51 @@
+import os
+from typing import Dict, Tuple
+
+from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template, select_autoescape
+
+load_dotenv()
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+# Development only: re-read a template when its file changes on disk
+EMAIL_TEMPLATES_AUTO_RELOAD = os.getenv("EMAIL_TEMPLATES_AUTO_RELOAD", "false").lower() == "true"
+
+class TemplateRegistry:
+    """
+    Email templates compiled once and rendered from memory.
+
+    Every template in the directory is compiled on startup, so a syntax
+    error fails at boot rather than on the first send. With auto_reload,
+    Jinja checks each template's mtime on render and recompiles it when
+    the file has changed.
+    """
+
+    def __init__(self, directory: str = TEMPLATES_DIR, auto_reload: bool = EMAIL_TEMPLATES_AUTO_RELOAD) -> None:
+        self.auto_reload = auto_reload
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(enabled_extensions=("html",), default_for_string=False),
+            # Fail like string.Template did when a template field is missing
+            undefined=StrictUndefined,
+            auto_reload=auto_reload,
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+        self._templates: Dict[str, Template] = {
+            name: self.env.get_template(name) for name in self.env.list_templates()
+        }
+
+    def get(self, name: str) -> Template:
+        if self.auto_reload:
+            return self.env.get_template(name)
+        return self._templates[name]
+
+    def render(self, name: str, **data) -> str:
+        return self.get(name).render(**data)
+
+    def render_email(self, name: str, **data) -> Tuple[str, str]:
+        """Render an email's HTML template and its plain-text sibling."""
+        text_name = os.path.splitext(name)[0] + ".txt"
+        return self.render(name, **data), self.render(text_name, **data)
+
+email_templates = TemplateRegistry()
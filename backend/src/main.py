@@ -1,6 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.db.mongo import DatabaseOperations
+from fastapi.responses import JSONResponse
+from src.db.mongo import db_ops
+from src.db.connection import mongo_connection
+from src.db.user_count import user_count_cache
+from src.utils.job_search_index import search_index
+from src.utils.cache import cache
+from src.utils.hashing import hash_executor
+from src.email.email_sender import email_dispatcher
+from src.email.outbox import email_outbox
+from src.logger import logger
 from src.routes.user_router import app as user_router
 from src.routes.jobs_router import app as jobs_router
 from src.routes.resume_router import app as resume_router
@@ -34,12 +43,48 @@ async def startup_event():
     Async startup event to initialize database
     This runs when the FastAPI application starts
     """
-    await DatabaseOperations().init_database()
+    await db_ops.init_database()
+    user_count_cache.start()
+    await search_index.load_or_build(db_ops.stream_jobs_for_index)
+    search_index.start()
+    email_outbox.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await email_outbox.stop()
+    await user_count_cache.stop()
+    await search_index.stop()
+    await cache.close()
+    await email_dispatcher.drain()
+    mongo_connection.close()
+    hash_executor.shutdown(wait=False)
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
+@app.get("/health/live")
+def liveness():
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Ready once Mongo answers a ping; also reports connection pool usage"""
+    try:
+        latency_ms = await mongo_connection.ping()
+    except Exception as e:
+        # The probe is unauthenticated, so the error stays in the logs
+        logger.error(f"Readiness check failed, Mongo ping error: {e}")
+        return JSONResponse(
+            content={"status": "unavailable", "pool": mongo_connection.pool_stats.to_dict()},
+            status_code=503
+        )
+    return JSONResponse(content={
+        "status": "ok",
+        "mongo_ping_ms": round(latency_ms, 2),
+        "pool": mongo_connection.pool_stats.to_dict()
+    })
+
 app.include_router(user_router)
 app.include_router(jobs_router)
 app.include_router(resume_router)
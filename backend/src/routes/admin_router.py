@@ -1,20 +1,53 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Query, Request
 from fastapi.responses import JSONResponse
 from src.decorators.auth import is_user_admin
-from src.db.mongo import DatabaseOperations
+from src.db.mongo import db_ops
+from src.db.user_count import user_count_cache
+from src.db.instrumentation import db_metrics
+from src.utils.hashing import hash_metrics
+from src.utils.llm import llm_metrics
+from src.email.email_sender import email_dispatcher
+from src.db.model import User, UsageStats, Feedback
+from src.utils.export import ExportFormat, export_response
 
 
 app = APIRouter(prefix="/admin")
-db_ops = DatabaseOperations()
 
 @app.get("/user-count")
 async def get_user_count():
-    """Get the total number of registered users - public endpoint"""
-    try:
-        user_count = await db_ops.get_user_count()
-        return JSONResponse(content={"count": user_count})
-    except Exception as e:
-        return JSONResponse(content={"count": 15000}, status_code=500)  # Fallback to hardcoded value
+    """Get the approximate number of registered users - public endpoint, served from memory"""
+    user_count = user_count_cache.get()
+    if user_count is None:
+        return JSONResponse(content={"count": 15000})  # Fallback until the first refresh lands
+    return JSONResponse(content={"count": user_count})
+
+@app.get("/db-metrics")
+@is_user_admin
+async def get_db_metrics(request: Request, reset: bool = False):
+    """Per-method and per-command database latency stats for this worker process"""
+    metrics = db_metrics.snapshot()
+    if reset:
+        db_metrics.reset()
+    return JSONResponse(content=metrics)
+
+@app.get("/hash-metrics")
+@is_user_admin
+async def get_hash_metrics(request: Request):
+    """Password hashing pool usage and queue wait for this worker process"""
+    return JSONResponse(content=hash_metrics.to_dict())
+
+@app.get("/llm-metrics")
+@is_user_admin
+async def get_llm_metrics(request: Request):
+    """Gemini call latency, queueing and timeouts for this worker process"""
+    return JSONResponse(content=llm_metrics.to_dict())
+
+@app.get("/email-metrics")
+@is_user_admin
+async def get_email_metrics(request: Request):
+    """Email dispatcher counters for this worker process, plus outbox backlog by status"""
+    outbox = await db_ops.get_outbox_counts()
+    return JSONResponse(content={**email_dispatcher.to_dict(), "outbox": outbox})
 
 @app.get("/users")
 @is_user_admin
@@ -56,3 +89,21 @@ async def get_feedback(request: Request):
         feed["updatedAt"] = str(feed["updatedAt"])
     return JSONResponse(content=feedback)
 
+
+@app.get("/users/export")
+@is_user_admin
+async def export_users(request: Request, format: ExportFormat = "ndjson", batch_size: int = Query(default=500, ge=1, le=5000)):
+    fieldnames = [field for field in User.model_fields if field not in ["id", "password", "revision_id"]]
+    return export_response(db_ops.stream_users(batch_size), "users", format, fieldnames, ["_id"])
+
+@app.get("/usage-stats/export")
+@is_user_admin
+async def export_usage_stats(request: Request, format: ExportFormat = "ndjson", batch_size: int = Query(default=500, ge=1, le=5000)):
+    fieldnames = [field for field in UsageStats.model_fields if field not in ["id", "revision_id"]]
+    return export_response(db_ops.stream_usage_stats(batch_size), "usage_stats", format, fieldnames, ["_id"])
+
+@app.get("/feedback/export")
+@is_user_admin
+async def export_feedback(request: Request, format: ExportFormat = "ndjson", batch_size: int = Query(default=500, ge=1, le=5000)):
+    fieldnames = [field for field in Feedback.model_fields if field not in ["id", "revision_id"]]
+    return export_response(db_ops.stream_feedback(batch_size), "feedback", format, fieldnames, ["_id"])
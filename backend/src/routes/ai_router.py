@@ -1,10 +1,11 @@
+import asyncio
 import os
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from typing import Dict, Optional
 from src.decorators.auth import is_user_logged_in
 from src.db.model import ResumeUpdate, User
-from src.db.mongo import DatabaseOperations, Features
+from src.db.mongo import db_ops, Features
 from src.logger import logger
 from src.api.generate_linkedin_message import generate_message_api_response
 import requests
@@ -13,7 +14,6 @@ from fastapi import UploadFile, File
 from src.api.extract_resume import convert_to_plain_text, ats_extractor
 
 app = APIRouter()
-db_ops = DatabaseOperations()
 
 
 @app.get("/generate/linkedin/message/{email}")
@@ -38,7 +38,7 @@ async def generate_linkedin_message(request: Request, email: str, company: str,
             linkedin_message.pop(field)
 
     if not linkedin_message or newMessage:
-        message_dict = generate_message_api_response(resume, company, position, name=user.name)
+        message_dict = await generate_message_api_response(resume, company, position, name=user.name)
         linkedin_message = await db_ops.update_linked_message(email, company, position, message_dict["message"])
         linkedin_message = message_dict
         # Clean up response
@@ -62,8 +62,9 @@ async def extract_resume(request: Request, file: UploadFile = File(...)):
             f.write(content)
 
         is_pdf = file_path.lower().endswith(".pdf")
-        text = convert_to_plain_text(file_path) if not is_pdf else ""
-        result = ats_extractor(file_path, text, is_pdf)
+        # textract shells out to converters, so keep it off the event loop too
+        text = await asyncio.to_thread(convert_to_plain_text, file_path) if not is_pdf else ""
+        result = await ats_extractor(file_path, text, is_pdf)
 
         result["email"] = user.email
 
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, HTTPException
-from src.db.email_model import EmailPreferences
-from datetime import datetime
+from src.db.mongo import db_ops
 
 router = APIRouter()
 
 @router.post("/unsubscribe/{token}")
 async def unsubscribe_email(token: str, type: str):
-    # Find preferences by token
-    prefs = await EmailPreferences.find_one({"unsubscribe_token": token})
+    # Find preferences by token, served by the unique token index
+    prefs = await db_ops.get_email_preferences_by_token(token)
     if not prefs:
         return {
             "message": "Invalid unsubscribe link",
@@ -16,10 +15,7 @@ async def unsubscribe_email(token: str, type: str):
         }
     
     # Add email type to unsubscribed list if not already there
-    if type not in prefs.unsubscribed_from:
-        prefs.unsubscribed_from.append(type)
-        prefs.updated_at = datetime.utcnow()
-        await prefs.save()
+    await db_ops.update_email_preferences(prefs, type)
     
     return {
         "message": "Successfully unsubscribed from emails",
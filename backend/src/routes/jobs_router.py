@@ -1,22 +1,26 @@
 from fastapi import APIRouter, Query, HTTPException, Request
 from fastapi.responses import JSONResponse
 from typing import List, Dict, Optional
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from jobspy import JobType
 from src.utils.resume_job_matcher import get_job_details
 from src.decorators.auth import is_user_logged_in
 from src.db.model import JobModel, JobQuery, ApplicationStatus, ApplicationStatusUpdate, Features
-from src.api.jobs import get_jobs_api_response
-from src.db.mongo import DatabaseOperations, User
+from src.api.jobs import get_jobs_api_response, build_job_model
+from src.db.mongo import db_ops, User
 from src.utils.helpers import serialize_dates
 from src.api.linkedin_profiles import get_linkedin_profiles_api_response
 from src.logger import logger
+from src.utils.job_search_index import search_index
+from src.utils.cache import cache
+import os
+
+JOB_SEARCH_CACHE_TTL_SECONDS = int(os.getenv("JOB_SEARCH_CACHE_TTL_SECONDS", "60"))
 
 app = APIRouter()
-db_ops = DatabaseOperations()
 
 @app.get("/jobs")
-@is_user_logged_in
+@is_user_logged_in(claims_only=True)
 async def get_jobs(
     request: Request,
     city: str,
@@ -55,7 +59,7 @@ async def get_jobs(
     )
 
     # Check for cached jobs from yesterday onwards
-    yesterday = str(date.today() - timedelta(days=1))
+    yesterday = datetime.combine(date.today() - timedelta(days=1), time.min)
     cached_jobs = await db_ops.get_jobs_from_db(query_params, yesterday)
 
     await db_ops.update_usage_stats(user.email, Features.JobSearch)
@@ -65,12 +69,13 @@ async def get_jobs(
         json_response = sorted(
             json_response,
             key=lambda x: (
-                str(x.get("date_posted", "")),
+                x.get("date_posted") or datetime.min,
                 x.get("title", "")
             ),
             reverse=True
         )
         json_response = json_response[:results_wanted]
+        json_response = await db_ops.load_job_descriptions(json_response)
         json_response = await get_job_details(db_ops, user, json_response, job_title)
 
         fields_to_remove = ["query", "createdAt", "updatedAt"]
@@ -78,7 +83,7 @@ async def get_jobs(
             for field in fields_to_remove:
                 job.pop(field)
         return JSONResponse(
-            content=json_response,
+            content=serialize_dates(json_response),
             media_type="application/json"
         )
 
@@ -98,45 +103,23 @@ async def get_jobs(
 
     # Process and store jobs
     serialized_jobs = serialize_dates(jobs)
-    job_models = [JobModel(
-        company=job.get("company") if job.get("company") else "",
-        id=job.get("id") if job.get("id") else "",
-        title=job.get("title") if job.get("title") else "",
-        location=job.get("location") if job.get("location") else "",
-        date_posted=job.get("date_posted") if job.get("date_posted") else "",
-        query=query_params,
-        description=job.get("description") if job.get("description") else "",
-        url=job.get("job_url_direct") if job.get("job_url_direct") else job.get("job_url", ""),
-        salary=job.get("salary") if job.get("salary") else "",
-        company_logo=job.get("company_logo") if job.get("company_logo") else "",
-        min_amount=str(job.get("min_amount")) if job.get("min_amount") else "",
-        max_amount=str(job.get("max_amount")) if job.get("max_amount") else "",
-        company_url=job.get("company_url") if job.get("company_url") else "",
-        company_description=job.get("company_description") if job.get("company_description") else "",
-        company_num_employees=job.get("company_num_employees") if job.get("company_num_employees") else "",
-        company_revenue=job.get("company_revenue") if job.get("company_revenue") else "",
-        company_industry=job.get("company_industry") if job.get("company_industry") else "",
-        company_addresses=job.get("company_addresses") if job.get("company_addresses") else "",
-        company_url_direct=job.get("company_url_direct") if job.get("company_url_direct") else "",
-        job_level=job.get("job_level") if job.get("job_level") else "",
-        job_function=job.get("job_function") if job.get("job_function") else "",
-        currency=job.get("currency") if job.get("currency") else "",
-    ) for job in serialized_jobs]
+    job_models = [build_job_model(job, query_params) for job in serialized_jobs]
     await db_ops.update_jobs(job_models, query_params)
 
-    last_fivedays = str(date.today() - timedelta(days=5))
+    last_fivedays = datetime.combine(date.today() - timedelta(days=5), time.min)
     jobs = await db_ops.get_jobs_from_db(query_params, last_fivedays)
 
     json_response = [job.model_dump() for job in jobs]
     json_response = sorted(
         json_response,
         key=lambda x: (
-            str(x.get("date_posted", "")),
+            x.get("date_posted") or datetime.min,
             x.get("title", "")
         ),
         reverse=True
     )
     json_response = json_response[:results_wanted]
+    json_response = await db_ops.load_job_descriptions(json_response)
     json_response = await get_job_details(db_ops, user, json_response, job_title)
 
     fields_to_remove = ["query", "createdAt", "updatedAt"]
@@ -144,12 +127,39 @@ async def get_jobs(
         for field in fields_to_remove:
             job.pop(field)
     return JSONResponse(
-        content=json_response,
+        content=serialize_dates(json_response),
         media_type="application/json"
     )
 
+@app.get("/jobs/search")
+@is_user_logged_in(claims_only=True)
+async def search_jobs(
+    request: Request,
+    q: str = Query(min_length=1),
+    limit: int = Query(default=20, ge=1, le=100)
+) -> JSONResponse:
+    """Full-text search over stored jobs, ranked with BM25, without scraping."""
+    cache_key = f"job_search:{limit}:{' '.join(q.lower().split())}"
+    ranked = await cache.get(cache_key)
+    if ranked is None:
+        ranked = search_index.search(q, limit)
+        await cache.set(cache_key, ranked, JOB_SEARCH_CACHE_TTL_SECONDS)
+    scores = dict(ranked)
+    jobs = await db_ops.get_jobs_by_ids([job_id for job_id, _ in ranked])
+
+    json_response = []
+    fields_to_remove = ["query", "createdAt", "updatedAt"]
+    for job in jobs:
+        job_dict = job.model_dump()
+        for field in fields_to_remove:
+            job_dict.pop(field)
+        job_dict["search_score"] = round(scores[job.id], 4)
+        json_response.append(job_dict)
+    json_response = await db_ops.load_job_descriptions(json_response)
+    return JSONResponse(content=serialize_dates(json_response), media_type="application/json")
+
 @app.get("/job/applied_jobs")
-@is_user_logged_in
+@is_user_logged_in(claims_only=True)
 async def get_applied_jobs(request: Request) -> JSONResponse:
     user: User = request.state.user
     logger.info(f"Getting applied jobs for user {user.email}")
@@ -180,10 +190,10 @@ async def get_applied_jobs(request: Request) -> JSONResponse:
             status_code=200
         )
     json_response = await get_job_details(db_ops, user, jobs, resume.personalInfo.headline)
-    return JSONResponse(content=json_response, media_type="application/json")
+    return JSONResponse(content=serialize_dates(json_response), media_type="application/json")
 
 @app.get("/job/{job_id}")
-@is_user_logged_in
+@is_user_logged_in(claims_only=True)
 async def get_job(request: Request, job_id: str) -> Dict:
     user: User = request.state.user
     logger.info(f"Getting job {job_id}")
@@ -206,10 +216,10 @@ async def get_job(request: Request, job_id: str) -> Dict:
 
     json_response = await get_job_details(db_ops, user, [job_dict], job_dict["title"])
     job_dict = json_response[0]
-    return JSONResponse(content=job_dict, media_type="application/json")
+    return JSONResponse(content=serialize_dates(job_dict), media_type="application/json")
 
 @app.get("/job/{job_id}/linkedin/profile")
-@is_user_logged_in
+@is_user_logged_in(claims_only=True)
 async def get_linkedin_profile(request: Request, job_id: str, get_new: bool) -> Dict:
     user: User = request.state.user
     logger.info(f"Getting linkedin profile for job {job_id}")
@@ -253,10 +263,10 @@ async def get_linkedin_profile(request: Request, job_id: str, get_new: bool) ->
     for field in fields_to_remove:
         job_dict.pop(field)
     
-    return JSONResponse(content={"job": job_dict, "linkedin_profiles": profiles_dict, "is_success": True, "is_empty": False}, media_type="application/json")
+    return JSONResponse(content={"job": serialize_dates(job_dict), "linkedin_profiles": profiles_dict, "is_success": True, "is_empty": False}, media_type="application/json")
 
 @app.post("/job/application_status/update")
-@is_user_logged_in
+@is_user_logged_in(claims_only=True)
 async def update_application_status(request: Request, data: ApplicationStatusUpdate) -> JSONResponse:
     user: User = request.state.user
     job_id = data.job_id
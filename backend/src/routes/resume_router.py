@@ -5,7 +5,7 @@ from fastapi.templating import Jinja2Templates
 from src.utils.helpers import get_templates
 from src.api.extract_resume import get_ai_optimized_resume
 from src.decorators.auth import is_user_logged_in
-from src.db.mongo import DatabaseOperations
+from src.db.mongo import db_ops
 from src.logger import logger
 from fastapi import Request, status
 from src.db.model import AIResumeSave, AIResumeUpdate, Features, ResumeUpdate, User, DownloadResume
@@ -13,7 +13,6 @@ from weasyprint import HTML
 import os
 
 app = APIRouter(prefix="/resume")
-db_ops = DatabaseOperations()
 templates = Jinja2Templates(directory=os.path.join(os.getcwd(),"src/templates"))
 
 @app.get("")
@@ -6,13 +6,12 @@ import os
 
 from src.email.email_sender import send_verification_email, send_password_reset_email
 from src.db.model import User, UserLogin, ResetPassword, UserUpdateName, UserUpdatePassword
-from src.utils.jwttoken import create_access_token, create_refresh_token, verify_token
+from src.utils.jwttoken import create_access_token, create_refresh_token, verify_token, user_claims
 from src.utils.hashing import Hash
 from fastapi import status, APIRouter
-from src.db.mongo import DatabaseOperations
+from src.db.mongo import db_ops
 from src.decorators.auth import is_user_logged_in
 
-db_ops = DatabaseOperations()
 app = APIRouter(prefix="/user")
 load_dotenv()
 
@@ -23,14 +22,14 @@ async def create_user(request:User):
     user = await db_ops.get_user(request.email)
     if user:
         return JSONResponse(content={"message": "User already exists", "is_created": False, "is_exists": True}, status_code=status.HTTP_200_OK)
-    hashed_pass = Hash.bcrypt(request.password)
     user_object = dict(request)
-    user_object["password"] = hashed_pass if request.provider == "custom" else ""
+    # Google sign-ups have no password, so skip the hashing cost entirely
+    user_object["password"] = await Hash.bcrypt_async(request.password) if request.provider == "custom" else ""
     if request.provider != "google":
         user_object["is_verified"] = False
         token = Hash.generate_random_unique_string()
-        send_verification_email(request.email, token, request.name)
-        await db_ops.add_verification_token(request.email, token, (datetime.now() + timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S"))
+        await send_verification_email(request.email, token, request.name)
+        await db_ops.add_verification_token(request.email, token, datetime.utcnow() + timedelta(hours=24))
     else:   
         user_object["is_verified"] = True
         user_object["provider"] = "google"
@@ -46,8 +45,8 @@ async def resend_verification(email:str):
         return JSONResponse(content={"message": "Email already verified", "is_exists": True, "is_valid": True, "is_verified": True})
     await db_ops.revoke_verification_token(email)
     token = Hash.generate_random_unique_string()
-    send_verification_email(email, token, user.name)
-    await db_ops.add_verification_token(email, token, (datetime.now() + timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S"))
+    await send_verification_email(email, token, user.name)
+    await db_ops.add_verification_token(email, token, datetime.utcnow() + timedelta(hours=24))
     return JSONResponse(content={"message": "Verification email sent", "is_exists": True, "is_valid": True, "is_verified": False})
 
 @app.post('/verify-email/{token}')
@@ -64,13 +63,13 @@ async def login(request:UserLogin):
     user = await db_ops.get_user(request.email)
     if not user:
         return JSONResponse(content={"message": "User does not exist", "is_exists": False, "is_valid": False, "is_verified": False})
-    if user.provider == "custom" and not request.provider=="google" and not Hash.verify(user.password, request.password):
+    if user.provider == "custom" and not request.provider=="google" and not await Hash.verify_async(user.password, request.password):
         return JSONResponse(content={"message": "Invalid credentials", "is_exists": True, "is_valid": False, "is_verified": False})
     if not user.is_verified:
         return JSONResponse(content={"message": "Email not verified", "is_exists": True, "is_valid": False, "is_verified": False})
     refresh_token, expire = create_refresh_token()
-    access_token = create_access_token(data={"email": request.email})
-    await db_ops.add_refresh_token(request.email, refresh_token, expire.strftime("%Y-%m-%d %H:%M:%S"))
+    access_token = create_access_token(data=user_claims(user))
+    await db_ops.add_refresh_token(request.email, refresh_token, expire)
     response = JSONResponse(content={"message": "Login successful", "is_exists": True, "is_valid": True, "is_verified": True, "is_onboarded": user.is_onboarded})
     response.set_cookie(key="access_token", value=access_token, httponly=is_https, secure=is_https, samesite='none')
     response.set_cookie(key="refresh_token", value=refresh_token, httponly=is_https, secure=is_https, samesite='none')
@@ -100,8 +99,10 @@ async def refresh(request: Request):
     token_data = verify_token(refresh_token)
     if token_data.is_expired:
         return JSONResponse(content={"message": "Token expired"}, status_code=status.HTTP_401_UNAUTHORIZED)
-    access_token = create_access_token(data={"email": token.user_email})
     user = await db_ops.get_user(token.user_email)
+    if not user:
+        return JSONResponse(content={"message": "User does not exist"}, status_code=status.HTTP_401_UNAUTHORIZED)
+    access_token = create_access_token(data=user_claims(user))
     user_dict = user.__dict__
     fields_to_exclude = ["id", "password", "updatedAt", "createdAt"]
     for field in fields_to_exclude:
@@ -124,8 +125,8 @@ async def reset_password(request:ResetPassword):
     if not user:
         return JSONResponse(content={"message": "User does not exist", "is_exists": False, "is_valid": False})
     random_uuid = Hash.generate_random_unique_string()
-    await db_ops.add_reset_password_token(request.email, random_uuid, (datetime.now() + timedelta(minutes=60)).strftime("%Y-%m-%d %H:%M:%S"))
-    send_password_reset_email(request.email, random_uuid, user.name.split(" ")[0])
+    await db_ops.add_reset_password_token(request.email, random_uuid, datetime.utcnow() + timedelta(minutes=60))
+    await send_password_reset_email(request.email, random_uuid, user.name.split(" ")[0])
     return JSONResponse(content={"message": "Password reset link sent to your email", "is_exists": True, "is_valid": True})
 
 @app.post('/reset-password/{token}/check')
@@ -142,7 +143,7 @@ async def update_password(token:str, request:UserUpdatePassword):
     email = await db_ops.get_user_by_reset_password_token(token)
     if not email:
         return JSONResponse(content={"message": "Invalid token", "is_valid": False, "is_expired": False})
-    hashed_pass = Hash.bcrypt(request.password)
+    hashed_pass = await Hash.bcrypt_async(request.password)
     success = await db_ops.update_user_password(email, hashed_pass, token)
     if not success:
         return JSONResponse(content={"message": "Invalid token", "is_valid": False, "is_expired": False})
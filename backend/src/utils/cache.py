@@ -0,0 +1,132 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from cachetools import TLRUCache
+from dotenv import load_dotenv
+from src.logger import logger
+
+load_dotenv()
+
+# "memory" keeps entries per process, "redis" shares them between uvicorn workers
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "ethereal:")
+MEMORY_CACHE_MAX_SIZE = int(os.getenv("MEMORY_CACHE_MAX_SIZE", "50000"))
+
+class CacheBackend(ABC):
+    """
+    Key-value cache with per-key TTLs, storing JSON-serializable values.
+
+    Backends never raise on cache errors: a failed read is a miss and a
+    failed write is dropped, so callers always fall back to the source.
+    """
+
+    # Whether every process sees the same entries; per-process caches can't carry cross-process invalidations
+    shared = False
+
+    async def get(self, key: str) -> Optional[Any]:
+        values = await self.get_many([key])
+        return values.get(key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        await self.set_many({key: value}, ttl_seconds)
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Return the cached values for `keys`; missing keys are left out."""
+
+    @abstractmethod
+    async def set_many(self, values: Dict[str, Any], ttl_seconds: int) -> None:
+        """Cache every value for `ttl_seconds`."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Drop a key if it is cached."""
+
+    async def close(self) -> None:
+        pass
+
+class InMemoryCache(CacheBackend):
+    """Process-local backend; values are stored serialized so both backends hand out fresh copies."""
+
+    def __init__(self, max_size: int) -> None:
+        # Each value is stored as (expiry, payload) and expires at its own deadline
+        self._entries: TLRUCache = TLRUCache(
+            maxsize=max_size,
+            ttu=lambda _key, value, _now: value[0],
+            timer=time.monotonic
+        )
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None:
+                values[key] = json.loads(entry[1])
+        return values
+
+    async def set_many(self, values: Dict[str, Any], ttl_seconds: int) -> None:
+        expiry = time.monotonic() + ttl_seconds
+        for key, value in values.items():
+            try:
+                self._entries[key] = (expiry, json.dumps(value))
+            except Exception as e:
+                logger.warning(f"Memory cache write failed for {key}: {e}")
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+class RedisCache(CacheBackend):
+    """Backend shared by every worker pointing at the same Redis."""
+
+    shared = True
+
+    def __init__(self, url: str, prefix: str, client=None) -> None:
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        # `client` lets tests pass a fake; anything with the redis.asyncio API works
+        self._client = client if client is not None else redis.from_url(url)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        try:
+            payloads = await self._client.mget([self.prefix + key for key in keys])
+            return {key: json.loads(payload) for key, payload in zip(keys, payloads) if payload is not None}
+        except Exception as e:
+            logger.warning(f"Redis cache read failed: {e}")
+            return {}
+
+    async def set_many(self, values: Dict[str, Any], ttl_seconds: int) -> None:
+        if not values:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    pipe.set(self.prefix + key, json.dumps(value), ex=ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._client.delete(self.prefix + key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+def build_cache(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND."""
+    if backend == "redis":
+        return RedisCache(REDIS_URL, CACHE_KEY_PREFIX)
+    if backend != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND {backend!r}, using memory")
+    return InMemoryCache(MEMORY_CACHE_MAX_SIZE)
+
+cache = build_cache()
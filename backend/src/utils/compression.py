@@ -0,0 +1,24 @@
+import os
+import zlib
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+
+def compress_bytes(data: bytes) -> bytes:
+    """Compress raw bytes with zlib."""
+    return zlib.compress(data, COMPRESSION_LEVEL)
+
+def decompress_bytes(data: bytes) -> bytes:
+    """Inverse of `compress_bytes`."""
+    return zlib.decompress(data)
+
+def compress_text(text: str) -> bytes:
+    """Compress a UTF-8 string."""
+    return compress_bytes(text.encode("utf-8"))
+
+def decompress_text(data: bytes) -> str:
+    """Inverse of `compress_text`."""
+    return decompress_bytes(data).decode("utf-8")
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Literal
+
+from fastapi.responses import StreamingResponse
+from src.utils.helpers import CustomJSONEncoder, serialize_dates
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+async def iter_ndjson(cursor, fields_to_remove: List[str]) -> AsyncIterator[str]:
+    """Yield one JSON line per document as the cursor produces it."""
+    async for doc in cursor:
+        for field in fields_to_remove:
+            doc.pop(field, None)
+        yield json.dumps(doc, cls=CustomJSONEncoder) + "\n"
+
+async def iter_csv(cursor, fieldnames: List[str]) -> AsyncIterator[str]:
+    """Yield a CSV header followed by one row per document."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for doc in cursor:
+        buffer.seek(0)
+        buffer.truncate(0)
+        row = {}
+        for key, value in serialize_dates(doc).items():
+            # Nested values (lists, sub documents) don't fit in a cell as-is
+            row[key] = json.dumps(value, cls=CustomJSONEncoder) if isinstance(value, (list, dict)) else value
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+def export_response(cursor, name: str, export_format: ExportFormat, fieldnames: List[str], fields_to_remove: List[str]) -> StreamingResponse:
+    """
+    Build a streaming response that writes each document as it arrives.
+
+    Args:
+        cursor: Async cursor over raw documents
+        name (str): Base name of the downloaded file
+        export_format (str): Either "ndjson" or "csv"
+        fieldnames (List[str]): CSV columns, in order
+        fields_to_remove (List[str]): Fields dropped from every NDJSON line
+
+    Returns:
+        StreamingResponse: Response streaming the export
+
+    Raises:
+        ValueError: If export_format is not a supported format
+    """
+    if export_format not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format == "csv":
+        body = iter_csv(cursor, fieldnames)
+    else:
+        body = iter_ndjson(cursor, fields_to_remove)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{export_format}"'
+        }
+    )
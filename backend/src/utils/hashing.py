@@ -1,13 +1,72 @@
 from passlib.context import CryptContext
 pwd_cxt = CryptContext(schemes =["bcrypt"],deprecated="auto")
+import asyncio
+import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# bcrypt releases the GIL while hashing, so a thread per core scales with cores
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(os.cpu_count() or 2)))
+hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+
+class HashMetrics():
+   """Queue wait and run time of hashing calls offloaded to the worker pool."""
+
+   def __init__(self):
+      self.calls = 0
+      self.in_flight = 0
+      self.max_in_flight = 0
+      self.total_wait_ms = 0.0
+      self.max_wait_ms = 0.0
+      self.total_run_ms = 0.0
+
+   def to_dict(self):
+      return {
+         "workers": HASH_WORKERS,
+         "calls": self.calls,
+         "in_flight": self.in_flight,
+         "max_in_flight": self.max_in_flight,
+         "avg_wait_ms": round(self.total_wait_ms / self.calls, 2) if self.calls else 0.0,
+         "max_wait_ms": round(self.max_wait_ms, 2),
+         "avg_run_ms": round(self.total_run_ms / self.calls, 2) if self.calls else 0.0,
+      }
+
+hash_metrics = HashMetrics()
+
+async def run_in_hash_pool(func, *args):
+   """Run a CPU-bound hashing call on the bounded pool, recording how long it queued."""
+   submitted = time.perf_counter()
+
+   def timed():
+      started = time.perf_counter()
+      return started, func(*args), time.perf_counter()
+
+   hash_metrics.in_flight += 1
+   hash_metrics.max_in_flight = max(hash_metrics.max_in_flight, hash_metrics.in_flight)
+   try:
+      started, result, finished = await asyncio.get_running_loop().run_in_executor(hash_executor, timed)
+   finally:
+      hash_metrics.in_flight -= 1
+   wait_ms = (started - submitted) * 1000
+   hash_metrics.calls += 1
+   hash_metrics.total_wait_ms += wait_ms
+   hash_metrics.max_wait_ms = max(hash_metrics.max_wait_ms, wait_ms)
+   hash_metrics.total_run_ms += (finished - started) * 1000
+   return result
 
 class Hash():
    def bcrypt(password:str):
       return pwd_cxt.hash(password)
-   
+
    def verify(hashed,normal):
       return pwd_cxt.verify(normal,hashed)
-   
+
+   async def bcrypt_async(password:str):
+      return await run_in_hash_pool(pwd_cxt.hash, password)
+
+   async def verify_async(hashed,normal):
+      return await run_in_hash_pool(pwd_cxt.verify, normal, hashed)
+
    def generate_random_unique_string():
       return str(uuid.uuid4())
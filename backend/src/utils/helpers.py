@@ -2,12 +2,17 @@ from datetime import date, datetime
 import json
 import os
 import string
+from typing import Optional
+
+from bson import ObjectId
 
 class CustomJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder for handling date and datetime objects."""
+    """Custom JSON encoder for handling date, datetime and ObjectId values."""
     def default(self, obj):
         if isinstance(obj, (date, datetime)):
             return obj.isoformat()
+        if isinstance(obj, ObjectId):
+            return str(obj)
         return super().default(obj)
 
 def serialize_dates(obj):
@@ -22,6 +27,21 @@ def serialize_dates(obj):
         case _:
             return obj
 
+def parse_date_posted(value) -> Optional[datetime]:
+    """Parse a scraper's posting date (date, datetime or ISO string) into a datetime, or None."""
+    match value:
+        case datetime():
+            return value
+        case date():
+            return datetime.combine(value, datetime.min.time())
+        case str() if value.strip():
+            try:
+                return datetime.fromisoformat(value.strip())
+            except ValueError:
+                return None
+        case _:
+            return None
+
 def get_templates(template_name: str) -> string.Template:
     template_path: str = os.path.join(
         os.getcwd(),
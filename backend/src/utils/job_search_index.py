@@ -0,0 +1,255 @@
+import asyncio
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from src.logger import logger
+from src.utils.compression import compress_text, decompress_text
+
+load_dotenv()
+
+# Warm-start snapshot only; Mongo stays the source of truth. Kept in the app's own data
+# directory, outside the source tree and away from world-writable locations like /tmp
+JOB_SEARCH_INDEX_PATH = os.getenv(
+    "JOB_SEARCH_INDEX_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "job_search_index.json.z"))
+)
+JOB_SEARCH_INDEX_SAVE_SECONDS = int(os.getenv("JOB_SEARCH_INDEX_SAVE_SECONDS", "60"))
+# Every process pulls jobs ingested by the others this often
+JOB_SEARCH_INDEX_SYNC_SECONDS = int(os.getenv("JOB_SEARCH_INDEX_SYNC_SECONDS", "60"))
+# Full rebuild, dropping jobs retired anywhere in the cluster
+JOB_SEARCH_INDEX_REBUILD_SECONDS = int(os.getenv("JOB_SEARCH_INDEX_REBUILD_SECONDS", str(6 * 3600)))
+# Re-read a little before the last sync so jobs written while it ran aren't missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Field boosts are applied by repeating a field's terms
+TITLE_BOOST = 3
+COMPANY_BOOST = 2
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "our", "that", "the", "this", "to", "we", "will", "with", "you", "your",
+}
+
+TAG_PATTERN = re.compile(r"<[^>]*>")
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, strip HTML and split text into index terms."""
+    text = TAG_PATTERN.sub(" ", text or "").lower()
+    return [token.rstrip(".") for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS]
+
+class JobSearchIndex:
+    """
+    In-process inverted index over job title, company and description, ranked with BM25.
+
+    Documents are added as jobs are ingested. Each process keeps its own
+    copy, so every process also pulls jobs updated in Mongo since its last
+    sync, and periodically rebuilds from Mongo to drop retired jobs. The
+    index is saved to disk periodically as compressed JSON, so a restart
+    loads it and only syncs what changed instead of rebuilding.
+    """
+
+    k1 = 1.5
+    b = 0.75
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # term -> {job id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        # job id -> (document length, unique terms), kept so re-indexing a job replaces it
+        self.documents: Dict[str, Tuple[int, List[str]]] = {}
+        self.total_length = 0
+        # Jobs updated in Mongo before this have been pulled into the index
+        self.synced_at: Optional[datetime] = None
+        self._dirty = False
+        self._save_task = None
+        self._save_lock = asyncio.Lock()
+        self._cursor_factory: Optional[Callable] = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, job_id: str, title: str, company: str, description: str) -> None:
+        if not job_id:
+            return
+        self.remove(job_id)
+        terms = tokenize(title) * TITLE_BOOST + tokenize(company) * COMPANY_BOOST + tokenize(description)
+        if not terms:
+            return
+        frequencies = Counter(terms)
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[job_id] = frequency
+        self.documents[job_id] = (len(terms), list(frequencies))
+        self.total_length += len(terms)
+        self._dirty = True
+
+    def remove(self, job_id: str) -> None:
+        document = self.documents.pop(job_id, None)
+        if not document:
+            return
+        length, terms = document
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(job_id, None)
+            if not postings:
+                del self.postings[term]
+        self.total_length -= length
+        self._dirty = True
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Rank indexed jobs against a free-text query.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results
+
+        Returns:
+            List[Tuple[str, float]]: (job id, BM25 score) pairs, best first
+        """
+        if not self.documents:
+            return []
+        document_count = len(self.documents)
+        average_length = self.total_length / document_count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for job_id, frequency in postings.items():
+                length = self.documents[job_id][0]
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[job_id] = scores.get(job_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    async def save(self) -> None:
+        """Persist the index atomically; serialization happens on the loop, compression and the write in a thread."""
+        # Overlapping saves in this process write one at a time
+        async with self._save_lock:
+            text = json.dumps({
+                "postings": self.postings,
+                "documents": self.documents,
+                "total_length": self.total_length,
+                "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+            })
+            self._dirty = False
+            await asyncio.to_thread(self._write, text)
+
+    def _write(self, text: str) -> None:
+        data = compress_text(text)
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # A tmp file per write, so other processes saving at the same time can't interleave with it
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".job_search_index.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _read(self) -> dict:
+        with open(self.path, "rb") as file:
+            return json.loads(decompress_text(file.read()))
+
+    def _add_job(self, job: dict) -> None:
+        self.add(job["_id"], job.get("title", ""), job.get("company", ""), job.get("description", ""))
+
+    async def load_or_build(self, cursor_factory: Callable) -> None:
+        """
+        Load the persisted index and sync it, or build it from stored jobs when there is none.
+
+        Args:
+            cursor_factory (Callable): Takes an optional `since` datetime and returns
+                an async cursor over raw job documents updated since then
+        """
+        self._cursor_factory = cursor_factory
+        if os.path.exists(self.path):
+            try:
+                data = await asyncio.to_thread(self._read)
+                self.postings = data["postings"]
+                self.documents = {job_id: (length, terms) for job_id, (length, terms) in data["documents"].items()}
+                self.total_length = data["total_length"]
+                self.synced_at = datetime.fromisoformat(data["synced_at"]) if data.get("synced_at") else None
+                logger.info(f"Loaded job search index with {len(self)} jobs")
+            except Exception as e:
+                logger.warning(f"Could not load job search index, rebuilding: {e}")
+        if self.synced_at is None:
+            await self.rebuild()
+        else:
+            await self.sync()
+        await self.save()
+
+    async def sync(self) -> int:
+        """Pull jobs updated in Mongo since the last sync, e.g. ingested by another process."""
+        started = datetime.utcnow()
+        synced = 0
+        async for job in self._cursor_factory(since=self.synced_at - SYNC_OVERLAP):
+            self._add_job(job)
+            synced += 1
+        self.synced_at = started
+        return synced
+
+    async def rebuild(self) -> None:
+        """Rebuild from every stored job, then swap it in, dropping jobs retired anywhere."""
+        started = datetime.utcnow()
+        fresh = JobSearchIndex(self.path)
+        async for job in self._cursor_factory():
+            fresh._add_job(job)
+        self.postings = fresh.postings
+        self.documents = fresh.documents
+        self.total_length = fresh.total_length
+        # Jobs ingested here during the rebuild went into the old postings; the next sync re-adds them
+        self.synced_at = started
+        self._dirty = True
+        logger.info(f"Built job search index with {len(self)} jobs")
+
+    async def _run(self) -> None:
+        last_rebuild = last_save = time.monotonic()
+        while True:
+            await asyncio.sleep(JOB_SEARCH_INDEX_SYNC_SECONDS)
+            try:
+                if time.monotonic() - last_rebuild >= JOB_SEARCH_INDEX_REBUILD_SECONDS:
+                    await self.rebuild()
+                    last_rebuild = time.monotonic()
+                else:
+                    await self.sync()
+            except Exception as e:
+                logger.warning(f"Could not sync job search index: {e}")
+            if self._dirty and time.monotonic() - last_save >= JOB_SEARCH_INDEX_SAVE_SECONDS:
+                try:
+                    await self.save()
+                    last_save = time.monotonic()
+                except Exception as e:
+                    logger.warning(f"Could not save job search index: {e}")
+
+    def start(self) -> None:
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._save_task:
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+            self._save_task = None
+        if self._dirty:
+            await self.save()
+
+search_index = JobSearchIndex(JOB_SEARCH_INDEX_PATH)
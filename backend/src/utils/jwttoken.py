@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt, ExpiredSignatureError
-from src.db.model import TokenData
+from src.db.model import TokenData, User
 from dotenv import load_dotenv
 import os
 
@@ -18,6 +18,19 @@ def create_access_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def user_claims(user: User) -> dict:
+    """
+    Claims embedded in access tokens so identity-only endpoints can skip the user lookup.
+
+    Only identity goes in: profile fields such as name or onboarding state
+    change without a new token being issued, so they would go stale.
+    """
+    return {
+        "email": user.email,
+        "uid": str(user.id),
+        "tv": user.token_version,
+    }
+
 def create_refresh_token():
     expire = datetime.utcnow() + timedelta(minutes=REFRESH_TOKEN_EXPIRE_MINUTES)
     encoded_jwt = jwt.encode({"exp": expire}, SECRET_KEY, algorithm=ALGORITHM)
@@ -27,7 +40,12 @@ def verify_token(token:str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("email")
-        token_data = TokenData(email=email, is_valid=True if email else False)
+        token_data = TokenData(
+            email=email,
+            is_valid=True if email else False,
+            user_id=payload.get("uid"),
+            token_version=payload.get("tv", 0)
+        )
         return token_data
     except ExpiredSignatureError:
         return TokenData(is_valid=True, is_expired=True)
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+
+from dotenv import load_dotenv
+from google import genai
+
+load_dotenv()
+
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")
+# Gemini calls in flight at once, per process; the rest wait their turn
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+# Resume generation is the slowest prompt and usually finishes well within this
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+client = genai.Client(api_key=os.getenv("GOOGLE_GEMINI_KEY"))
+
+class LLMMetrics:
+    """Queue wait, latency and outcome counts of Gemini calls in this process."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_run_ms = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "concurrency": LLM_CONCURRENCY,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "avg_wait_ms": round(self.total_wait_ms / self.calls, 2) if self.calls else 0.0,
+            "avg_run_ms": round(self.total_run_ms / self.calls, 2) if self.calls else 0.0,
+            "max_run_ms": round(self.max_run_ms, 2),
+        }
+
+llm_metrics = LLMMetrics()
+_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+async def run_llm_call(coro_func, *args, timeout: float = LLM_TIMEOUT_SECONDS, **kwargs):
+    """
+    Await a Gemini client call under the per-process concurrency cap and a timeout.
+
+    The timeout covers the call itself, not the wait for a slot. On timeout
+    or cancellation the request is cancelled and the slot released at once.
+
+    Raises:
+        asyncio.TimeoutError: If the call takes longer than `timeout` seconds
+    """
+    submitted = time.perf_counter()
+    llm_metrics.waiting += 1
+    try:
+        await _semaphore.acquire()
+    finally:
+        llm_metrics.waiting -= 1
+    started = time.perf_counter()
+    llm_metrics.in_flight += 1
+    try:
+        return await asyncio.wait_for(coro_func(*args, **kwargs), timeout)
+    except asyncio.TimeoutError:
+        llm_metrics.timeouts += 1
+        raise
+    except asyncio.CancelledError:
+        llm_metrics.cancelled += 1
+        raise
+    except Exception:
+        llm_metrics.errors += 1
+        raise
+    finally:
+        _semaphore.release()
+        llm_metrics.in_flight -= 1
+        run_ms = (time.perf_counter() - started) * 1000
+        llm_metrics.calls += 1
+        llm_metrics.total_wait_ms += (started - submitted) * 1000
+        llm_metrics.total_run_ms += run_ms
+        llm_metrics.max_run_ms = max(llm_metrics.max_run_ms, run_ms)
+
+async def generate_content(contents, model: str = LLM_MODEL, timeout: float = LLM_TIMEOUT_SECONDS) -> str:
+    """Generate a response with the async Gemini client and return its text."""
+    response = await run_llm_call(client.aio.models.generate_content, model=model, contents=contents, timeout=timeout)
+    return response.text
+
+async def upload_file(file_path: str, timeout: float = LLM_TIMEOUT_SECONDS):
+    """Upload a file for use in a prompt."""
+    return await run_llm_call(client.aio.files.upload, file=file_path, timeout=timeout)
@@ -0,0 +1,166 @@
+import re
+from typing import List, Optional, Tuple
+
+indeed_countries = [
+    "argentina", "australia", "austria", "bahrain", "belgium", "brazil", "canada", "chile", "china", "colombia", "costa rica", "czech republic", "czechia", "denmark", "ecuador", "egypt", "finland", "france", "germany", "greece", "hong kong", "hungary", "india", "indonesia", "ireland", "israel", "italy", "japan", "kuwait", "luxembourg", "malaysia", "malta", "mexico", "morocco", "netherlands", "new zealand", "nigeria", "norway", "oman", "pakistan", "panama", "peru", "philippines", "poland", "portugal", "qatar", "romania", "saudi arabia", "singapore", "south africa", "south korea", "spain", "sweden", "switzerland", "taiwan", "thailand", "türkiye", "turkey", "ukraine", "united arab emirates", "uk", "united kingdom", "usa", "us", "united states", "uruguay", "venezuela", "vietnam", "usa/ca", "worldwide"
+]
+
+def validate_indeed_country(country: str):
+    if country.lower() not in indeed_countries:
+        for indeed_country in indeed_countries:
+            if country.lower() in indeed_country:
+                return indeed_country
+            if indeed_country in country.lower():
+                return indeed_country
+        return "worldwide"
+    return country
+
+# Country data mapping
+COUNTRY_DATA = [
+    {"code": "AD", "name": "Andorra"}, {"code": "AE", "name": "United Arab Emirates"},
+    {"code": "AF", "name": "Afghanistan"}, {"code": "AG", "name": "Antigua and Barbuda"},
+    {"code": "AI", "name": "Anguilla"}, {"code": "AL", "name": "Albania"},
+    {"code": "AM", "name": "Armenia"}, {"code": "AO", "name": "Angola"},
+    {"code": "AR", "name": "Argentina"}, {"code": "AT", "name": "Austria"},
+    {"code": "AU", "name": "Australia"}, {"code": "BE", "name": "Belgium"},
+    {"code": "BR", "name": "Brazil"}, {"code": "CA", "name": "Canada"},
+    {"code": "CH", "name": "Switzerland"}, {"code": "CL", "name": "Chile"},
+    {"code": "CN", "name": "China"}, {"code": "CO", "name": "Colombia"},
+    {"code": "CR", "name": "Costa Rica"}, {"code": "CZ", "name": "Czechia"},
+    {"code": "DE", "name": "Germany"}, {"code": "DK", "name": "Denmark"},
+    {"code": "EC", "name": "Ecuador"}, {"code": "EG", "name": "Egypt"},
+    {"code": "ES", "name": "Spain"}, {"code": "FI", "name": "Finland"},
+    {"code": "FR", "name": "France"}, {"code": "GB", "name": "United Kingdom"},
+    {"code": "GR", "name": "Greece"}, {"code": "HK", "name": "Hong Kong"},
+    {"code": "HU", "name": "Hungary"}, {"code": "ID", "name": "Indonesia"},
+    {"code": "IE", "name": "Ireland"}, {"code": "IL", "name": "Israel"},
+    {"code": "IN", "name": "India"}, {"code": "IT", "name": "Italy"},
+    {"code": "JP", "name": "Japan"}, {"code": "KR", "name": "Korea, Republic of"},
+    {"code": "KW", "name": "Kuwait"}, {"code": "LU", "name": "Luxembourg"},
+    {"code": "MY", "name": "Malaysia"}, {"code": "MT", "name": "Malta"},
+    {"code": "MX", "name": "Mexico"}, {"code": "NG", "name": "Nigeria"},
+    {"code": "NL", "name": "Netherlands"}, {"code": "NO", "name": "Norway"},
+    {"code": "NZ", "name": "New Zealand"}, {"code": "OM", "name": "Oman"},
+    {"code": "PA", "name": "Panama"}, {"code": "PE", "name": "Peru"},
+    {"code": "PH", "name": "Philippines"}, {"code": "PK", "name": "Pakistan"},
+    {"code": "PL", "name": "Poland"}, {"code": "PT", "name": "Portugal"},
+    {"code": "QA", "name": "Qatar"}, {"code": "RO", "name": "Romania"},
+    {"code": "SA", "name": "Saudi Arabia"}, {"code": "SG", "name": "Singapore"},
+    {"code": "SE", "name": "Sweden"}, {"code": "TH", "name": "Thailand"},
+    {"code": "TR", "name": "Türkiye"}, {"code": "TW", "name": "Taiwan"},
+    {"code": "UA", "name": "Ukraine"}, {"code": "US", "name": "United States"},
+    {"code": "VN", "name": "Viet Nam"}, {"code": "ZA", "name": "South Africa"}
+]
+
+# Create lookup dictionaries for faster access
+COUNTRY_TO_CODE = {country["name"].lower(): country["code"] for country in COUNTRY_DATA}
+CODE_TO_COUNTRY = {country["code"]: country["name"] for country in COUNTRY_DATA}
+
+# Common variations mapping
+COUNTRY_VARIATIONS = {
+    "united states of america": "US",
+    "usa": "US",
+    "united kingdom of great britain and northern ireland": "GB",
+    "uk": "GB",
+    "united arab emirates": "AE",
+    "uae": "AE",
+    "russia": "RU",
+    "russian federation": "RU",
+    "south korea": "KR",
+    "republic of korea": "KR",
+    "vietnam": "VN"
+}
+
+def lookup_country_code(location_part: str) -> Optional[str]:
+    """Resolve a country code, name or common variation to an ISO code, without guessing."""
+    location_part = location_part.strip()
+    if location_part.upper() in CODE_TO_COUNTRY:
+        return location_part.upper()
+    location_lower = location_part.lower()
+    if location_lower in COUNTRY_VARIATIONS:
+        return COUNTRY_VARIATIONS[location_lower]
+    return COUNTRY_TO_CODE.get(location_lower)
+
+def get_country_info(location_part: str) -> Tuple[str, str]:
+    state_to_country = {
+        # Indian States
+        "karnataka": ("India", "IN"),
+        "maharashtra": ("India", "IN"),
+        "tamil nadu": ("India", "IN"),
+        "delhi": ("India", "IN"),
+        "telangana": ("India", "IN"),
+        "kerala": ("India", "IN"),
+        "uttar pradesh": ("India", "IN"),
+        # US States
+        "california": ("United States", "US"),
+        "new york": ("United States", "US"),
+        "texas": ("United States", "US"),
+        # UK Regions
+        "london": ("United Kingdom", "GB"),
+        "england": ("United Kingdom", "GB"),
+        "scotland": ("United Kingdom", "GB"),
+        "wales": ("United Kingdom", "GB"),
+    }
+    
+    location_lower = location_part.lower().strip()
+    
+    # Check for direct state/region match
+    for state, country_info in state_to_country.items():
+        if state in location_lower:
+            return country_info
+            
+    # Check for common variations
+    if location_lower in COUNTRY_VARIATIONS:
+        code = COUNTRY_VARIATIONS[location_lower]
+        return CODE_TO_COUNTRY[code], code
+        
+    # Try direct country name lookup
+    if location_lower in COUNTRY_TO_CODE:
+        code = COUNTRY_TO_CODE[location_lower]
+        return CODE_TO_COUNTRY[code], code
+        
+    # Try partial matches
+    for country_name, code in COUNTRY_TO_CODE.items():
+        if country_name in location_lower or location_lower in country_name:
+            return CODE_TO_COUNTRY[code], code
+            
+    # If no match found, validate using Indeed's country list and default mappings
+    country_name = validate_indeed_country(location_part)
+    country_lower = country_name.lower()
+    
+    if country_lower in COUNTRY_TO_CODE:
+        code = COUNTRY_TO_CODE[country_lower]
+        return CODE_TO_COUNTRY[code], code
+    
+    # Default to US if no match found
+    return "United States", "US"
+
+def normalize_location(location: str) -> Tuple[str, str]:
+    """
+    Split a free-form location into a lowercased city and country code.
+
+    Args:
+        location (str): Location such as "Bengaluru, Karnataka, India" or "Austin, TX, US"
+
+    Returns:
+        Tuple[str, str]: (city, country code), either may be empty
+    """
+    parts = [part.strip() for part in (location or "").split(",") if part.strip()]
+    if not parts:
+        return "", ""
+    country_code = lookup_country_code(parts[-1]) or ""
+    if len(parts) == 1:
+        # A lone part is either a country or a city
+        return ("" if country_code else parts[0].lower()), country_code.lower()
+    if not country_code:
+        _, country_code = get_country_info(parts[-1])
+    return parts[0].lower(), country_code.lower()
+
+def normalize_job_types(job_type: str) -> List[str]:
+    """
+    Normalize job types from scrapers ("fulltime, contract") and preferences ("Full-time").
+
+    Returns:
+        List[str]: Lowercased job types with punctuation removed, e.g. ["fulltime"]
+    """
+    return [re.sub(r"[^a-z]", "", part.lower()) for part in (job_type or "").split(",") if re.sub(r"[^a-z]", "", part.lower())]
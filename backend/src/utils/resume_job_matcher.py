@@ -1,4 +1,5 @@
-from datetime import date
+import asyncio
+from datetime import date, datetime
 import os
 import pandas as pd
 import numpy as np
@@ -12,8 +13,13 @@ from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
 import concurrent.futures
 from functools import partial
-from src.db.mongo import DatabaseOperations, User
+from typing import List, Tuple
+from src.db.mongo import DatabaseOperations, User, db_ops
 from src.db.model import ResumeModel
+from src.utils.cache import cache
+import hashlib
+
+MATCH_CACHE_TTL_SECONDS = int(os.getenv("MATCH_CACHE_TTL_SECONDS", "86400"))
 
 class ResumeJobMatcher:
     def __init__(self):
@@ -374,14 +380,12 @@ def match_all_jobs(json_response, overall_user_data, num_workers=None):
     
     return results
 
-async def get_job_details(db_ops: DatabaseOperations, user: User, json_response: dict, job_title: str):
-    resume = await db_ops.get_user_resume(user.email)
-    if not resume:
-        return sorted(json_response, key=lambda x: str(x.get("date_posted", "")), reverse=True)
-        
-    # Prepare user data more efficiently
-    job_title = job_title.lower()
-    
+def match_cache_key(user_data: str, description: str) -> str:
+    digest = hashlib.sha256(f"{user_data}\0{description or ''}".encode("utf-8")).hexdigest()
+    return f"job_match:{digest}"
+
+def build_user_profile(resume: ResumeModel, job_title: str) -> str:
+    """The resume text jobs are matched against: target title, summary, skills and years of experience."""
     # Collect skills in one pass
     all_skills = set(resume.skills)
     
@@ -401,25 +405,59 @@ async def get_job_details(db_ops: DatabaseOperations, user: User, json_response:
     for project in resume.projects:
         all_skills.update(project.technologies)
     
-    # Build user data string once
-    overall_user_data = f"""
-    job title: {job_title}
+    return f"""
+    job title: {job_title.lower()}
     {resume.personalInfo.about_me}
     {', '.join(all_skills).lower()}
     {resume_years} years of experience
     """
+
+async def score_jobs(email: str, overall_user_data: str, jobs: List[dict], persist: bool = True) -> List[Tuple[str, dict]]:
+    """
+    Match a user's profile against job dicts, persisting the scores unless `persist` is False.
+
+    Scores only depend on the profile text and the description, so ones
+    any worker already computed are reused from the cache; the rest are
+    matched in a thread so the event loop stays responsive.
+
+    Returns:
+        List[Tuple[str, dict]]: (job ID, matcher result) pairs
+    """
+    if not jobs:
+        return []
+    cache_keys = {job["id"]: match_cache_key(overall_user_data, job.get("description", "")) for job in jobs}
+    cached_matches = await cache.get_many(list(set(cache_keys.values())))
+    matches = [
+        (job_id, cached_matches[key]) for job_id, key in cache_keys.items() if key in cached_matches
+    ]
+    jobs_to_match = [job for job in jobs if cache_keys[job["id"]] not in cached_matches]
+
+    new_matches = await asyncio.to_thread(match_all_jobs, jobs_to_match, overall_user_data) if jobs_to_match else []
+    await cache.set_many({cache_keys[job_id]: match for job_id, match in new_matches}, MATCH_CACHE_TTL_SECONDS)
+    matches += new_matches
+
+    matches = [(job_id, match) for job_id, match in matches if job_id in cache_keys]
+    if persist:
+        await db_ops.save_job_scores(email, matches)
+    return matches
+
+async def get_job_details(db_ops: DatabaseOperations, user: User, json_response: dict, job_title: str):
+    resume = await db_ops.get_user_resume(user.email)
+    if not resume:
+        return sorted(json_response, key=lambda x: x.get("date_posted") or datetime.min, reverse=True)
+        
+    # Build user data string once
+    overall_user_data = build_user_profile(resume, job_title)
     
     # Create lookup dictionary for jobs by ID for faster access
     jobs_by_id = {job["id"]: job for job in json_response}
     
-    # Run matching with optimized thread pool
-    matches = match_all_jobs(json_response, overall_user_data)
-    
+    # Persist the scores for the whole page, then read back application statuses in one query
+    matches = await score_jobs(user.email, overall_user_data, json_response)
+    job_users = await db_ops.get_user_jobs(user.email, list(jobs_by_id.keys()))
+
     # Update jobs with match data in one efficient pass
     for job_id, match in matches:
-        if job_id not in jobs_by_id:
-            continue
-            
         job = jobs_by_id[job_id]
         job["match_score"] = match["overall_score"]
         job["missing_skills"] = match["missing_skills"]
@@ -432,12 +470,12 @@ async def get_job_details(db_ops: DatabaseOperations, user: User, json_response:
         job['experience_match_score'] = match['experience_match_score']
         
         # Get application status
-        job_application = await db_ops.get_user_to_job(user.email, job_id)
+        job_application = job_users.get(job_id)
         job["application_status"] = job_application.application_status if job_application else "Pending"
     
     # Sort with a more efficient lambda
     return sorted(
         json_response,
-        key=lambda x: (str(x.get("date_posted", "")), x.get("match_score", 0)),
+        key=lambda x: (x.get("date_posted") or datetime.min, x.get("match_score", 0)),
         reverse=True
     )
\ No newline at end of file
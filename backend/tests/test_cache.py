@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+import fakeredis
+
+from src.utils import cache as cache_module
+from src.utils.cache import CacheBackend, InMemoryCache, RedisCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+class Unserializable:
+    pass
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable time.monotonic, so TTL expiry doesn't need real sleeps."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+@pytest.fixture
+def memory_cache(clock):
+    return InMemoryCache(max_size=100)
+
+@pytest.fixture
+def redis_cache():
+    return RedisCache("redis://unused", "test:", client=fakeredis.FakeAsyncRedis())
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, clock):
+    if request.param == "memory":
+        return InMemoryCache(max_size=100)
+    return RedisCache("redis://unused", "test:", client=fakeredis.FakeAsyncRedis())
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+def test_get_and_set(backend):
+    async def scenario():
+        assert await backend.get("user:1") is None
+        await backend.set("user:1", {"name": "Ada", "tags": ["a", "b"]}, 60)
+        return await backend.get("user:1")
+    assert run(scenario()) == {"name": "Ada", "tags": ["a", "b"]}
+
+def test_get_many_and_set_many(backend):
+    async def scenario():
+        await backend.set_many({"a": 1, "b": [2], "c": None}, 60)
+        return await backend.get_many(["a", "b", "missing"])
+    assert run(scenario()) == {"a": 1, "b": [2]}
+
+def test_empty_batches(backend):
+    async def scenario():
+        await backend.set_many({}, 60)
+        return await backend.get_many([])
+    assert run(scenario()) == {}
+
+def test_delete(backend):
+    async def scenario():
+        await backend.set("key", "value", 60)
+        await backend.delete("key")
+        await backend.delete("never-set")
+        return await backend.get("key")
+    assert run(scenario()) is None
+
+def test_values_are_copies(backend):
+    async def scenario():
+        value = {"items": [1]}
+        await backend.set("key", value, 60)
+        value["items"].append(2)
+        cached = await backend.get("key")
+        cached["items"].append(3)
+        return await backend.get("key")
+    assert run(scenario()) == {"items": [1]}
+
+def test_memory_ttl_expiry(memory_cache, clock):
+    async def scenario():
+        await memory_cache.set("short", 1, 10)
+        await memory_cache.set("long", 2, 100)
+        clock[0] += 11
+        return await memory_cache.get_many(["short", "long"])
+    assert run(scenario()) == {"long": 2}
+
+def test_redis_ttl_expiry(redis_cache):
+    async def scenario():
+        await redis_cache.set("short", 1, 1)
+        await redis_cache.set("long", 2, 100)
+        assert 0 < await redis_cache._client.ttl("test:short") <= 1
+        await asyncio.sleep(1.1)
+        return await redis_cache.get_many(["short", "long"])
+    assert run(scenario()) == {"long": 2}
+
+def test_redis_keys_are_prefixed(redis_cache):
+    async def scenario():
+        await redis_cache.set("key", 1, 60)
+        return await redis_cache._client.exists("test:key")
+    assert run(scenario()) == 1
+
+def test_memory_unserializable_value_is_dropped(memory_cache):
+    async def scenario():
+        await memory_cache.set_many({"bad": Unserializable(), "good": 1}, 60)
+        return await memory_cache.get_many(["bad", "good"])
+    assert run(scenario()) == {"good": 1}
+
+def test_redis_unserializable_value_does_not_raise(redis_cache):
+    async def scenario():
+        await redis_cache.set("bad", Unserializable(), 60)
+        return await redis_cache.get("bad")
+    assert run(scenario()) is None
+
+def test_redis_corrupt_payload_is_a_miss(redis_cache):
+    async def scenario():
+        await redis_cache._client.set("test:key", b"not json")
+        return await redis_cache.get("key")
+    assert run(scenario()) is None
+
+def test_redis_unreachable_never_raises():
+    unreachable = RedisCache("redis://127.0.0.1:1/0", "test:")
+
+    async def scenario():
+        await unreachable.set("key", 1, 60)
+        await unreachable.delete("key")
+        value = await unreachable.get("key")
+        await unreachable.close()
+        return value
+    started = time.perf_counter()
+    assert run(scenario()) is None
+    assert time.perf_counter() - started < 10
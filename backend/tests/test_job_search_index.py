@@ -0,0 +1,59 @@
+import asyncio
+import json
+from datetime import datetime
+
+from src.utils.compression import decompress_text
+from src.utils.job_search_index import JobSearchIndex
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+JOBS = [
+    {"_id": "1", "title": "Python Developer", "company": "Acme", "description": "Build APIs with FastAPI"},
+    {"_id": "2", "title": "Data Engineer", "company": "Globex", "description": "Spark and Python pipelines"},
+]
+
+def cursor_factory(jobs):
+    calls = []
+
+    async def factory(since=None):
+        calls.append(since)
+        for job in jobs:
+            yield job
+    factory.calls = calls
+    return factory
+
+def test_save_writes_compressed_json(tmp_path):
+    path = tmp_path / "index.json.z"
+    index = JobSearchIndex(str(path))
+    run(index.load_or_build(cursor_factory(JOBS)))
+
+    data = json.loads(decompress_text(path.read_bytes()))
+    assert set(data["documents"]) == {"1", "2"}
+    assert datetime.fromisoformat(data["synced_at"]) == index.synced_at
+
+def test_load_restores_index_and_syncs_instead_of_rebuilding(tmp_path):
+    path = str(tmp_path / "index.json.z")
+    built = JobSearchIndex(path)
+    run(built.load_or_build(cursor_factory(JOBS)))
+
+    factory = cursor_factory([])
+    loaded = JobSearchIndex(path)
+    run(loaded.load_or_build(factory))
+
+    assert len(loaded) == 2
+    assert loaded.synced_at is not None
+    # Only jobs updated since the snapshot are pulled
+    assert factory.calls and factory.calls[0] is not None
+    assert [job_id for job_id, _ in loaded.search("python")] == [job_id for job_id, _ in built.search("python")]
+    loaded.remove("1")
+    assert [job_id for job_id, _ in loaded.search("python")] == ["2"]
+
+def test_unreadable_snapshot_is_rebuilt(tmp_path):
+    path = tmp_path / "index.json.z"
+    path.write_bytes(b"not a snapshot")
+    index = JobSearchIndex(str(path))
+    run(index.load_or_build(cursor_factory(JOBS)))
+
+    assert len(index) == 2